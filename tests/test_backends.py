@@ -0,0 +1,132 @@
+import importlib.util
+import pytest
+import numpy as np
+import pandas as pd
+
+from yeast import Recipe
+from yeast.step import Step
+from yeast.backends import Backend, PandasBackend
+from yeast.steps import SelectColumnsStep, MeanImputeStep, SortRowsStep, FilterRowsStep
+from yeast.steps import RenameColumnsStep, DropDuplicateRowsStep, MutateStep
+from yeast.errors import YeastRecipeError
+
+from data_samples import startrek_data as data
+
+
+class DictBackend(Backend):
+    """
+    Backend that keeps the data as a dictionary of lists
+    """
+    name = 'dict'
+
+    def is_frame(self, data):
+        return isinstance(data, dict)
+
+    def from_pandas(self, data):
+        return data if self.is_frame(data) else data.to_dict(orient='list')
+
+    def to_pandas(self, data):
+        return pd.DataFrame(data) if self.is_frame(data) else data
+
+
+class KeepFirstRowsStep(Step):
+    def __init__(self, n):
+        self.n = n
+        super().__init__()
+
+    def do_bake(self, df):
+        return df.head(self.n)
+
+    def do_bake_dict(self, df, schema):
+        return {column: values[:self.n] for column, values in df.items()}
+
+
+@pytest.fixture
+def ratings():
+    return pd.DataFrame({
+        'title': ['Picard', 'TNG', 'Voyager', 'TNG', 'Discovery'],
+        'rating': [9.3, 9.9, np.nan, 9.9, None]
+    })
+
+
+def test_pandas_is_the_default_backend(data):
+    recipe = Recipe([SelectColumnsStep(['title', 'rating'])])
+
+    assert isinstance(recipe.backend, PandasBackend)
+    assert recipe.bake(data).columns.tolist() == ['title', 'rating']
+
+
+def test_unknown_backend_raises_an_error():
+    with pytest.raises(YeastRecipeError):
+        Recipe([SelectColumnsStep(['title'])], backend='spark')
+
+
+def test_steps_without_native_implementation_fall_back_to_pandas(data):
+    recipe = Recipe([
+        KeepFirstRowsStep(4),
+        SelectColumnsStep(['title', 'rating']),
+        KeepFirstRowsStep(2)
+    ], backend=DictBackend())
+
+    baked = recipe.bake(data.to_dict(orient='list'))
+    assert baked == {'title': ['Picard', 'TNG'], 'rating': [9.3, 9.9]}
+
+    # The output has the same format as the input:
+    baked = recipe.bake(data)
+    assert isinstance(baked, pd.DataFrame)
+    assert baked['title'].tolist() == ['Picard', 'TNG']
+
+
+def test_polars_backend_bakes_the_same_data(ratings):
+    pl = pytest.importorskip('polars')
+    steps = [
+        MeanImputeStep(['rating']),
+        DropDuplicateRowsStep(),
+        FilterRowsStep('rating > 9'),
+        SortRowsStep(['rating'], ascending=False),
+        RenameColumnsStep({'title': 'series'})
+    ]
+    recipe = Recipe(steps, backend='polars').prepare(ratings)
+    baked = recipe.bake(pl.from_pandas(ratings))
+
+    assert isinstance(baked, pl.DataFrame)
+    assert baked.to_pandas().equals(Recipe(steps).bake(ratings).reset_index(drop=True))
+
+
+def test_lazy_recipe_requires_polars(data):
+    if importlib.util.find_spec('polars') is not None:
+        pytest.skip('polars is installed')
+    with pytest.raises(YeastRecipeError):
+        Recipe([SelectColumnsStep(['title'])]).lazy(data)
+
+
+def test_lazy_recipe_builds_one_query(ratings):
+    pl = pytest.importorskip('polars')
+    steps = [
+        MeanImputeStep(['rating']),
+        FilterRowsStep('rating > 9 & title != "Voyager"'),
+        MutateStep({'title': lambda df: df['title'].str.lower()}),
+        RenameColumnsStep({'title': 'series'})
+    ]
+    recipe = Recipe(steps).prepare(ratings)
+    query = recipe.lazy(pl.from_pandas(ratings).lazy())
+
+    assert isinstance(query, pl.LazyFrame)
+    expected = Recipe(steps).bake(ratings).reset_index(drop=True)
+    assert query.collect().to_pandas().equals(expected)
+
+
+@pytest.mark.parametrize('expression', [
+    'rating > 9.5',
+    'rating != 9.3',
+    'title in ["TNG", "Picard"] | rating < 9.5',
+    'not (rating >= 9.9) and title not in ["Picard"]',
+    '`title` == @series'
+])
+def test_filter_expressions_are_translated_to_polars(ratings, expression):
+    pl = pytest.importorskip('polars')
+    step = FilterRowsStep(expression, local_dict={'series': 'TNG'})
+    expected = step.bake(ratings).reset_index(drop=True)
+
+    assert step.polars_expression() is not None
+    assert pl.from_pandas(ratings).filter(step.polars_expression()).to_pandas().equals(expected)
@@ -0,0 +1,105 @@
+import os
+import pytest
+
+from yeast import Recipe
+from yeast.cache import StepCache
+from yeast.steps import CustomStep, FilterRowsStep, MutateStep, SelectColumnsStep
+from yeast.steps import DropColumnsStep, DropDuplicateRowsStep, SortRowsStep
+from yeast.transformers import StrToUpper
+from yeast.errors import YeastRecipeError
+
+from data_samples import startrek_data as data
+
+
+baked_steps = []
+
+
+def double_rating(step, df):
+    baked_steps.append('double_rating')
+    df['rating'] = df['rating'] * 2
+    return df
+
+
+@pytest.fixture
+def cache(tmp_path):
+    baked_steps.clear()
+    return StepCache(str(tmp_path / 'cache'))
+
+
+def test_bake_resumes_from_the_last_cached_step(data, cache):
+    steps = [CustomStep(to_bake=double_rating), FilterRowsStep('rating > 18')]
+    expected = Recipe(steps).bake(data)
+    baked_steps.clear()
+
+    baked_df = Recipe(steps, cache=cache).bake(data)
+    assert baked_df.equals(expected)
+    assert baked_steps == ['double_rating']
+    assert len(os.listdir(cache.path)) == 2
+
+    # All the steps are cached
+    assert Recipe(steps, cache=cache).bake(data).equals(expected)
+    assert baked_steps == ['double_rating']
+
+    # Editing the last step only bakes the last step again
+    baked_df = Recipe([
+        CustomStep(to_bake=double_rating),
+        FilterRowsStep('rating > 19')
+    ], cache=cache.path).bake(data)
+    assert baked_df['title'].tolist() == ['TNG']
+    assert baked_steps == ['double_rating']
+
+    # A different input is baked again
+    Recipe(steps, cache=cache).bake(data.head(3))
+    assert baked_steps == ['double_rating', 'double_rating']
+
+
+def test_bake_does_not_change_the_cache_keys(data, cache):
+    recipe = Recipe([
+        DropColumnsStep('seasons'),
+        DropDuplicateRowsStep(),
+        SortRowsStep('title'),
+        MutateStep({'title': StrToUpper()}),
+        CustomStep(to_bake=double_rating)
+    ], cache=cache)
+    keys = cache.keys(data, recipe.steps)
+
+    expected = recipe.bake(data)
+    assert cache.keys(data, recipe.steps) == keys
+    assert baked_steps == ['double_rating']
+    assert len(os.listdir(cache.path)) == 5
+
+    # The second bake hits the cache
+    assert recipe.bake(data).equals(expected)
+    assert baked_steps == ['double_rating']
+    assert len(os.listdir(cache.path)) == 5
+
+
+def test_steps_with_lambdas_are_not_cached(data, cache):
+    recipe = Recipe([
+        SelectColumnsStep(['title', 'rating']),
+        MutateStep({'rating': lambda df: df['rating'] * 2}),
+        FilterRowsStep('rating > 18')
+    ], cache=cache)
+
+    assert recipe.bake(data)['title'].tolist() == ['Picard', 'TNG']
+    assert len(os.listdir(cache.path)) == 1
+    assert recipe.bake(data)['title'].tolist() == ['Picard', 'TNG']
+
+
+def test_least_recently_used_outputs_are_removed(data, cache):
+    recipe = Recipe([CustomStep(to_bake=double_rating)], cache=cache)
+    recipe.bake(data)
+    filename = os.path.join(cache.path, os.listdir(cache.path)[0])
+    size = os.path.getsize(filename)
+    os.utime(filename, (0, 0))
+
+    cache.max_size = size
+    recipe.bake(data.head(2))
+    assert len(os.listdir(cache.path)) == 1
+    assert not os.path.exists(filename)
+
+    cache.clear()
+    assert os.listdir(cache.path) == []
+
+    with pytest.raises(YeastRecipeError):
+        StepCache(cache.path, max_size=-1)
@@ -60,3 +60,15 @@ def test_if_bake_and_not_prepare_should_raise_an_error(data):
 
     with pytest.raises(YeastBakeError):
         step.bake(data)
+
+
+def test_drop_zero_variance_prepared_by_chunks(data):
+    """
+    Only the columns with a single value in all the chunks are dropped
+    """
+    step = DropZVColumnsStep(naomit=True)
+    for index in range(data.shape[0]):
+        step.prepare_partial(data.iloc[index:index + 1])
+    step.finalize()
+
+    assert step.removals == ['episodes']
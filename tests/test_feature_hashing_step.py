@@ -0,0 +1,80 @@
+import pytest
+import numpy as np
+import pandas as pd
+
+from yeast import Recipe
+from yeast.steps import FeatureHashingStep
+from yeast.errors import YeastValidationError
+
+
+@pytest.fixture
+def visits():
+    return pd.DataFrame({
+        'id': [1, 2, 3, 4, 5],
+        'url': ['/home', '/search?q=tng', '/home', None, '/episodes/42']
+    })
+
+
+def test_values_are_hashed_into_buckets(visits):
+    baked_df = Recipe([FeatureHashingStep('url', n_buckets=100)]).bake(visits)
+    codes = baked_df['url']
+
+    assert codes.dtype == 'Int8'
+    assert codes[0] == codes[2]
+    assert pd.isna(codes[3])
+    assert codes.dropna().between(0, 99).all()
+
+
+def test_buckets_do_not_depend_on_the_data_or_the_type(visits):
+    step = FeatureHashingStep('url', n_buckets=2 ** 20)
+    expected = step.bake(visits.copy())['url'].tolist()
+
+    assert step.bake(visits.iloc[::-1].copy())['url'].tolist() == expected[::-1]
+    assert step.bake(visits.astype({'url': 'category'}))['url'].tolist() == expected
+    assert step.bake(visits.astype({'url': 'string'}))['url'].tolist() == expected
+    assert step.bake(visits.copy())['url'].dtype == 'Int32'
+
+
+def test_numbers_have_the_same_bucket_on_every_type():
+    step = FeatureHashingStep('x', n_buckets=1000)
+    expected = step.bake(pd.DataFrame({'x': [1, 2, 3]}))['x'].tolist()
+
+    # A missing value turns the integers into floats
+    floats = pd.DataFrame({'x': [1.0, 2.0, 3.0, np.nan]})
+    assert step.bake(floats)['x'].tolist()[:3] == expected
+    nullable = pd.DataFrame({'x': pd.array([1, 2, None, 3], dtype='Int64')})
+    assert step.bake(nullable)['x'].dropna().tolist() == expected
+    objects = pd.DataFrame({'x': pd.Series([1, 2, 3], dtype='object')})
+    assert step.bake(objects)['x'].tolist() == expected
+    assert step.bake(pd.DataFrame({'x': pd.Categorical([1, 2, 3])}))['x'].tolist() == expected
+
+
+def test_values_are_hashed_into_sparse_columns(visits):
+    baked_df = FeatureHashingStep('url', n_buckets=16, output='sparse').bake(visits)
+    codes = FeatureHashingStep('url', n_buckets=16).bake(visits.copy())['url']
+
+    assert baked_df.columns.tolist() == ['id'] + [f'url_{i}' for i in range(16)]
+    assert (baked_df.dtypes[1:] == pd.SparseDtype('uint8', 0)).all()
+    dense = baked_df.drop(columns=['id']).sparse.to_dense().to_numpy()
+    assert dense.sum(axis=1).tolist() == [1, 1, 1, 0, 1]
+    assert dense[0, codes[0]] == 1
+
+
+def test_memory_does_not_depend_on_the_cardinality():
+    df = pd.DataFrame({'user': [f'user_{i}' for i in np.arange(100000)]})
+    step = FeatureHashingStep('user', n_buckets=1000)
+    baked_df = step.bake(df)
+
+    assert not step.needs_preparation
+    assert repr(step) == repr(FeatureHashingStep('user', n_buckets=1000))
+    assert baked_df['user'].nunique() == 1000
+
+
+@pytest.mark.parametrize('parameters', [
+    {'selector': 'not_found'},
+    {'selector': 'url', 'n_buckets': 0},
+    {'selector': 'url', 'output': 'dense'},
+])
+def test_invalid_parameters_raise_an_error(visits, parameters):
+    with pytest.raises(YeastValidationError):
+        FeatureHashingStep(**parameters).bake(visits)
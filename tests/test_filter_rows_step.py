@@ -1,3 +1,4 @@
+import pickle
 import pytest
 import pandas as pd
 
@@ -59,3 +60,45 @@ def test_chaining_of_commands(data):
     assert baked_df.shape[0] == 2
     assert baked_df.iloc[0]['title'] == 'TNG'
     assert baked_df.iloc[1]['title'] == 'Voyager'
+
+
+@pytest.mark.parametrize('expression', [
+    'rating != 9.3',
+    'not watched and rating < 9',
+    '2000 < year <= 2020 or seasons == 7',
+    "aired > '2000-01-01' and title not in ['Picard']",
+    'rating * 2 > 18 | year % 2 == 0',
+    'votes > 100',
+    '`year` > @year and title in @names'
+])
+def test_compiled_expressions_are_evaluated_as_query(data, expression):
+    data.loc[2, 'rating'] = None
+    data['votes'] = pd.array([150, None, 90, 300, None, 120], dtype='Int64')
+    variables = {'year': 2000, 'names': ['Picard', 'Discovery']}
+    step = FilterRowsStep(expression, local_dict=variables)
+
+    assert step.compile() is not None
+    assert step.bake(data).equals(data.query(expression, local_dict=variables))
+
+
+def test_expressions_are_compiled_once(data):
+    step = FilterRowsStep('rating > 9')
+    compiled = step.compile()
+
+    assert step.bake(data).shape[0] == 2
+    assert step.compile() is compiled
+    assert pickle.loads(pickle.dumps(step)).bake(data).shape[0] == 2
+
+    step.expression = 'rating > 9.5'
+    assert step.compile() is not compiled
+    assert step.bake(data).shape[0] == 1
+
+
+def test_expressions_that_could_not_be_compiled_are_queried(data):
+    step = FilterRowsStep('title.str.startswith("D")', engine='python')
+    assert step.compile() is None
+    assert step.bake(data)['title'].tolist() == ['Deep Space Nine', 'Discovery']
+
+    step = FilterRowsStep('abs(rating - 9) < 0.2')
+    assert step.compile() is None
+    assert step.bake(data)['title'].tolist() == ['Deep Space Nine', 'Discovery']
@@ -0,0 +1,68 @@
+import pytest
+import numpy as np
+import pandas as pd
+
+from yeast import Recipe, fingerprint
+from yeast.steps import FilterRowsStep, MeanImputeStep, MutateStep
+from yeast.errors import YeastRecipeError
+
+from data_samples import startrek_data as data
+
+
+def test_fingerprint_changes_when_the_data_changes(data):
+    original = fingerprint(data)
+
+    assert fingerprint(data.copy()) == original
+    assert len(original) == 32
+
+    changed = data.copy()
+    changed.loc[3, 'rating'] = 7.0
+    assert fingerprint(changed) != original
+    assert fingerprint(data.rename(columns={'year': 'aired_year'})) != original
+    assert fingerprint(data.astype({'year': 'float64'})) != original
+    assert fingerprint(data.set_index('year')) != original
+    assert fingerprint(data['title']) == fingerprint(data[['title']])
+
+
+def test_fingerprint_by_column(data):
+    changed = data.copy()
+    changed['title'] = changed['title'].str.upper()
+    before, after = fingerprint(data, by_column=True), fingerprint(changed, by_column=True)
+
+    assert list(after.keys()) == data.columns.tolist()
+    assert [c for c in after if before[c] != after[c]] == ['title']
+
+
+def test_fingerprint_of_a_sample():
+    df = pd.DataFrame({'value': np.arange(1000000, dtype='float64'), 'code': 'A'})
+    sampled = fingerprint(df, sample=1000)
+
+    changed = df.copy()
+    changed.loc[0, 'value'] = -1
+    assert fingerprint(changed, sample=1000) != sampled
+    # Only the sampled rows are compared
+    changed = df.copy()
+    changed.loc[1, 'value'] = -1
+    assert fingerprint(changed, sample=1000) == sampled
+    assert fingerprint(changed) != fingerprint(df)
+    assert fingerprint(df.head(999999), sample=1000) != sampled
+
+
+def test_fingerprint_of_unhashable_values():
+    df = pd.DataFrame({'tags': [['a', 'b'], ['c']]})
+    assert fingerprint(df) != fingerprint(pd.DataFrame({'tags': [['a'], ['c']]}))
+
+
+def test_fingerprint_of_steps_and_recipes(data):
+    assert fingerprint(FilterRowsStep('rating > 9')) == fingerprint(FilterRowsStep('rating > 9'))
+    assert fingerprint(FilterRowsStep('rating > 9')) != fingerprint(FilterRowsStep('rating > 8'))
+
+    step = MeanImputeStep(['rating'])
+    unprepared = fingerprint(step)
+    assert fingerprint(step.prepare(data)) != unprepared
+
+    assert fingerprint(Recipe([step])) is not None
+    assert fingerprint(Recipe([MutateStep({'rating': lambda df: df['rating'] * 2})])) is None
+
+    with pytest.raises(YeastRecipeError):
+        fingerprint([1, 2, 3])
@@ -0,0 +1,80 @@
+import pytest
+import numpy as np
+import pandas as pd
+
+from yeast import Recipe
+from yeast.steps import FrequencyEncoderStep
+from yeast.errors import YeastValidationError
+
+from data_samples import startrek_characters
+
+
+@pytest.fixture
+def ranks():
+    return pd.DataFrame({
+        'id': [1, 2, 3, 4, 5, 6, 7],
+        'rank': ['Captain', 'Commander', 'Captain', None, 'Ensign', 'Captain', 'Commander']
+    })
+
+
+def test_frequency_encoding_counts_each_category(ranks):
+    baked_df = FrequencyEncoderStep('rank').prepare(ranks).bake(ranks)
+
+    assert baked_df['rank'].dtype == 'int64'
+    assert baked_df['rank'].tolist() == [3, 2, 3, 0, 1, 3, 2]
+    assert baked_df['id'].tolist() == [1, 2, 3, 4, 5, 6, 7]
+
+
+def test_frequency_encoding_normalized(ranks):
+    baked_df = FrequencyEncoderStep('rank', normalize=True).prepare(ranks).bake(ranks)
+
+    assert baked_df['rank'].dtype == 'float64'
+    assert baked_df['rank'].tolist() == pytest.approx([0.5, 1 / 3, 0.5, 0, 1 / 6, 0.5, 1 / 3])
+
+
+def test_unknown_values_are_encoded_as_zero(ranks):
+    step = FrequencyEncoderStep('rank').prepare(ranks)
+    new_df = pd.DataFrame({'id': [1, 2, 3], 'rank': ['Ensign', 'Admiral', np.nan]})
+
+    assert step.bake(new_df)['rank'].tolist() == [1, 0, 0]
+
+
+def test_frequency_encoding_on_categorical_columns(ranks):
+    expected = FrequencyEncoderStep('rank').prepare(ranks).bake(ranks.copy())
+    ranks['rank'] = ranks['rank'].astype('category')
+
+    assert FrequencyEncoderStep('rank').prepare(ranks).bake(ranks).equals(expected)
+
+
+def test_frequency_encoding_prepared_by_chunks(startrek_characters):
+    expected = FrequencyEncoderStep(['name', 'rank']).prepare(startrek_characters)
+
+    recipe = Recipe([FrequencyEncoderStep(['name', 'rank'])])
+    for start in range(0, startrek_characters.shape[0], 3):
+        recipe.prepare_partial(startrek_characters.iloc[start:start + 3])
+    recipe.finalize()
+
+    baked_df = recipe.bake(startrek_characters)
+    assert baked_df.equals(expected.bake(startrek_characters.copy()))
+
+
+def test_compiled_frequency_encoding_is_the_same_as_bake(ranks):
+    recipe = Recipe([FrequencyEncoderStep('rank')]).prepare(ranks)
+    bake = recipe.compile_for_inference(ranks)
+
+    assert bake({'id': 1, 'rank': 'Commander'}) == {'id': 1, 'rank': 2}
+    assert bake({'id': 1, 'rank': 'Admiral'}) == {'id': 1, 'rank': 0}
+    assert recipe.output_schema(ranks).dtypes['rank'] == 'int64'
+
+
+def test_saved_frequency_encoding_bakes_the_same(ranks, tmp_path):
+    recipe = Recipe([FrequencyEncoderStep('rank', normalize=True)]).prepare(ranks)
+    recipe.save(tmp_path / 'recipe')
+
+    loaded = Recipe.load(tmp_path / 'recipe')
+    assert loaded.bake(ranks).equals(recipe.bake(ranks))
+
+
+def test_frequency_encoding_missing_columns_raise_an_error(ranks):
+    with pytest.raises(YeastValidationError):
+        FrequencyEncoderStep('not_found').prepare(ranks)
@@ -38,3 +38,114 @@ def test_group_by_and_summarize_should_return_a_ready_to_use_dataframe(data):
     assert 'watched_count' in baked_df.columns
     assert 'years_count' in baked_df.columns
     assert 'years_unique_count' in baked_df.columns
+
+
+def test_summarize_calculates_all_the_groups_at_once(data):
+    """
+    Seasons: 1 (Picard), 2 (Discovery), 4 (Enterprise) and 7 (TNG, Voyager and Deep Space Nine)
+    """
+    data['year'] = data['year'].replace({1995: 1987})
+    baked_df = Recipe([
+        GroupByStep('seasons'),
+        SummarizeStep({
+            'rating_median': AggMedian('rating'),
+            'rating_mean': AggMean('rating'),
+            'title_min': AggMin('title'),
+            'year_max': AggMax('year'),
+            'watched_count': AggSum('watched'),
+            'years_count': AggCount('year'),
+            'years_unique_count': AggCountDistinct('year')
+        })
+    ]).bake(data)
+
+    assert baked_df.columns.tolist()[0] == 'seasons'
+    assert baked_df['seasons'].tolist() == [1, 2, 4, 7]
+    assert baked_df['rating_median'].tolist() == [9.3, 9.0, 6.8, 8.9]
+    assert baked_df['rating_mean'].round(2).tolist() == [9.3, 9.0, 6.8, 8.73]
+    assert baked_df['title_min'].tolist() == ['Picard', 'Discovery', 'Enterprise', 'Deep Space Nine']
+    assert baked_df['year_max'].tolist() == [2020, 2017, 2001, 1993]
+    assert baked_df['watched_count'].tolist() == [0, 1, 1, 2]
+    assert baked_df['years_count'].tolist() == [1, 1, 1, 3]
+    assert baked_df['years_unique_count'].tolist() == [1, 1, 1, 2]
+
+
+def test_summarize_ignores_na_keys_and_keeps_unobserved_categories():
+    df = pd.DataFrame({
+        'category': pd.Categorical(['a', 'a', 'b', None], categories=['a', 'b', 'c']),
+        'sales': [10, 20, 5, 7]
+    })
+    baked_df = Recipe([
+        GroupByStep('category'),
+        SummarizeStep({
+            'total_sales': AggSum('sales'),
+            'median_sales': AggMedian('sales'),
+            'sales_count': AggCount('sales')
+        })
+    ]).bake(df)
+
+    assert baked_df['category'].tolist() == ['a', 'b', 'c']
+    assert baked_df['total_sales'].tolist() == [30, 5, 0]
+    assert baked_df['median_sales'].fillna(0).tolist() == [15, 5, 0]
+    assert baked_df['sales_count'].tolist() == [2, 1, 0]
+
+
+def test_summarize_output_schema_is_the_same_as_the_baked_data(data):
+    recipe = Recipe([
+        GroupByStep(['watched']),
+        SummarizeStep({
+            'mean': AggMean('rating'),
+            'median': AggMedian('year'),
+            'sum': AggSum('year'),
+            'max': AggMax('title'),
+            'min': AggMin('aired'),
+            'count': AggCount('title'),
+            'distinct': AggCountDistinct('seasons')
+        })
+    ])
+    baked_df = recipe.bake(data)
+    schema = recipe.output_schema(data)
+
+    assert schema.shape[0] == 0
+    assert schema.dtypes.equals(baked_df.dtypes)
+
+
+def test_sums_of_unsigned_integers_are_unsigned():
+    df = pd.DataFrame({
+        'category': ['a', 'b', 'a'],
+        'units': pd.Series([250, 3, 250], dtype='uint8')
+    })
+    recipe = Recipe([
+        GroupByStep(['category']),
+        SummarizeStep({'units': AggSum('units')})
+    ])
+    baked_df = recipe.bake(df)
+
+    assert baked_df['units'].tolist() == [500, 3]
+    assert str(baked_df['units'].dtype) == 'uint64'
+    assert recipe.output_schema(df).dtypes.equals(baked_df.dtypes)
+
+
+def test_sums_of_booleans_are_integers(data):
+    recipe = Recipe([
+        GroupByStep(['seasons']),
+        SummarizeStep({'watched': AggSum('watched')})
+    ])
+    baked_df = recipe.bake(data)
+    expected = data.groupby('seasons')['watched'].agg('sum')
+
+    assert baked_df['watched'].tolist() == expected.tolist()
+    assert str(baked_df['watched'].dtype) == 'int64'
+    assert recipe.output_schema(data).dtypes.equals(baked_df.dtypes)
+
+
+def test_min_and_max_of_booleans_are_booleans(data):
+    recipe = Recipe([
+        GroupByStep(['seasons']),
+        SummarizeStep({'min': AggMin('watched'), 'max': AggMax('watched')})
+    ])
+    baked_df = recipe.bake(data)
+
+    assert baked_df['min'].tolist() == [False, True, True, False]
+    assert baked_df['max'].tolist() == [False, True, True, True]
+    assert str(baked_df['min'].dtype) == 'bool'
+    assert recipe.output_schema(data).dtypes.equals(baked_df.dtypes)
@@ -0,0 +1,105 @@
+import pytest
+import numpy as np
+import pandas as pd
+
+from yeast import Recipe
+from yeast.steps import CleanColumnNamesStep, MeanImputeStep, MedianImputeStep, FilterRowsStep
+from yeast.steps import OrdinalEncoderStep, CastColumnsStep, RenameColumnsStep, DropColumnsStep
+from yeast.steps import MutateStep, SelectColumnsStep, SortRowsStep
+from yeast.inference import InferenceFunction, to_arrays
+from yeast.errors import YeastBakeError
+
+from data_samples import startrek_data as data
+
+
+@pytest.fixture
+def recipe(data):
+    data.loc[2, 'rating'] = np.nan
+    return Recipe([
+        CleanColumnNamesStep('snake'),
+        MeanImputeStep(['rating']),
+        FilterRowsStep('rating > 7 and year > 1980'),
+        OrdinalEncoderStep(['title']),
+        CastColumnsStep({'year': 'float32'}),
+        RenameColumnsStep({'rating': 'score'}),
+        DropColumnsStep(['aired'])
+    ]).prepare(data)
+
+
+def test_compiled_recipe_bakes_the_same_columns(data, recipe):
+    bake = recipe.compile_for_inference(data)
+    baked = bake({column: data[column].tolist() for column in data.columns})
+    expected = to_arrays(recipe.bake(data))
+
+    assert isinstance(bake, InferenceFunction)
+    assert list(baked) == list(expected)
+    for column in expected:
+        assert baked[column].dtype == expected[column].dtype
+        assert baked[column].tolist() == expected[column].tolist()
+
+
+def test_compiled_recipe_bakes_one_row(data, recipe):
+    bake = recipe.compile_for_inference(data)
+    row = {column: data[column].iloc[2] for column in data.columns}
+
+    baked = bake(row)
+    assert baked == {
+        'title': 4, 'year': 1995.0, 'seasons': 7, 'watched': True, 'score': baked['score']
+    }
+    assert baked['score'] == pytest.approx(8.78)
+
+    row['year'] = 1970
+    assert bake(row) is None
+
+
+def test_compiled_recipe_bakes_record_arrays(data, recipe):
+    bake = recipe.compile_for_inference(data)
+    baked = bake(data.to_records(index=False))
+
+    assert isinstance(baked, np.recarray)
+    assert baked['title'].tolist() == [2, 3, 4, 0, 1]
+    assert baked['score'].tolist() == pytest.approx([9.3, 9.9, 8.78, 8.9, 9.0])
+
+
+def test_steps_without_compiled_version_are_baked_with_pandas(data):
+    recipe = Recipe([
+        MedianImputeStep(['rating']),
+        MutateStep({'decade': lambda df: df['year'] // 10 * 10}),
+        SortRowsStep(['rating']),
+        SelectColumnsStep(['title', 'decade'])
+    ]).prepare(data)
+    bake = recipe.compile_for_inference(data)
+
+    assert len(bake.functions) == 3
+    baked = bake({column: data[column].tolist() for column in data.columns})
+    assert baked['title'].tolist() == [
+        'Enterprise', 'Voyager', 'Deep Space Nine', 'Discovery', 'Picard', 'TNG'
+    ]
+    assert baked['decade'].tolist() == [2000, 1990, 1990, 2010, 2020, 1980]
+
+
+def test_unknown_values_are_encoded_like_bake(data, recipe):
+    bake = recipe.compile_for_inference(data)
+    row = {column: data[column].iloc[0] for column in data.columns}
+    row['title'] = 'Strange New Worlds'
+
+    baked = recipe.bake(pd.DataFrame({column: [value] for column, value in row.items()}))
+    assert pd.isna(baked['title'].iloc[0])
+    assert bake(row)['title'] is None
+
+    recipe.steps[3].unknown_value = -1
+    assert recipe.compile_for_inference(data)(row)['title'] == -1
+
+
+def test_compile_needs_a_prepared_recipe(data):
+    with pytest.raises(YeastBakeError):
+        Recipe([MeanImputeStep(['rating'])]).compile_for_inference(data)
+
+
+def test_missing_columns_raise_an_error(data, recipe):
+    bake = recipe.compile_for_inference(data)
+
+    with pytest.raises(YeastBakeError):
+        bake({'title': 'TNG'})
+    with pytest.raises(YeastBakeError):
+        bake(pd.DataFrame({'title': ['TNG']}))
@@ -160,3 +160,16 @@ def test_left_join_using_df_but_not_a_recipe(startrek_starships, startrek_starsh
 
     with pytest.raises(YeastValidationError) as ex:
         recipe.prepare(startrek_starships).bake(startrek_starships)
+
+
+def test_output_schema_of_a_join_with_a_recipe(startrek_starships, startrek_starships_specs):
+    right_recipe = Recipe([
+        RenameColumnsStep({'warp': 'speed'})
+    ])
+    recipe = Recipe([
+        JoinStep(right_recipe, by='uid', how='left', df=startrek_starships_specs)
+    ])
+    schema = recipe.output_schema(startrek_starships)
+
+    assert sorted(schema.columns) == ['name', 'speed', 'uid']
+    assert schema['speed'].dtype == 'float64'
@@ -80,3 +80,31 @@ def test_mean_inputation_on_a_non_numerical_column_must_fail(data):
 
     with pytest.raises(YeastPreparationError):
         recipe.prepare(data)
+
+
+def test_mean_inputation_prepared_by_chunks(data):
+    """
+    The running means calculated chunk by chunk are the same as the means of the whole data
+    """
+    data['rating'] = data['rating'].replace({9.3: np.NaN, 9.9: np.NaN})
+    step = MeanImputeStep(['year', 'rating'])
+    for chunk in [data.iloc[0:2], data.iloc[2:3], data.iloc[3:]]:
+        step.prepare_partial(chunk)
+    step.finalize()
+
+    assert step.prepared
+    assert step.means['year'] == pytest.approx(data['year'].mean())
+    assert step.means['rating'] == pytest.approx(data['rating'].mean())
+    assert step.bake(data)['rating'].round(1).tolist()[0] == 8.0
+
+
+def test_mean_inputation_only_modifies_the_columns_with_missing_values(data):
+    data.loc[1, 'rating'] = np.nan
+    recipe = Recipe([MeanImputeStep(['rating', 'year'])]).prepare(data)
+    step = recipe.steps[0]
+
+    assert step.means == pytest.approx({'rating': 8.28, 'year': 12013 / 6})
+    bdf = recipe.bake(data)
+    assert bdf['rating'][1] == pytest.approx(step.means['rating'])
+    assert bdf.dtypes.equals(data.dtypes)
+    assert bdf.drop(columns='rating').equals(data.drop(columns='rating'))
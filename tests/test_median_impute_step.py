@@ -1,5 +1,6 @@
 import pytest
 import numpy as np
+import pandas as pd
 
 from yeast import Recipe
 from yeast.steps import MedianImputeStep, MutateStep
@@ -82,3 +83,61 @@ def test_median_inputation_on_a_non_numerical_column_must_fail(data):
 
     with pytest.raises(YeastPreparationError):
         recipe.prepare(data)
+
+
+def test_median_inputation_prepared_by_chunks(data):
+    """
+    The sketches are exact on small datasets and they could be refreshed after prepare
+    """
+    step = MedianImputeStep(['year', 'rating'])
+    for chunk in [data.iloc[0:2], data.iloc[2:3], data.iloc[3:]]:
+        step.prepare_partial(chunk)
+    step.finalize()
+
+    assert step.medians['year'] == data['year'].median()
+    assert step.medians['rating'] == data['rating'].median()
+
+    step = MedianImputeStep(['year'], approx=True).prepare(data.iloc[0:3])
+    assert step.medians['year'] == 1995
+    step.prepare_partial(data.iloc[3:]).finalize()
+    assert step.medians['year'] == data['year'].median()
+
+    # The exact medians do not build the sketches
+    step = MedianImputeStep(['year']).prepare(data.iloc[0:3])
+    assert step.medians['year'] == 1995
+    assert step.digests == {}
+
+
+def test_approximated_median_inputation():
+    values = np.random.RandomState(42).lognormal(size=100000)
+    df = pd.DataFrame({'amount': values})
+    step = MedianImputeStep(['amount'], approx=True).prepare(df)
+
+    assert len(step.digests['amount'].means) <= 100
+    assert abs((values < step.medians['amount']).mean() - 0.5) < 0.005
+    assert step.bake(pd.DataFrame({'amount': [np.nan]}))['amount'][0] == step.medians['amount']
+
+    accurate = MedianImputeStep(['amount'], approx=True, compression=1000).prepare(df)
+    assert len(accurate.digests['amount'].means) > 100
+
+
+def test_median_sketches_merged_from_several_workers(data, tmp_path):
+    steps = [MedianImputeStep(['year', 'rating']) for i in range(3)]
+    for step, chunk in zip(steps, [data.iloc[0:2], data.iloc[2:3], data.iloc[3:]]):
+        step.prepare_partial(chunk)
+    step = steps[0].merge_sketches(steps[1]).merge_sketches(steps[2]).finalize()
+
+    assert step.medians['year'] == data['year'].median()
+    assert step.medians['rating'] == data['rating'].median()
+
+    # The sketches are saved with the recipe, so it could be refreshed after loading it
+    Recipe([step]).save(tmp_path / 'recipe')
+    loaded = Recipe.load(tmp_path / 'recipe').steps[0]
+    assert loaded.digests['year'].count == 6
+    loaded.prepare_partial(data.iloc[0:1]).finalize()
+    assert loaded.digests['year'].count == 7
+
+
+def test_median_inputation_compression_must_be_positive(data):
+    with pytest.raises(YeastValidationError):
+        MedianImputeStep(['year'], approx=True, compression=0).prepare(data)
@@ -1,10 +1,14 @@
 import pytest
+from pandas.core.groupby.generic import DataFrameGroupBy
 from yeast import Recipe
 from yeast.steps.mutate_step import MutateStep
 from yeast.steps.sort_rows_step import SortStep
 from yeast.steps.group_by_step import GroupByStep
+from yeast.steps.summarize_step import SummarizeStep
+from yeast.aggregations import AggMax
 from yeast.errors import YeastValidationError, YeastBakeError, YeastTransformerError
-from yeast.transformers import StrToLower, StrReplace, RowNumber
+from yeast.transformers import StrToLower, StrReplace, RowNumber, Lag, RollingMin
+from yeast.steps import SelectColumnsStep
 from data_samples import startrek_starships_specs as starship_data
 from data_samples import startrek_data
 
@@ -266,3 +270,93 @@ def test_rownumber_mutation_using_a_lambda_after_groupby(startrek_data):
 
     assert bdf[['seasons', 'row_number']].loc[5]['seasons'] == 7
     assert bdf[['seasons', 'row_number']].loc[5]['row_number'] == 3
+
+
+def test_independent_transformers_are_executed_in_the_same_wave():
+    """
+    A new wave is required to read the output of a previous transformer or a lambda function
+    """
+    step = MutateStep({
+        'title': StrToLower(),
+        'uid': StrReplace('-', ''),
+        'title_number': RowNumber('year'),
+        'title_lower': StrReplace(' ', '', 'title'),
+        'description': lambda df: df['uid'] + df['title'],
+        'number': RowNumber('rating')
+    })
+
+    assert step.waves() == [
+        ['title', 'uid', 'title_number'], ['title_lower'], ['description'], ['number']
+    ]
+
+
+def test_mutation_on_multiple_threads_is_the_same_as_sequential(startrek_data):
+    """
+    The new columns are added in order at once and the existing columns are updated
+    """
+    transformers = {
+        'title': StrToLower(),
+        'title_upper': StrReplace('voyager', 'VOYAGER', 'title'),
+        'year_number': RowNumber('year'),
+        'rating_number': RowNumber('rating'),
+        'seasons_number': RowNumber('seasons')
+    }
+    bdf = MutateStep(transformers, n_jobs=3).bake(startrek_data.copy())
+
+    assert bdf.columns.tolist()[-4:] == ['title_upper', 'year_number', 'rating_number',
+                                         'seasons_number']
+    assert bdf['title'].tolist()[0] == 'picard'
+    assert bdf['title_upper'].tolist()[2] == 'VOYAGER'
+    assert bdf.equals(MutateStep(transformers).bake(startrek_data.copy()))
+
+
+def test_mutation_after_groupby_keeps_the_groups(startrek_data):
+    """
+    Row-wise transformers are executed on all the rows, ranks by group and the result is grouped
+    by the same columns, so it could be summarized
+    """
+    bdf = Recipe([
+        GroupByStep('seasons'),
+        MutateStep({
+            'title': StrToLower(),
+            'row_number': RowNumber('rating'),
+            'rank_of_rank': RowNumber('row_number')
+        }),
+    ]).bake(startrek_data)
+
+    assert isinstance(bdf, DataFrameGroupBy)
+    assert bdf.obj['title'].tolist()[0] == 'picard'
+    assert bdf.obj['row_number'].tolist() == [1, 3, 1, 1, 2, 1]
+
+    sdf = SummarizeStep({'max_row': AggMax('row_number')}).bake(bdf)
+    assert sdf['max_row'].tolist() == [1, 1, 1, 3]
+
+
+def test_window_transformers_read_the_order_by_columns(startrek_data):
+    """
+    The order_by column is required by the projection pushdown and starts a new wave if it is
+    rewritten by the same step
+    """
+    steps = [
+        MutateStep({'previous': Lag('rating', order_by='year')}),
+        SelectColumnsStep(['rating', 'previous'])
+    ]
+    assert Recipe(steps).required_columns(startrek_data) == ['year', 'rating']
+
+    expected = Recipe(steps).bake(startrek_data)
+    assert Recipe(steps, optimize=True).bake(startrek_data).equals(expected)
+
+    step = MutateStep({'year': lambda df: -df['year'], 'previous': Lag('title', order_by='year')})
+    assert step.waves() == [['year'], ['previous']]
+    step = MutateStep({'seasons': StrToLower('title'), 'previous': Lag('title', order_by='year'),
+                       'year': StrToLower('title'), 'min': RollingMin('rating', order_by='year')})
+    assert step.waves() == [['seasons', 'previous', 'year'], ['min']]
+
+
+def test_window_transformers_read_the_group_keys(startrek_data):
+    gdf = startrek_data.groupby('seasons')
+    step = MutateStep({'seasons': StrToLower('title'), 'previous': Lag('title')})
+
+    assert step.waves(['seasons']) == [['seasons'], ['previous']]
+    assert step.reads(gdf) == ['title', 'seasons']
+    assert step.reads(startrek_data) == ['title']
@@ -0,0 +1,132 @@
+import tracemalloc
+import pytest
+import numpy as np
+import pandas as pd
+
+from yeast import Recipe
+from yeast.steps import OneHotEncoderStep
+from yeast.steps.one_hot_encoder_step import sparse_columns
+from yeast.errors import YeastValidationError
+
+from data_samples import startrek_characters
+
+
+@pytest.fixture
+def ranks():
+    return pd.DataFrame({
+        'id': [1, 2, 3, 4, 5, 6, 7],
+        'rank': ['Captain', 'Commander', 'Captain', None, 'Ensign', 'Captain', 'Commander']
+    })
+
+
+def test_one_hot_encoding_creates_one_sparse_column_for_each_category(ranks):
+    baked_df = OneHotEncoderStep('rank').prepare(ranks).bake(ranks)
+
+    assert baked_df.columns.tolist() == ['id', 'rank_Captain', 'rank_Commander', 'rank_Ensign']
+    assert (baked_df.dtypes[1:] == pd.SparseDtype('uint8', 0)).all()
+    assert baked_df['rank_Captain'].tolist() == [1, 0, 1, 0, 0, 1, 0]
+    assert baked_df['rank_Commander'].tolist() == [0, 1, 0, 0, 0, 0, 1]
+    assert baked_df['rank_Ensign'].tolist() == [0, 0, 0, 0, 1, 0, 0]
+
+
+def test_one_hot_encoding_is_the_same_as_get_dummies(startrek_characters):
+    expected = pd.get_dummies(startrek_characters, columns=['name', 'rank'], dtype='uint8')
+    step = OneHotEncoderStep(['name', 'rank'])
+
+    baked_df = step.prepare(startrek_characters).bake(startrek_characters)
+    assert baked_df.sparse.to_dense().equals(expected)
+
+    step = OneHotEncoderStep(['name', 'rank'], sparse=False)
+    assert step.prepare(startrek_characters).bake(startrek_characters).equals(expected)
+
+
+def test_categories_are_capped_by_frequency(ranks):
+    step = OneHotEncoderStep('rank', top_k=2).prepare(ranks)
+    assert step.bake(ranks).columns.tolist() == ['id', 'rank_Captain', 'rank_Commander']
+
+    step = OneHotEncoderStep('rank', min_frequency=3).prepare(ranks)
+    assert step.bake(ranks).columns.tolist() == ['id', 'rank_Captain']
+
+    step = OneHotEncoderStep('rank', min_frequency=0.3).prepare(ranks)
+    assert step.bake(ranks).columns.tolist() == ['id', 'rank_Captain', 'rank_Commander']
+
+
+def test_unknown_values_are_encoded_as_zeros(ranks):
+    step = OneHotEncoderStep('rank').prepare(ranks)
+    new_ranks = pd.DataFrame({'id': [8, 9], 'rank': ['Admiral', 'Ensign']})
+    baked_df = step.bake(new_ranks)
+
+    assert baked_df['rank_Captain'].tolist() == [0, 0]
+    assert baked_df['rank_Ensign'].tolist() == [0, 1]
+
+
+def test_categorical_columns_are_encoded_like_strings(ranks):
+    categorical = ranks.astype({'rank': 'category'})
+    expected = OneHotEncoderStep('rank').prepare(ranks).bake(ranks)
+
+    assert OneHotEncoderStep('rank').prepare(categorical).bake(categorical).equals(expected)
+
+
+def test_columns_with_mixed_types_are_encoded():
+    df = pd.DataFrame({'code': ['a', 1, None, 2.5, 'a']})
+    baked_df = OneHotEncoderStep('code').prepare(df).bake(df)
+
+    # Values that could not be compared are sorted as strings
+    assert baked_df.columns.tolist() == ['code_1', 'code_2.5', 'code_a']
+    assert baked_df['code_a'].tolist() == [1, 0, 0, 0, 1]
+    assert baked_df['code_1'].tolist() == [0, 1, 0, 0, 0]
+
+    baked_df = OneHotEncoderStep('code', top_k=1).prepare(df).bake(df)
+    assert baked_df.columns.tolist() == ['code_a']
+
+
+def test_one_hot_encoder_prepared_by_chunks(ranks):
+    recipe = Recipe([OneHotEncoderStep('rank', top_k=2)])
+    recipe.prepare_partial(ranks.iloc[0:3]).prepare_partial(ranks.iloc[3:]).finalize()
+
+    expected = Recipe([OneHotEncoderStep('rank', top_k=2)]).prepare(ranks)
+    assert recipe.bake(ranks).equals(expected.bake(ranks))
+
+
+def test_output_schema_and_required_columns(ranks):
+    recipe = Recipe([OneHotEncoderStep('rank')]).prepare(ranks)
+
+    assert recipe.output_schema(ranks).dtypes.equals(recipe.bake(ranks).dtypes)
+    assert recipe.required_columns(ranks) == ['id', 'rank']
+
+
+@pytest.mark.parametrize('parameters', [
+    {'selector': 'not_found'},
+    {'selector': 'rank', 'top_k': 0},
+    {'selector': 'rank', 'min_frequency': -1},
+])
+def test_invalid_parameters_raise_an_error(ranks, parameters):
+    with pytest.raises(YeastValidationError):
+        OneHotEncoderStep(**parameters).prepare(ranks)
+
+
+def test_large_number_of_categories_is_sparse():
+    codes = np.arange(100000) % 1000
+    df = pd.DataFrame({'code': [f'code_{i}' for i in codes]})
+    baked_df = OneHotEncoderStep('code').prepare(df).bake(df)
+
+    assert baked_df.shape == (100000, 1000)
+    assert baked_df.sparse.density == pytest.approx(0.001)
+    assert baked_df['code_code_7'].sparse.to_dense().sum() == 100
+
+
+def test_sparse_columns_memory_depends_on_the_number_of_ones():
+    codes = np.arange(200000) % 500
+    names = [f'code_{i}' for i in range(500)]
+    tracemalloc.start()
+    try:
+        baked_df = sparse_columns(codes, names, pd.RangeIndex(200000))
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    # The dense columns would need 100 MB
+    assert peak < 10 * 2 ** 20
+    assert baked_df.columns.tolist() == names
+    assert baked_df.sparse.density == pytest.approx(0.002)
+    assert baked_df['code_7'].sparse.to_dense().to_numpy().nonzero()[0][:2].tolist() == [7, 507]
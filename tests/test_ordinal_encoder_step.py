@@ -58,3 +58,64 @@ def test_ordinal_score_on_columns_doesnot_exist_should_raise_an_error(startrek_c
 
     with pytest.raises(YeastValidationError):
         step.prepare(startrek_characters)
+
+
+def test_ordinal_score_prepared_by_chunks(startrek_characters):
+    """
+    The categories of all the chunks are sorted as if the step were prepared with all the data
+    """
+    step = OrdinalEncoderStep(['rank'])
+    step.prepare_partial(startrek_characters.iloc[0:3])
+    step.prepare_partial(startrek_characters.iloc[3:])
+    step.finalize()
+
+    expected = OrdinalEncoderStep(['rank']).prepare(startrek_characters).get_mapping()
+    assert step.get_mapping() == expected
+
+
+def test_mappings_are_the_same_as_get_mapping(startrek_characters):
+    step = OrdinalEncoderStep(['name', 'rank']).prepare(startrek_characters)
+
+    assert step.mappings == step.get_mapping()
+    assert list(step.mappings) == ['name', 'rank']
+    with pytest.raises(AttributeError):
+        step.mappings = {}
+
+
+def test_unknown_values_are_encoded_as_na_or_the_unknown_value(startrek_characters):
+    train, test = startrek_characters.iloc[0:4], startrek_characters.iloc[4:]
+
+    baked_df = OrdinalEncoderStep(['rank']).prepare(train).bake(test.copy())
+    assert baked_df['rank'].isna().tolist() == [True, True, False, True]
+
+    step = OrdinalEncoderStep(['rank'], unknown_value=-1)
+    baked_df = step.prepare(train).bake(test.copy())
+    assert baked_df['rank'].tolist() == [-1, -1, 0, -1]
+
+
+def test_unknown_value_must_be_an_integer(startrek_characters):
+    with pytest.raises(YeastValidationError):
+        OrdinalEncoderStep(['rank'], unknown_value='other').prepare(startrek_characters)
+
+
+def test_encoded_columns_use_the_smallest_integer_type():
+    df = pd.DataFrame({
+        'small': [f'c{i % 100}' for i in range(1000)],
+        'large': [f'c{i}' for i in range(1000)]
+    })
+    baked_df = OrdinalEncoderStep(['small', 'large']).prepare(df).bake(df.copy())
+
+    assert baked_df['small'].dtype == 'Int8'
+    assert baked_df['large'].dtype == 'Int16'
+    step = OrdinalEncoderStep(['small'], unknown_value=-129).prepare(df)
+    assert step.bake(df)['small'].dtype == 'Int16'
+
+
+def test_categorical_columns_are_encoded_by_their_categories(startrek_characters):
+    train = startrek_characters.copy()
+    test = startrek_characters.iloc[::-1].copy()
+    test['rank'] = test['rank'].astype('category')
+    step = OrdinalEncoderStep(['rank']).prepare(train)
+
+    expected = step.bake(startrek_characters.iloc[::-1].copy())['rank'].tolist()
+    assert step.bake(test)['rank'].tolist() == expected
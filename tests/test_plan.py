@@ -0,0 +1,135 @@
+import pandas as pd
+
+from yeast import Recipe
+from yeast.plan import Plan
+from yeast.steps import FilterStep, MutateStep, RenameColumnsStep, CastStep, SelectStep
+from yeast.steps import DropColumnsStep, MeanImputeStep, LeftJoinStep, RightJoinStep
+from yeast.steps import SortRowsStep
+from yeast.transformers import StrToLower, RowNumber
+
+from data_samples import startrek_data as data
+
+
+def test_noop_steps_are_removed():
+    plan = Plan([
+        RenameColumnsStep({}),
+        CastStep({'year': 'integer'}),
+        DropColumnsStep([])
+    ]).optimize()
+
+    assert len(plan.steps) == 1
+    assert isinstance(plan.steps[0], CastStep)
+    assert len(plan.rewrites) == 2
+
+
+def test_consecutive_renames_and_casts_are_merged(data):
+    recipe = Recipe([
+        RenameColumnsStep({'title': 'name'}),
+        RenameColumnsStep({'name': 'series', 'year': 'aired_year'}),
+        CastStep({'rating': 'float32'}),
+        CastStep({'aired_year': 'float'})
+    ], optimize=True)
+    plan = recipe.plan()
+
+    assert len(plan.steps) == 2
+    assert plan.steps[0].mapping == {'title': 'series', 'name': 'series', 'year': 'aired_year'}
+    assert plan.steps[1].mapping == {'rating': 'float32', 'aired_year': 'float'}
+    assert recipe.bake(data).equals(Recipe(recipe.steps).bake(data))
+
+
+def test_casts_to_different_types_are_not_merged():
+    plan = Plan([
+        CastStep({'rating': 'integer'}),
+        CastStep({'rating': 'float'})
+    ]).optimize()
+
+    assert len(plan.steps) == 2
+
+
+def test_filter_is_executed_before_unrelated_mutations(data):
+    recipe = Recipe([
+        MutateStep({'title': StrToLower()}),
+        FilterStep('rating > 9')
+    ], optimize=True)
+    plan = recipe.plan()
+
+    assert isinstance(plan.steps[0], FilterStep)
+    assert recipe.bake(data)['title'].tolist() == ['picard', 'tng']
+
+
+def test_filter_is_not_moved_before_steps_that_write_or_depend_on_other_rows():
+    plan = Plan([
+        MutateStep({'rating': lambda df: df['rating'] * 2}),
+        FilterStep('rating > 9'),
+        MutateStep({'row_number': RowNumber('year')}),
+        FilterStep('year > 2000'),
+        MeanImputeStep(['rating']),
+        FilterStep('year > 2010')
+    ]).optimize()
+
+    assert not plan.rewrites
+
+
+def test_filter_is_not_executed_before_joins_that_reset_the_index():
+    clients = pd.DataFrame({'year': [2020], 'client': ['Paramount']})
+    plan = Plan([
+        LeftJoinStep(clients, by='year'),
+        FilterStep('rating > 9'),
+        RightJoinStep(clients, by='year'),
+        FilterStep('rating > 9')
+    ]).optimize()
+
+    assert not plan.rewrites
+
+
+def test_filter_is_not_executed_before_sorts(data):
+    steps = [
+        SortRowsStep('year'),
+        MutateStep({'title': StrToLower()}),
+        FilterStep('rating > 9')
+    ]
+    recipe = Recipe(steps, optimize=True)
+    plan = recipe.plan()
+
+    assert isinstance(plan.steps[0], SortRowsStep)
+    assert isinstance(plan.steps[1], FilterStep)
+    baked_df = recipe.bake(data)
+    expected = Recipe(steps).bake(data)
+    assert baked_df.equals(expected)
+    assert baked_df.index.tolist() == expected.index.tolist()
+
+
+def test_columns_are_dropped_and_selected_as_early_as_possible(data):
+    recipe = Recipe([
+        MutateStep({'title': StrToLower()}),
+        CastStep({'rating': 'float32'}),
+        SelectStep(['title', 'rating', 'aired']),
+        DropColumnsStep(['aired'])
+    ], optimize=True)
+    plan = recipe.plan()
+
+    assert isinstance(plan.steps[0], SelectStep)
+    assert isinstance(plan.steps[1], DropColumnsStep)
+    assert recipe.bake(data).equals(Recipe(recipe.steps).bake(data))
+
+
+def test_plan_only_contains_the_steps_of_the_role():
+    plan = Recipe([
+        FilterStep('rating > 9', role='train'),
+        SelectStep(['title'], role='test')
+    ]).plan(role='test')
+
+    assert len(plan.steps) == 1
+    assert isinstance(plan.steps[0], SelectStep)
+
+
+def test_explain_prints_the_plan_and_the_rewrites(capsys):
+    Recipe([
+        MutateStep({'title': StrToLower()}),
+        FilterStep('rating > 9')
+    ]).explain()
+    output = capsys.readouterr().out
+
+    assert '1. FilterStep' in output
+    assert '2. MutateStep' in output
+    assert 'Moved FilterStep' in output
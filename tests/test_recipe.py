@@ -2,6 +2,9 @@ import pytest
 import pandas as pd
 
 from yeast import Recipe, steps, errors
+from yeast.step import Step
+from yeast.selectors import AllMatching
+from yeast.transformers import StrToLower
 
 
 @pytest.fixture
@@ -92,3 +95,303 @@ def test_custom_roles_workflow(raw_data):
     test = recipe.bake(raw_data, role='test')
     assert test.shape == (6, 1)  # Filter Step was applied
     assert 'total_seasons' in test.columns  # Only total_seasons in test role
+
+
+def test_bake_without_copy_should_not_modify_the_original_data(raw_data):
+    """
+    Steps that modify the data in place must work on a copy even if copy=False
+    """
+    recipe = Recipe([
+        steps.ReplaceNAStep('CreationYear', 0),
+        steps.MutateStep({'CreationYear': lambda df: df['CreationYear'] * 0})
+    ])
+    baked_data = recipe.bake(raw_data, copy=False)
+    assert baked_data['CreationYear'].tolist() == [0, 0, 0, 0, 0, 0]
+    assert raw_data['CreationYear'].tolist() == [2020, 1987, 1995, 2001, 1993, 2017]
+
+
+def test_bake_without_copy_should_not_copy_on_select_and_filter(raw_data, monkeypatch):
+    """
+    Selecting and filtering return new DataFrames, a full copy is never required
+    """
+    recipe = Recipe([
+        steps.SelectColumnsStep(['CreationYear', 'Total Seasons']),
+        steps.FilterStep('CreationYear > 2000'),
+        steps.MutateStep({'CreationYear': lambda df: df['CreationYear'] * 0})
+    ])
+    expected = recipe.bake(raw_data)
+
+    def fail_on_copy(*args, **kwargs):
+        raise AssertionError('The DataFrame should not be copied')
+
+    monkeypatch.setattr(pd.DataFrame, 'copy', fail_on_copy)
+    baked_data = recipe.bake(raw_data, copy=False)
+    assert baked_data.equals(expected)
+    assert raw_data['CreationYear'].tolist() == [2020, 1987, 1995, 2001, 1993, 2017]
+
+
+def test_required_columns_are_calculated_backwards_from_the_output(raw_data):
+    """
+    Only the columns read by the steps or returned by the recipe are required
+    """
+    recipe = Recipe([
+        steps.CleanColumnNamesStep('snake'),
+        steps.MutateStep({'series_name': StrToLower()}),
+        steps.FilterStep('total_seasons > 2'),
+        steps.SelectColumnsStep(['series_name'])
+    ])
+    assert recipe.required_columns(raw_data) == ['series_Name', 'Total Seasons']
+    assert recipe.required_columns({
+        'series_Name': 'string', 'CreationYear': 'int64', 'Total Seasons': 'int64'
+    }) == ['series_Name', 'Total Seasons']
+
+
+def test_required_columns_are_resolved_using_selectors_and_joins(raw_data):
+    studios = pd.DataFrame({'CreationYear': [2020, 1987], 'studio': ['CBS', 'Paramount']})
+    recipe = Recipe([
+        steps.LeftJoinStep(studios, by='CreationYear'),
+        steps.SelectColumnsStep([AllMatching('^s')])
+    ])
+    assert recipe.required_columns(raw_data) == ['series_Name', 'CreationYear']
+
+
+def test_all_columns_are_required_by_lambda_functions(raw_data):
+    recipe = Recipe([
+        steps.MutateStep({'name': lambda df: df['series_Name']}),
+        steps.SelectColumnsStep(['name'])
+    ])
+    assert recipe.required_columns(raw_data) == ['series_Name', 'CreationYear', 'Total Seasons']
+
+
+def test_optimized_recipe_removes_the_columns_that_are_not_required(raw_data):
+    seen_columns = []
+    recipe = Recipe([
+        steps.MutateStep({'series_Name': StrToLower()}),
+        steps.CustomStep(to_bake=lambda step, df: seen_columns.append(df.columns.tolist()) or df),
+        steps.SelectColumnsStep(['series_Name'])
+    ], optimize=True)
+    baked_data = recipe.bake(raw_data)
+
+    assert seen_columns[-1] == ['series_Name', 'CreationYear', 'Total Seasons']
+    assert baked_data.columns.tolist() == ['series_Name']
+    assert baked_data['series_Name'].tolist()[0] == 'picard'
+
+
+def test_optimized_recipe_prunes_the_columns_that_are_not_required(raw_data, monkeypatch):
+    seen_columns = []
+    recipe = Recipe([
+        steps.SortRowsStep(['CreationYear']),
+        steps.MutateStep({'series_Name': StrToLower()}),
+        steps.SelectColumnsStep(['series_Name'])
+    ], optimize=True)
+    sort_bake = steps.SortRowsStep.do_bake
+    monkeypatch.setattr(
+        steps.SortRowsStep, 'do_bake',
+        lambda step, df: seen_columns.append(df.columns.tolist()) or sort_bake(step, df)
+    )
+    assert recipe.required_columns(raw_data) == ['series_Name', 'CreationYear']
+
+    baked_data = recipe.bake(raw_data)
+    assert seen_columns[-1] == ['series_Name', 'CreationYear']
+    assert baked_data['series_Name'].tolist() == ['tng', 'deep space nine', 'voyager',
+                                                  'enterprise', 'discovery', 'picard']
+
+
+def test_bake_stream_bakes_each_chunk(raw_data):
+    recipe = Recipe([
+        steps.MeanImputeStep(['Total Seasons']),
+        steps.FilterStep('CreationYear > 1990'),
+        steps.MutateStep({'series_Name': StrToLower()}),
+        steps.CastStep({'Total Seasons': 'float'})
+    ])
+    recipe.prepare(raw_data)
+    chunks = [raw_data.iloc[0:2], raw_data.iloc[2:4], raw_data.iloc[4:]]
+    baked_chunks = recipe.bake_stream(chunks)
+
+    assert not isinstance(baked_chunks, list)
+    assert pd.concat(baked_chunks).equals(recipe.bake(raw_data))
+    assert raw_data['series_Name'].tolist()[0] == 'Picard'
+
+
+def test_bake_stream_keeps_the_index_of_joins(raw_data):
+    studios = pd.DataFrame({'Total Seasons': [1, 2, 4, 7], 'studio': ['CBS', 'CBS', 'UPN', 'PT']})
+    recipe = Recipe([
+        steps.LeftJoinStep(studios, by='Total Seasons'),
+        steps.FilterStep('CreationYear > 1990')
+    ])
+    chunks = [raw_data.iloc[0:2], raw_data.iloc[2:4], raw_data.iloc[4:]]
+    baked_df = pd.concat(recipe.bake_stream(chunks))
+
+    assert baked_df.equals(recipe.bake(raw_data))
+    assert baked_df.index.tolist() == [0, 2, 3, 4, 5]
+
+
+def test_bake_stream_raises_an_error_on_steps_that_need_all_the_rows(raw_data):
+    recipe = Recipe([
+        steps.FilterStep('CreationYear > 1990'),
+        steps.SortStep('CreationYear')
+    ])
+    with pytest.raises(errors.YeastRecipeError) as ex:
+        recipe.bake_stream([raw_data])
+    assert 'SortStep' in str(ex.value)
+
+    with pytest.raises(errors.YeastBakeError):
+        Recipe([steps.MeanImputeStep(['Total Seasons'])]).bake_stream([raw_data])
+
+
+def test_bake_stream_skips_the_steps_of_other_roles(raw_data):
+    recipe = Recipe([
+        steps.FilterStep('CreationYear > 1990'),
+        steps.SortStep('CreationYear', role='train')
+    ])
+    baked_chunks = list(recipe.bake_stream([raw_data.iloc[0:3], raw_data.iloc[3:]], role='test'))
+
+    assert len(baked_chunks) == 2
+    assert baked_chunks[0].shape[0] == 2
+    assert baked_chunks[1].shape[0] == 3
+
+
+def test_prepare_partial_folds_each_chunk_into_the_steps(raw_data):
+    recipe = Recipe([
+        steps.FilterStep('CreationYear > 1990'),
+        steps.MeanImputeStep(['Total Seasons']),
+        steps.OrdinalEncoderStep(['series_Name'])
+    ])
+    recipe.prepare_partial(raw_data.iloc[0:3]).prepare_partial(raw_data.iloc[3:]).finalize()
+
+    # The OrdinalEncoderStep needs the final means: a second pass is required
+    assert not recipe.is_prepared()
+    recipe.prepare_partial(raw_data.iloc[0:3]).prepare_partial(raw_data.iloc[3:]).finalize()
+    assert recipe.is_prepared()
+
+    expected = Recipe([
+        steps.FilterStep('CreationYear > 1990'),
+        steps.MeanImputeStep(['Total Seasons']),
+        steps.OrdinalEncoderStep(['series_Name'])
+    ]).prepare(raw_data)
+    assert recipe.bake(raw_data).equals(expected.bake(raw_data))
+
+
+def test_prepare_partial_raises_an_error_on_steps_that_need_all_the_data(raw_data):
+    class MaxYearStep(Step):
+        def __init__(self):
+            super().__init__(needs_preparation=True)
+
+    with pytest.raises(errors.YeastRecipeError):
+        Recipe([MaxYearStep()]).prepare_partial(raw_data)
+
+
+def test_bake_in_parallel_is_the_same_as_bake(raw_data):
+    recipe = Recipe([
+        steps.MeanImputeStep(['Total Seasons']),
+        steps.FilterStep('CreationYear > 1990'),
+        steps.MutateStep({'series_Name': StrToLower()}),
+        steps.SortStep('CreationYear')
+    ]).prepare(raw_data)
+    baked_data = recipe.bake(raw_data, n_jobs=3)
+
+    assert baked_data.equals(recipe.bake(raw_data))
+    assert raw_data['series_Name'].tolist()[0] == 'Picard'
+
+
+def test_bake_in_parallel_keeps_the_index_of_joins(raw_data):
+    studios = pd.DataFrame({'Total Seasons': [1, 2, 4, 7], 'studio': ['CBS', 'CBS', 'UPN', 'PT']})
+    recipe = Recipe([
+        steps.LeftJoinStep(studios, by='Total Seasons'),
+        steps.SelectStep(['series_Name', 'studio'])
+    ])
+    baked_data = recipe.bake(raw_data, n_jobs=2)
+
+    assert baked_data.equals(recipe.bake(raw_data))
+    assert baked_data.index.tolist() == [0, 1, 2, 3, 4, 5]
+
+
+def test_bake_in_parallel_without_row_local_steps_is_serial(raw_data, monkeypatch):
+    monkeypatch.setattr('yeast.recipe.ProcessPoolExecutor', None)
+    recipe = Recipe([
+        steps.SortStep('CreationYear'),
+        steps.MutateStep({'series_Name': StrToLower()})
+    ])
+    baked_data = recipe.bake(raw_data, n_jobs=-1)
+
+    assert baked_data['series_Name'].tolist()[0] == 'tng'
+    assert raw_data['series_Name'].tolist()[0] == 'Picard'
+
+
+class CountValidationsStep(Step):
+    def __init__(self):
+        self.validations = 0
+        super().__init__()
+
+    def do_validate(self, df):
+        self.validations += 1
+
+
+@pytest.mark.parametrize('policy, validations', [('always', 3), ('once', 2), ('never', 1)])
+def test_validation_policy(raw_data, policy, validations):
+    step = CountValidationsStep()
+    recipe = Recipe([step], validate=policy)
+    recipe.prepare(raw_data).bake(raw_data)
+    recipe.bake(raw_data.head(2))
+    # Same rows with other schema:
+    recipe.bake(raw_data.astype({'CreationYear': 'float64'}))
+
+    assert step.validations == validations
+
+
+def test_prepared_steps_are_validated_again_when_the_schema_changes(raw_data):
+    recipe = Recipe([steps.SelectColumnsStep(['series_Name', 'CreationYear'])]).prepare(raw_data)
+    recipe.bake(raw_data)
+
+    with pytest.raises(errors.YeastValidationError):
+        recipe.bake(raw_data.drop(columns=['CreationYear']))
+
+
+def test_steps_that_validate_the_data_are_always_validated(raw_data):
+    validations = []
+    recipe = Recipe([steps.CustomStep(to_validate=lambda step, df: validations.append(df))])
+    recipe.bake(raw_data)
+    recipe.bake(raw_data)
+
+    assert len(validations) == 2
+
+
+def test_unknown_validation_policy_raises_an_error():
+    with pytest.raises(errors.YeastRecipeError):
+        Recipe([steps.SortStep('CreationYear')], validate='sometimes')
+
+
+def test_output_schema_is_inferred_without_baking(raw_data):
+    recipe = Recipe([
+        steps.CleanColumnNamesStep('snake'),
+        steps.CastColumnsStep({'total_seasons': 'float32'}),
+        steps.FilterStep('creation_year > 1990'),
+        steps.DropColumnsStep(['creation_year'])
+    ])
+    schema = recipe.output_schema(raw_data)
+
+    assert schema.shape[0] == 0
+    assert schema.dtypes.equals(recipe.bake(raw_data).dtypes)
+
+    schema = {'series_Name': 'string', 'CreationYear': 'int64', 'Total Seasons': 'int64'}
+    assert recipe.output_schema(schema).columns.tolist() == ['series_name', 'total_seasons']
+
+
+def test_output_schema_validates_the_steps(raw_data):
+    recipe = Recipe([
+        steps.CleanColumnNamesStep('snake'),
+        steps.SelectColumnsStep(['creation_year', 'seasons'])
+    ])
+
+    with pytest.raises(errors.YeastValidationError):
+        recipe.output_schema(raw_data)
+
+
+def test_output_schema_of_steps_that_are_not_prepared_is_unknown(raw_data):
+    recipe = Recipe([steps.DropZVColumnsStep()])
+
+    with pytest.raises(errors.YeastRecipeError):
+        recipe.output_schema(raw_data)
+    assert recipe.prepare(raw_data).output_schema(raw_data).columns.tolist() == [
+        'series_Name', 'CreationYear', 'Total Seasons'
+    ]
@@ -0,0 +1,86 @@
+import pytest
+import numpy as np
+import pandas as pd
+
+from yeast import Recipe
+from yeast import serialization
+from yeast.steps import MeanImputeStep, MedianImputeStep, OrdinalEncoderStep, DropZVColumnsStep
+from yeast.steps import MutateStep
+from yeast.errors import YeastRecipeError
+
+from data_samples import startrek_data as data
+
+
+def test_prepared_recipe_is_saved_and_loaded(data, tmp_path):
+    data.loc[1, 'rating'] = np.nan
+    data['constant'] = 1
+    recipe = Recipe([
+        MeanImputeStep(['rating']),
+        MedianImputeStep(['year']),
+        OrdinalEncoderStep(['title']),
+        DropZVColumnsStep()
+    ]).prepare(data)
+    recipe.save(tmp_path / 'recipe.yeast')
+
+    for mmap_mode in [True, False]:
+        loaded = Recipe.load(tmp_path / 'recipe.yeast', mmap_mode=mmap_mode)
+        assert loaded.steps[0].means == recipe.steps[0].means
+        assert loaded.steps[2].get_mapping() == recipe.steps[2].get_mapping()
+        assert loaded.steps[3].removals == ['constant']
+        assert loaded.bake(data).equals(recipe.bake(data))
+
+
+def test_large_mappings_are_stored_as_arrays(tmp_path):
+    df = pd.DataFrame({'code': [f'code_{i:05}' for i in range(2000)]})
+    recipe = Recipe([OrdinalEncoderStep('code')]).prepare(df)
+    recipe.save(tmp_path / 'recipe.yeast')
+
+    with open(tmp_path / 'recipe.yeast', 'rb') as f:
+        _, _, pickle_size, buffers = serialization.HEADER.unpack(f.read(serialization.HEADER.size))
+    assert buffers == 1
+    assert pickle_size < 1000
+
+    loaded = Recipe.load(tmp_path / 'recipe.yeast')
+    assert loaded.steps[0].get_mapping()['code'] == recipe.steps[0].get_mapping()['code']
+    # The categories could be refreshed with more data after loading
+    loaded.steps[0].prepare_partial(pd.DataFrame({'code': ['code_99999']})).finalize()
+    assert loaded.steps[0].get_mapping()['code']['code_99999'] == 2000
+
+
+def test_arrays_are_stored_in_the_pickle_without_the_protocol_5(tmp_path, monkeypatch):
+    df = pd.DataFrame({'code': [f'code_{i:05}' for i in range(2000)]})
+    recipe = Recipe([OrdinalEncoderStep('code')]).prepare(df)
+    recipe.save(tmp_path / 'buffers.yeast')
+
+    # Python 3.7 without the pickle5 backport
+    monkeypatch.setattr(serialization, 'PROTOCOL', 4)
+    recipe.save(tmp_path / 'recipe.yeast')
+    with open(tmp_path / 'recipe.yeast', 'rb') as f:
+        _, _, _, buffers = serialization.HEADER.unpack(f.read(serialization.HEADER.size))
+    assert buffers == 0
+
+    loaded = Recipe.load(tmp_path / 'recipe.yeast')
+    assert loaded.steps[0].get_mapping()['code'] == recipe.steps[0].get_mapping()['code']
+    with pytest.raises(YeastRecipeError):
+        Recipe.load(tmp_path / 'buffers.yeast')
+
+
+def test_invalid_files_are_not_loaded(tmp_path):
+    (tmp_path / 'empty.yeast').write_bytes(b'')
+    with pytest.raises(YeastRecipeError):
+        Recipe.load(tmp_path / 'empty.yeast')
+
+    header = serialization.HEADER.pack(b'YEAST', serialization.FORMAT_VERSION + 1, 0, 0)
+    (tmp_path / 'newer.yeast').write_bytes(header)
+    with pytest.raises(YeastRecipeError):
+        Recipe.load(tmp_path / 'newer.yeast')
+
+    serialization.save({'not': 'a recipe'}, tmp_path / 'dict.yeast')
+    with pytest.raises(YeastRecipeError):
+        Recipe.load(tmp_path / 'dict.yeast')
+
+
+def test_recipes_with_lambdas_could_not_be_saved(tmp_path):
+    recipe = Recipe([MutateStep({'rating': lambda df: df['rating'] * 2})])
+    with pytest.raises(YeastRecipeError):
+        recipe.save(tmp_path / 'recipe.yeast')
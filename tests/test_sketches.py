@@ -0,0 +1,38 @@
+import numpy as np
+
+from yeast.sketches import TDigest
+
+
+def test_tdigest_is_exact_on_small_datasets():
+    digest = TDigest().update([4, 1, np.NaN, 3, 2])
+
+    assert digest.count == 4
+    assert digest.median() == 2.5
+    assert digest.quantile(0) == 1
+    assert digest.quantile(1) == 4
+
+
+def test_tdigest_on_empty_data_returns_na():
+    assert np.isnan(TDigest().update([np.NaN]).median())
+
+
+def test_tdigest_is_bounded_and_accurate_on_large_datasets():
+    values = np.random.RandomState(42).lognormal(size=200000)
+    digest = TDigest()
+    for chunk in np.array_split(values, 20):
+        digest.update(chunk)
+
+    assert len(digest.means) <= 100
+    for q in [0.01, 0.25, 0.5, 0.75, 0.99]:
+        # The error is measured on the ranks
+        assert abs((values < digest.quantile(q)).mean() - q) < 0.005
+
+
+def test_tdigest_merge_is_the_same_as_update_with_all_the_values():
+    values = np.random.RandomState(42).normal(size=50000)
+    digest = TDigest().update(values[:20000]).merge(TDigest().update(values[20000:]))
+
+    assert digest.count == 50000
+    assert digest.min == values.min()
+    assert digest.max == values.max()
+    assert abs((values < digest.median()).mean() - 0.5) < 0.005
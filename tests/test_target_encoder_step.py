@@ -0,0 +1,127 @@
+import pytest
+import numpy as np
+import pandas as pd
+
+from yeast import Recipe
+from yeast.steps import TargetEncoderStep, MeanImputeStep
+from yeast.errors import YeastValidationError
+
+
+@pytest.fixture
+def ranks():
+    return pd.DataFrame({
+        'rank': ['Captain', 'Commander', 'Captain', None, 'Ensign', 'Captain', 'Commander', 'Ensign'],
+        'promoted': [1, 0, 1, 0, 1, 0, 0, np.nan]
+    })
+
+
+def test_target_encoding_is_the_smoothed_mean_of_each_category(ranks):
+    baked_df = TargetEncoderStep('rank', 'promoted', smoothing=0).prepare(ranks).bake(ranks)
+
+    assert baked_df['rank'].dtype == 'float64'
+    assert baked_df['rank'].tolist() == pytest.approx(
+        [2 / 3, 0, 2 / 3, 3 / 7, 1, 2 / 3, 0, 1]
+    )
+    assert baked_df['promoted'].equals(ranks['promoted'])
+
+
+def test_rare_categories_are_closer_to_the_prior(ranks):
+    step = TargetEncoderStep('rank', 'promoted', smoothing=2).prepare(ranks)
+    prior = 3 / 7
+
+    assert step.prior == pytest.approx(prior)
+    assert step.tables['rank']['Captain'] == pytest.approx((2 + 2 * prior) / (3 + 2))
+    assert step.tables['rank']['Ensign'] == pytest.approx((1 + 2 * prior) / (1 + 2))
+
+
+def test_unknown_values_are_encoded_as_the_prior(ranks):
+    step = TargetEncoderStep('rank', 'promoted').prepare(ranks)
+    new_df = pd.DataFrame({'rank': ['Admiral', None, 'Captain']})
+
+    baked = step.bake(new_df)['rank'].tolist()
+    assert baked[:2] == pytest.approx([3 / 7, 3 / 7])
+    assert baked[2] == pytest.approx(step.tables['rank']['Captain'])
+
+
+def test_out_of_fold_encoding_does_not_see_the_target_of_the_row():
+    df = pd.DataFrame({
+        'id': np.arange(1000) % 50,
+        'target': np.random.RandomState(1).randint(0, 2, 1000)
+    })
+    train = df.copy()
+    step = TargetEncoderStep('id', 'target', smoothing=0, folds=5).prepare(train)
+    baked_df = step.bake(train)
+
+    # Check one row with a brute force out-of-fold encoding
+    folds = np.random.RandomState(0).permutation(1000) % 5
+    others = df[(folds != folds[7]) & (df['id'] == df['id'][7])]
+    assert baked_df['id'][7] == pytest.approx(others['target'].mean())
+
+    # The following bakes use the table of all the rows
+    full = df.groupby('id')['target'].mean()
+    assert step.bake(df.copy())['id'].tolist() == pytest.approx(full[df['id']].tolist())
+    assert not np.allclose(baked_df['id'], full[df['id']])
+
+
+def test_other_data_with_the_same_index_is_not_encoded_out_of_fold():
+    df = pd.DataFrame({'id': np.arange(100) % 5, 'target': np.arange(100) % 2})
+    step = TargetEncoderStep('id', 'target', folds=5).prepare(df)
+    full = TargetEncoderStep('id', 'target').prepare(df)
+
+    assert step.bake(df.copy())['id'].tolist() == full.bake(df.copy())['id'].tolist()
+
+
+def test_recipe_prepares_the_next_steps_with_the_out_of_fold_values(ranks):
+    train = ranks.copy()
+    oof = TargetEncoderStep('rank', 'promoted', folds=2).prepare(train).bake(train)
+    recipe = Recipe([
+        TargetEncoderStep('rank', 'promoted', folds=2),
+        MeanImputeStep(['rank'])
+    ]).prepare(ranks)
+
+    assert recipe.steps[1].means['rank'] == pytest.approx(oof['rank'].mean())
+    assert recipe.bake(ranks)['rank'].tolist() == pytest.approx(
+        recipe.steps[0].bake(ranks.copy())['rank'].tolist()
+    )
+
+
+def test_target_encoding_prepared_by_chunks(ranks):
+    expected = TargetEncoderStep('rank', 'promoted').prepare(ranks).bake(ranks.copy())
+
+    recipe = Recipe([TargetEncoderStep('rank', 'promoted')])
+    recipe.prepare_partial(ranks.iloc[:3]).prepare_partial(ranks.iloc[3:]).finalize()
+    assert recipe.bake(ranks)['rank'].tolist() == pytest.approx(expected['rank'].tolist())
+
+
+def test_target_is_not_required_to_bake(ranks):
+    recipe = Recipe([TargetEncoderStep('rank', 'promoted')])
+
+    assert recipe.required_columns(ranks) == ['rank', 'promoted']
+    recipe.prepare(ranks)
+    assert recipe.required_columns(ranks) == ['rank', 'promoted']
+    assert recipe.required_columns(ranks[['rank']]) == ['rank']
+
+    bake = recipe.compile_for_inference(ranks[['rank']])
+    assert bake({'rank': 'Ensign'})['rank'] == pytest.approx(recipe.steps[0].tables['rank']['Ensign'])
+    assert recipe.output_schema(ranks[['rank']]).dtypes['rank'] == 'float64'
+
+
+def test_saved_target_encoding_bakes_the_same(ranks, tmp_path):
+    recipe = Recipe([TargetEncoderStep('rank', 'promoted', folds=2)]).prepare(ranks)
+    recipe.save(tmp_path / 'recipe')
+
+    loaded = Recipe.load(tmp_path / 'recipe')
+    assert loaded.bake(ranks).equals(recipe.bake(ranks))
+
+
+def test_target_encoding_validations(ranks):
+    with pytest.raises(YeastValidationError):
+        TargetEncoderStep('not_found', 'promoted').prepare(ranks)
+    with pytest.raises(YeastValidationError):
+        TargetEncoderStep('rank', 'not_found').prepare(ranks)
+    with pytest.raises(YeastValidationError):
+        TargetEncoderStep('rank', 'rank').prepare(ranks)
+    with pytest.raises(YeastValidationError):
+        TargetEncoderStep('rank', 'promoted', smoothing=-1).prepare(ranks)
+    with pytest.raises(YeastValidationError):
+        TargetEncoderStep('rank', 'promoted', folds=1).prepare(ranks)
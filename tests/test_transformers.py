@@ -1,3 +1,4 @@
+import pytest
 import numpy as np
 import pandas as pd
 
@@ -6,6 +7,9 @@ from yeast.transformers import StrSlice, StrReplace, StrRemove, StrRemoveAll, Ma
 from yeast.transformers import DateYear, DateMonth, DateQuarter, DateWeek, DateDay, DateDayOfWeek
 from yeast.transformers import DateHour, DateMinute, DateSecond, DateDayOfYear
 from yeast.transformers import Round, Ceil, Floor
+from yeast.transformers import Lag, Lead, CumSum, CumCount, RollingMean, RollingMax, ExpandingMin
+from yeast.transformers import RollingSum, RollingMin
+from yeast.errors import YeastTransformerError
 
 from data_samples import startrek_data as data
 from data_samples import startrek_characters as chars_data
@@ -256,3 +260,83 @@ def test_numerical_floor(data):
     assert ratings[3] == 6
     assert ratings[4] == 8
     assert ratings[5] == 9
+
+
+def test_window_lag_and_lead_on_dataframes(data):
+    lags = Lag('rating').resolve(data).tolist()
+    leads = Lead('rating', n=2).resolve(data).tolist()
+
+    assert np.isnan(lags[0])
+    assert lags[1:] == [9.3, 9.9, 7.4, 6.8, 8.9]
+    assert leads[:4] == [7.4, 6.8, 8.9, 9.0]
+    assert np.isnan(leads[4]) and np.isnan(leads[5])
+
+
+def test_window_lag_and_lead_never_cross_the_groups(data):
+    """
+    Seasons 7: TNG (1987, 9.9), Deep Space Nine (1993, 8.9) and Voyager (1995, 7.4)
+    """
+    gdf = data.groupby('seasons')
+    lags = Lag('rating', order_by='year').resolve(gdf)
+    leads = Lead('rating', order_by='year').resolve(gdf)
+
+    assert lags.index.equals(data.index)
+    assert lags.fillna(0).tolist() == [0, 0, 8.9, 0, 9.9, 0]
+    assert leads.fillna(0).tolist() == [0, 8.9, 0, 0, 7.4, 0]
+
+
+def test_window_cumulative_sum_and_count(data):
+    gdf = data.groupby('seasons')
+    sums = CumSum('rating', order_by='year').resolve(gdf).round(1).tolist()
+    counts = CumCount('rating', order_by='year').resolve(gdf).tolist()
+
+    assert sums == [9.3, 9.9, 26.2, 6.8, 18.8, 9.0]
+    assert counts == [1, 1, 3, 1, 2, 1]
+
+    with pytest.raises(YeastTransformerError):
+        CumSum('title').resolve(data)
+
+
+def test_window_rolling_and_expanding(data):
+    gdf = data.groupby('seasons')
+    means = RollingMean('rating', window=2, order_by='year').resolve(gdf).round(2)
+    maxs = RollingMax('rating', window=2, min_periods=1).resolve(data).tolist()
+    mins = ExpandingMin('rating', order_by='year').resolve(gdf).tolist()
+
+    assert means.fillna(0).tolist() == [0, 0, 8.15, 0, 9.4, 0]
+    assert maxs == [9.3, 9.9, 9.9, 7.4, 8.9, 9.0]
+    assert mins == [9.3, 9.9, 7.4, 6.8, 8.9, 9.0]
+
+
+def test_window_rolling_sums_restart_on_each_group():
+    """
+    The large values of a group must not absorb the small values of the following groups
+    """
+    df = pd.DataFrame({'g': ['a', 'b', 'b', 'b'], 'x': [1e16, 1, 1, 1]})
+    sums = RollingSum('x', window=2, min_periods=1).resolve(df.groupby('g'))
+    means = RollingMean('x', window=2, min_periods=1).resolve(df.groupby('g'))
+    expected = df.groupby('g')['x'].rolling(2, min_periods=1).sum().reset_index(drop=True)
+
+    assert sums.tolist() == expected.tolist() == [1e16, 1, 2, 2]
+    assert means.tolist() == [1e16, 1, 1, 1]
+
+
+def test_window_rolling_sums_do_not_keep_the_values_that_left_the_window():
+    """
+    A large value must not absorb the small values of the windows after it
+    """
+    df = pd.DataFrame({'x': [1e16, 1, 1, 1, 1, -3e15, 0.5, 0.25]})
+    sums = RollingSum('x', window=2, min_periods=1).resolve(df)
+    means = RollingMean('x', window=3, min_periods=1).resolve(df)
+
+    assert sums.tolist() == [1e16, 1e16, 2, 2, 2, -3e15 + 1, -3e15 + 0.5, 0.75]
+    assert means.tolist()[3:5] == [1, 1]
+    assert means.tolist()[-1] == pytest.approx(-1e15 + 0.25)
+
+
+def test_window_rolling_on_empty_data():
+    df = pd.DataFrame({'g': pd.Series([], dtype='object'), 'x': pd.Series([], dtype='float64')})
+
+    for transformer in [RollingMin('x'), RollingMax('x'), RollingSum('x'), ExpandingMin('x')]:
+        assert transformer.resolve(df).tolist() == []
+        assert transformer.resolve(df.groupby('g')).tolist() == []
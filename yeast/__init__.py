@@ -2,3 +2,5 @@
 from yeast.recipe import (Recipe)  # NoQA
 # Cookbook
 from yeast.cookbook import Cookbook  # NoQA
+# Fingerprints
+from yeast.fingerprints import fingerprint  # NoQA
@@ -1,11 +1,19 @@
+import numpy as np
+import pandas as pd
 from pandas import NamedAgg
 from pandas import Series
 
 
 class Aggregation():
     """
-    Base abstract interface to define group aggregations
+    Base abstract interface to define group aggregations.
+
+    The `kernel` is the name of the method of `GroupAggregator` that calculates the aggregation
+    for all the groups at once. Aggregations without kernel are calculated by Pandas using the
+    `NamedAgg` returned by `resolve()`.
     """
+    kernel = None
+
     def resolve(self, gdf):
         pass
 
@@ -22,6 +30,8 @@ class AggMean(AggNumeric):
     """
     Calculate the mean of the grouped numeric column
     """
+    kernel = 'mean'
+
     def __init__(self, column):
         self.column = column
 
@@ -33,6 +43,8 @@ class AggMedian(AggNumeric):
     """
     Calculate the median of the grouped numeric column
     """
+    kernel = 'median'
+
     def __init__(self, column):
         self.column = column
 
@@ -44,6 +56,8 @@ class AggSum(AggNumeric):
     """
     Calculate the sum of the grouped numeric column
     """
+    kernel = 'sum'
+
     def __init__(self, column):
         self.column = column
 
@@ -55,6 +69,8 @@ class AggCount(AggNumeric):
     """
     Calculate the count/size of the grouped numeric column
     """
+    kernel = 'size'
+
     def __init__(self, column):
         self.column = column
 
@@ -66,6 +82,8 @@ class AggCountDistinct(AggNumeric):
     """
     Calculate the unique count of the grouped numeric column
     """
+    kernel = 'count_distinct'
+
     def __init__(self, column):
         self.column = column
 
@@ -77,6 +95,8 @@ class AggMax(AggNumeric):
     """
     Calculate the max of the grouped numeric column
     """
+    kernel = 'max'
+
     def __init__(self, column):
         self.column = column
 
@@ -88,8 +108,171 @@ class AggMin(AggNumeric):
     """
     Calculate the min of the grouped numeric column
     """
+    kernel = 'min'
+
     def __init__(self, column):
         self.column = column
 
     def resolve(self, gdf):
         return NamedAgg(column=self.column, aggfunc='min')
+
+
+class GroupAggregator():
+    """
+    Vectorized engine to calculate the aggregations of all the groups at once.
+
+    The group keys are factorized once by Pandas (`ngroup()`) and the rows are sorted by group
+    and value once per column. Sums, means and counts are calculated with `bincount` and the rest
+    of the aggregations (min, max, median and count distinct) are read from the sorted values at the
+    position of each group, so there is not a Python loop over the groups.
+
+    Parameters:
+
+    - `gdf`: DataFrameGroupBy to aggregate
+
+    Usage:
+
+    ```python
+    aggregator = GroupAggregator(df.groupby('client_id'))
+    aggregator.aggregate(AggMedian('sales'))  # array with the median of each group
+    aggregator.index                          # group keys of each value
+    ```
+    """
+    def __init__(self, gdf):
+        # Rows with NA keys are numbered -1 (or NaN on newer versions of Pandas)
+        codes = gdf.ngroup().fillna(-1).to_numpy(dtype='int64')
+        self.ngroups = gdf.ngroups
+        self.index = gdf.grouper.result_index
+        self.valid_keys = codes >= 0  # Rows with NA keys are not part of any group
+        self.codes = codes[self.valid_keys]
+        self.frame = gdf.obj
+        self.sizes = np.bincount(self.codes, minlength=self.ngroups)
+        self.starts = np.r_[0, np.cumsum(self.sizes)[:-1]]
+        self.sorted_columns = {}
+
+    def aggregate(self, aggregation):
+        """
+        Calculate the aggregation of each group or None if it is not supported by the engine
+        """
+        column = getattr(aggregation, 'column', None)
+        if aggregation.kernel is None or column not in self.frame.columns:
+            return None
+        return getattr(self, aggregation.kernel)(column)
+
+    def values(self, column):
+        return self.frame[column].to_numpy()[self.valid_keys]
+
+    @staticmethod
+    def output_dtype(aggregation, dtype):
+        """
+        Type of the values calculated by the engine for the aggregation of a column with the
+        `dtype` or None if it is unknown, for example if the aggregation is calculated by Pandas
+        """
+        if aggregation.kernel in ['size', 'count_distinct']:
+            return np.dtype('int64')
+        if aggregation.kernel in ['min', 'max']:
+            # The values are taken from the factorized uniques
+            if isinstance(dtype, pd.CategoricalDtype):
+                dtype = dtype.categories.dtype
+            elif isinstance(dtype, pd.StringDtype):
+                dtype = np.dtype('object')
+        if aggregation.kernel is None or not isinstance(dtype, np.dtype):
+            return None
+        if aggregation.kernel in ['min', 'max']:
+            if dtype.kind in 'mM':
+                return dtype
+            kinds = {'i': 'int64', 'u': 'uint64', 'f': 'float64', 'b': 'bool', 'O': 'object'}
+            return np.dtype(kinds[dtype.kind]) if dtype.kind in kinds else None
+        if dtype.kind not in 'biuf':
+            return None
+        if aggregation.kernel == 'sum' and dtype.kind in 'biu':
+            return np.dtype('uint64' if dtype.kind == 'u' else 'int64')
+        return np.dtype('float64')
+
+    def numeric(self, column):
+        """
+        Values of the column as floats or None if the column is not numeric
+        """
+        values = self.values(column)
+        if values.dtype.kind not in 'biuf':
+            return None
+        return values.astype('float64')
+
+    def sorted_values(self, column):
+        """
+        Sort the rows by group and value (NA values last). Return the value codes sorted, the
+        unique values and the number of non NA values of each group.
+        """
+        if column not in self.sorted_columns:
+            values = self.values(column)
+            codes, uniques = pd.factorize(values, sort=True)
+            # The booleans are kept as an array: pd.Index would turn them into objects
+            uniques = uniques.astype('bool') if values.dtype.kind == 'b' else pd.Index(uniques)
+            valid = codes >= 0
+            order = np.lexsort((np.where(valid, codes, uniques.size), self.codes))
+            counts = np.bincount(self.codes[valid], minlength=self.ngroups)
+            self.sorted_columns[column] = (codes[order], uniques, counts)
+        return self.sorted_columns[column]
+
+    def take(self, column, offsets):
+        """
+        Unique values at the `offsets` from the start of each group, NA for empty groups
+        """
+        codes, uniques, counts = self.sorted_values(column)
+        empty = counts == 0
+        positions = np.where(empty, 0, self.starts + offsets)
+        if uniques.size == 0:
+            return np.full(self.ngroups, np.nan)
+        values = Series(uniques.take(codes[positions]))
+        if empty.any():
+            # Only the empty groups change the type of the values
+            values[empty] = np.nan
+        return values.array
+
+    def size(self, column):
+        return self.sizes
+
+    def sum(self, column):
+        values = self.numeric(column)
+        if values is None:
+            return None
+        values = np.where(np.isnan(values), 0, values)
+        kind = self.frame[column].dtype.kind
+        if kind in 'biu':
+            # Integers and booleans are added exactly using the group limits of the sorted values
+            order = np.argsort(self.codes, kind='stable')
+            sums = np.zeros(order.shape[0] + 1, dtype='uint64' if kind == 'u' else 'int64')
+            np.cumsum(self.values(column)[order], out=sums[1:])
+            return sums[self.starts + self.sizes] - sums[self.starts]
+        return np.bincount(self.codes, weights=values, minlength=self.ngroups)
+
+    def mean(self, column):
+        values = self.numeric(column)
+        if values is None:
+            return None
+        valid = ~np.isnan(values)
+        sums = np.bincount(self.codes[valid], weights=values[valid], minlength=self.ngroups)
+        counts = np.bincount(self.codes[valid], minlength=self.ngroups)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return sums / counts
+
+    def min(self, column):
+        return self.take(column, 0)
+
+    def max(self, column):
+        codes, uniques, counts = self.sorted_values(column)
+        return self.take(column, counts - 1)
+
+    def median(self, column):
+        if self.numeric(column) is None:
+            return None
+        codes, uniques, counts = self.sorted_values(column)
+        low = np.asarray(self.take(column, (counts - 1) // 2), dtype='float64')
+        high = np.asarray(self.take(column, counts // 2), dtype='float64')
+        return (low + high) / 2
+
+    def count_distinct(self, column):
+        codes, uniques, counts = self.sorted_values(column)
+        groups = np.repeat(np.arange(self.ngroups), self.sizes)
+        new = np.r_[True, (codes[1:] != codes[:-1]) | (groups[1:] != groups[:-1])]
+        return np.bincount(groups[new & (codes >= 0)], minlength=self.ngroups)
@@ -0,0 +1,181 @@
+from pandas.core.frame import DataFrame
+from pandas.core.groupby.generic import DataFrameGroupBy
+from yeast.schema import to_schema
+from yeast.errors import YeastRecipeError
+
+
+class Backend():
+    """
+    Yeast Backend Definition:
+    The backend is the engine used by a Recipe to bake the data. The default backend is pandas and
+    all the steps support it. Other backends (like Polars) keep the data on their native format
+    and bake the steps that implement `do_bake_<backend name>(df, schema)` natively. The rest of
+    the steps fall back to pandas: the data is converted to pandas only when one of them is found
+    and back to the native format on the next native step.
+
+    All backends must inherit from this class and redefine the conversions and the column
+    selection.
+
+    Usage:
+
+    ```python
+    recipe = Recipe([...], backend='polars')
+    baked_df = recipe.bake(polars_df)  # Polars DataFrame
+    ```
+    """
+    name = 'pandas'
+
+    def is_frame(self, data):
+        """
+        True if the data is in the native format of the backend
+        """
+        return isinstance(data, (DataFrame, DataFrameGroupBy))
+
+    def supports(self, step):
+        """
+        True if the step could be baked natively by the backend
+        """
+        return step.supports_backend(self.name)
+
+    def from_pandas(self, data):
+        """
+        Convert pandas data into the native format
+        """
+        return data
+
+    def to_pandas(self, data):
+        """
+        Convert native data into a pandas DataFrame
+        """
+        return data
+
+    def convert(self, data, like):
+        """
+        Return the data in the same format as `like`: native or pandas
+        """
+        return self.from_pandas(data) if self.is_frame(like) else self.to_pandas(data)
+
+    def schema(self, data):
+        """
+        Return the schema (a pandas DataFrame without rows) of the data, used to resolve the
+        selectors and validate the steps
+        """
+        data = self.to_pandas(data)
+        return to_schema(getattr(data, 'obj', data))
+
+    def select_columns(self, data, columns):
+        """
+        Return the data keeping only the columns
+        """
+        return data.reindex(columns=columns)
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}()'
+
+
+class PandasBackend(Backend):
+    """
+    Bake all the steps with pandas (default backend)
+    """
+    pass
+
+
+class PolarsBackend(Backend):
+    """
+    Bake the steps with Polars, a multi-threaded columnar engine. Requires `polars` to be installed.
+
+    Steps baked natively: `SelectColumnsStep`, `DropColumnsStep`, `RenameColumnsStep`,
+    `SortRowsStep`, `DropDuplicateRowsStep`, `ConstantImputeStep`, `MeanImputeStep`,
+    `MedianImputeStep` and `FilterRowsStep` (expressions without functions or methods). The
+    preparation of the steps is always executed with pandas.
+    """
+    name = 'polars'
+
+    def __init__(self):
+        try:
+            import polars
+        except ImportError as ex:
+            raise YeastRecipeError('The polars backend requires polars: pip install polars') from ex
+        self.pl = polars
+
+    def is_frame(self, data):
+        return isinstance(data, self.pl.DataFrame)
+
+    def from_pandas(self, data):
+        if self.is_frame(data):
+            return data
+        return self.pl.from_pandas(getattr(data, 'obj', data))
+
+    def to_pandas(self, data):
+        return data.to_pandas() if self.is_frame(data) else data
+
+    def schema(self, data):
+        if isinstance(data, self.pl.LazyFrame):
+            return data.limit(0).collect().to_pandas()
+        if self.is_frame(data):
+            return data.head(0).to_pandas()
+        return super().schema(data)
+
+    def to_lazy(self, data):
+        """
+        Return the data as a LazyFrame
+        """
+        if isinstance(data, self.pl.LazyFrame):
+            return data
+        return self.from_pandas(data).lazy()
+
+    def map_pandas(self, query, function, schema):
+        """
+        Add a function that receives and returns pandas DataFrames to the lazy query. The output
+        `schema` is a pandas DataFrame without rows. The optimizations are not pushed across it.
+        """
+        return query.map_batches(
+            lambda batch: self.from_pandas(function(batch.to_pandas())),
+            predicate_pushdown=False,
+            projection_pushdown=False,
+            slice_pushdown=False,
+            schema=self.from_pandas(schema).schema
+        )
+
+    def select_columns(self, data, columns):
+        if self.is_frame(data):
+            return data.select(columns)
+        return super().select_columns(data, columns)
+
+
+BACKENDS = {
+    'pandas': PandasBackend,
+    'polars': PolarsBackend
+}
+
+
+def get_backend(backend):
+    """
+    Return the backend instance from its name or the backend itself
+
+    Raises:
+
+    - `YeastRecipeError`: if the backend is unknown
+    """
+    if isinstance(backend, Backend):
+        return backend
+    if backend not in BACKENDS:
+        raise YeastRecipeError(
+            f'Unknown backend "{backend}". Available backends: {list(BACKENDS.keys())}'
+        )
+    return BACKENDS[backend]()
+
+
+def fill_na_polars(df, values):
+    """
+    Replace the nulls (and NaNs on float columns, like pandas) of a Polars DataFrame using the
+    `values` dictionary as `{'column_name': value, ...}`
+    """
+    import polars as pl
+    expressions = []
+    for column, value in values.items():
+        expression = pl.col(column)
+        if df.schema[column] in (pl.Float32, pl.Float64):
+            expression = expression.fill_nan(value)
+        expressions.append(expression.fill_null(value))
+    return df.with_columns(expressions)
@@ -0,0 +1,129 @@
+import os
+import glob
+from pandas.core.frame import DataFrame
+from yeast import serialization
+from yeast.fingerprints import fingerprint, digest
+from yeast.errors import YeastRecipeError
+
+
+class StepCache():
+    """
+    Disk cache of the output of the steps, used by `Recipe(cache=...)` to resume the bake from the
+    last step whose output was already calculated.
+
+    The output of each step is stored by a key that chains the fingerprint of the input data with
+    the fingerprints of the steps executed so far (their parameters and prepared state). Editing
+    a step only changes its key and the keys of the following steps, so baking the recipe again
+    resumes from the output of the previous step. The least recently used outputs are removed when
+    the cache grows over `max_size`.
+
+    Parameters:
+
+    - `path`: directory where the outputs are stored. It's created if it does not exist.
+    - `max_size`: maximum size of the cache in bytes. Default: `2 ** 30` (1 GB)
+
+    Usage:
+
+    ```python
+    cache = StepCache('.yeast_cache')
+    baked_df = Recipe([...], cache=cache).bake(df)
+    # Edit one step and bake it again, only the steps from the edited one are baked:
+    baked_df = Recipe([...], cache=cache).bake(df)
+    ```
+
+    Notes:
+
+    - Only the outputs that are pandas DataFrames are cached (not the groups).
+    - Steps that could not be pickled (for example they contain lambda functions) and all the
+      steps after them are always baked.
+    """
+    extension = '.yeast'
+
+    def __init__(self, path, max_size=2 ** 30):
+        if not isinstance(max_size, int) or max_size < 0:
+            raise YeastRecipeError('The max_size of the cache must be a positive integer')
+        self.path = path
+        self.max_size = max_size
+        os.makedirs(path, exist_ok=True)
+
+    def keys(self, df, steps):
+        """
+        Return the key of the output of each step baked on the data or None if the step could not
+        be fingerprinted
+        """
+        try:
+            key = fingerprint(df)
+        except YeastRecipeError:
+            key = None
+        keys = []
+        for step in steps:
+            step_key = None if key is None else fingerprint(step)
+            key = None if step_key is None else digest(f'{key}:{step_key}'.encode())
+            keys.append(key)
+        return keys
+
+    def get(self, key):
+        """
+        Return the cached output or None if it was not found
+        """
+        filename = self.filename(key)
+        try:
+            df = serialization.load(filename, mmap_mode=False)
+            os.utime(filename)  # The modification time is used as the last access time
+        except (OSError, YeastRecipeError, serialization.pickle.UnpicklingError):
+            return None
+        return df
+
+    def put(self, key, df):
+        """
+        Store the output if it's a DataFrame and remove the least recently used ones if the cache
+        is too large
+        """
+        if key is None or not isinstance(df, DataFrame):
+            return self
+        filename = self.filename(key)
+        temporary = f'{filename}.{os.getpid()}.tmp'
+        try:
+            serialization.save(df, temporary)
+            os.replace(temporary, filename)
+        except (OSError, YeastRecipeError):
+            if os.path.exists(temporary):
+                os.remove(temporary)
+            return self
+        return self.evict()
+
+    def evict(self):
+        """
+        Remove the least recently used outputs until the cache is smaller than `max_size`
+        """
+        files = []
+        for filename in glob.glob(os.path.join(self.path, f'*{self.extension}')):
+            try:
+                stat = os.stat(filename)
+            except OSError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, filename))
+        size = sum(f[1] for f in files)
+        for _, file_size, filename in sorted(files):
+            if size <= self.max_size:
+                break
+            try:
+                os.remove(filename)
+            except OSError:
+                continue
+            size -= file_size
+        return self
+
+    def clear(self):
+        """
+        Remove all the cached outputs
+        """
+        for filename in glob.glob(os.path.join(self.path, f'*{self.extension}')):
+            os.remove(filename)
+        return self
+
+    def filename(self, key):
+        return os.path.join(self.path, f'{key}{self.extension}')
+
+    def __contains__(self, key):
+        return key is not None and os.path.exists(self.filename(key))
@@ -0,0 +1,111 @@
+import os
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+from pandas import Series, RangeIndex
+from pandas.core.frame import DataFrame
+from yeast.serialization import pickle, PROTOCOL
+from yeast.errors import YeastRecipeError
+
+# Hash the columns on threads (hashlib releases the GIL) if the data has more rows
+PARALLEL_ROWS = 100000
+
+
+def fingerprint(data, sample=None, by_column=False):
+    """
+    Return a hash (hexadecimal string) that changes when the data changes. Useful to detect if the
+    input of a recipe changed or as the key of a cache.
+
+    - DataFrames and Series: the names, types and values of the columns and the index. The memory
+      of numeric, boolean and datetime columns is hashed directly (BLAKE2) without copying it,
+      other types are hashed with `pd.util.hash_pandas_object`. The columns are hashed in parallel.
+    - Steps: the class, parameters and prepared state (the pickled step). `None` if the step could
+      not be pickled, for example if it contains lambda functions.
+    - Recipes: the fingerprints of all the steps or `None` if any step could not be fingerprinted.
+
+    Parameters:
+
+    - `data`: DataFrame, Series, Step or Recipe
+    - `sample`: number of rows to hash. Default: `None` (all the rows). The rows are evenly spaced
+                on the data, so changes on the rows that are not sampled are not detected, but the
+                fingerprint of large DataFrames is calculated in milliseconds. The number of rows
+                is always included.
+    - `by_column`: if `True` return a dictionary with the fingerprint of each column of the
+                   DataFrame as `{'column_name': 'fingerprint', ...}`, useful to know which
+                   columns changed
+
+    Usage:
+
+    ```python
+    from yeast import fingerprint
+
+    fingerprint(df)
+    # '6d1f3c0e5ab7a3b0c2f6e08b2f5a0c9e'
+
+    # Fingerprint of 100k rows of a large DataFrame:
+    fingerprint(df, sample=100000)
+
+    # Columns that changed:
+    before, after = fingerprint(df, by_column=True), fingerprint(new_df, by_column=True)
+    changed = [c for c in after if before.get(c) != after[c]]
+    ```
+
+    Raises:
+
+    - `YeastRecipeError`: if the data could not be fingerprinted
+    """
+    from yeast.step import Step
+    from yeast.recipe import Recipe
+    if isinstance(data, Step):
+        try:
+            return digest(pickle.dumps(data, protocol=PROTOCOL))
+        except (pickle.PicklingError, AttributeError, TypeError, ValueError):
+            return None
+    if isinstance(data, Recipe):
+        steps = [fingerprint(step) for step in data.steps]
+        return None if None in steps else digest(':'.join(steps).encode())
+    if isinstance(data, Series):
+        data = data.to_frame()
+    if not isinstance(data, DataFrame):
+        raise YeastRecipeError('Only DataFrames, Series, Steps and Recipes could be fingerprinted')
+
+    rows = data.shape[0]
+    if sample is not None and rows > sample:
+        data = data.iloc[np.linspace(0, rows - 1, sample).round().astype('int64')]
+    columns = [data.iloc[:, i] for i in range(data.shape[1])]
+    if rows > PARALLEL_ROWS and len(columns) > 1:
+        with ThreadPoolExecutor(max_workers=min(len(columns), os.cpu_count() or 1)) as executor:
+            hashes = list(executor.map(fingerprint_values, columns))
+    else:
+        hashes = [fingerprint_values(column) for column in columns]
+    if by_column:
+        return {column: value for column, value in zip(data.columns, hashes)}
+    header = repr((rows, sample, [(c, str(t)) for c, t in data.dtypes.items()]))
+    return digest(':'.join([header, fingerprint_values(data.index)] + hashes).encode())
+
+
+def fingerprint_values(values):
+    """
+    Return the fingerprint of the type and values of a Series or Index
+    """
+    if isinstance(values, RangeIndex):
+        return digest(repr(values).encode())
+    if isinstance(values.dtype, np.dtype) and values.dtype.kind in 'biufcmM':
+        data = np.ascontiguousarray(values.to_numpy()).view('uint8')
+    else:
+        try:
+            data = pd.util.hash_pandas_object(values, index=False).to_numpy()
+        except TypeError:
+            # Unhashable values like lists
+            data = pickle.dumps(values.to_numpy(dtype='object'), protocol=PROTOCOL)
+    hasher = hashlib.blake2b(str(values.dtype).encode(), digest_size=16)
+    hasher.update(data)
+    return hasher.hexdigest()
+
+
+def digest(data):
+    """
+    BLAKE2 hash of the bytes as an hexadecimal string
+    """
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
@@ -0,0 +1,117 @@
+import numpy as np
+import pandas as pd
+from pandas.core.frame import DataFrame
+from yeast.errors import YeastBakeError
+
+
+class InferenceFunction():
+    """
+    Recipe compiled by `Recipe.compile_for_inference()` to bake a few rows with low latency.
+
+    The data is baked as a dictionary of NumPy arrays: the steps that implement
+    `compile_inference()` are executed directly on the arrays with their selectors resolved and
+    their prepared state (impute values, ordinal mappings, etc.) ready to use, the rest of the steps
+    are baked with pandas. If a compiled step fails on some values, it's baked with pandas too.
+
+    The data could be:
+
+    - A dictionary with the values of one row: `{'column_name': value, ...}`. The result is a
+      dictionary with the values of the baked row or `None` if the row was filtered out.
+    - A dictionary of columns: `{'column_name': [value, ...], ...}`. The result is a dictionary of
+      NumPy arrays.
+    - A NumPy record (structured) array. The result is a NumPy record array.
+
+    Only the columns of the schema used to compile the recipe are read. Numeric, boolean and date
+    columns are NumPy arrays of the type of the schema, other columns (strings, categories, nullable
+    types, etc.) are arrays of objects with `None` as missing value.
+
+    Raises:
+
+    - `YeastBakeError`: if the data is not valid or there was an error while baking
+    """
+    def __init__(self, dtypes, functions):
+        self.dtypes = dtypes
+        self.functions = functions
+
+    def __call__(self, data):
+        if isinstance(data, np.ndarray) and data.dtype.names is not None:
+            baked = self.bake({name: data[name] for name in data.dtype.names})
+            return np.rec.fromarrays(list(baked.values()), names=[str(c) for c in baked])
+        if not isinstance(data, dict):
+            raise YeastBakeError('Data must be a dictionary or a NumPy record array')
+        if all(np.ndim(value) == 0 for value in data.values()):
+            baked = self.bake({column: [value] for column, value in data.items()})
+            if any(len(values) == 0 for values in baked.values()):
+                return None
+            return {column: values[0] for column, values in baked.items()}
+        return self.bake(data)
+
+    def bake(self, data):
+        """
+        Bake a dictionary of columns
+        """
+        arrays = {}
+        for column, dtype in self.dtypes.items():
+            if column not in data:
+                raise YeastBakeError(f'The column "{column}" is missing')
+            try:
+                arrays[column] = np.asarray(data[column], dtype=dtype)
+            except (TypeError, ValueError) as ex:
+                raise YeastBakeError(f'The values of the column "{column}" are not valid') from ex
+        for function, fallback in self.functions:
+            try:
+                arrays = function(arrays)
+            except (KeyError, TypeError, ValueError):
+                if fallback is None:
+                    raise
+                arrays = fallback(arrays)
+        return arrays
+
+
+def inference_dtype(dtype):
+    """
+    NumPy type of the arrays of a column with the pandas `dtype`
+    """
+    return dtype if isinstance(dtype, np.dtype) else np.dtype('object')
+
+
+def to_arrays(df):
+    """
+    Convert a DataFrame into a dictionary of NumPy arrays
+    """
+    return {
+        column: values.to_numpy() if isinstance(values.dtype, np.dtype)
+        else values.to_numpy(dtype='object', na_value=None)
+        for column, values in df.items()
+    }
+
+
+def pandas_function(recipe, steps, schema):
+    """
+    Return a function that bakes the steps with pandas on a dictionary of arrays. The columns
+    are casted to the types of the `schema`.
+    """
+    dtypes = dict(getattr(schema, 'obj', schema).dtypes)
+
+    def bake(arrays):
+        df = DataFrame(arrays)
+        casts = {c: t for c, t in dtypes.items() if c in df.columns and str(df[c].dtype) != str(t)}
+        df = df.astype(casts) if casts else df
+        baked = recipe.bake_steps(steps, df, None)
+        return to_arrays(getattr(baked, 'obj', baked))
+    return bake
+
+
+def fill_na_arrays(arrays, values):
+    """
+    Replace the missing values of the arrays using the `values` dictionary as
+    `{'column_name': value, ...}`. The arrays are not modified.
+    """
+    arrays = dict(arrays)
+    for column, value in values.items():
+        missing = pd.isna(arrays[column])
+        if missing.any():
+            filled = arrays[column].copy()
+            filled[missing] = value
+            arrays[column] = filled
+    return arrays
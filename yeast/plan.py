@@ -0,0 +1,82 @@
+class Plan():
+    """
+    Yeast Plan Definition:
+    The plan is the ordered list of steps that a Recipe executes for a given role. The steps are
+    rewritten before the execution without looking at the data:
+
+    - Steps that do nothing are removed, like `RenameColumnsStep({})`.
+    - Consecutive steps that could be executed as one are merged, like two `RenameColumnsStep`.
+    - Steps that reduce the data (`FilterRowsStep`, `SelectColumnsStep` and `DropColumnsStep`) are
+      executed as early as it is safe, for example before a `MutateStep` on unrelated columns.
+
+    The rewrites rely on the planning methods of each step (`reads()`, `writes()`, `merge()`,
+    `commutes_with()`, etc.), when a step does not know which columns it uses it is never crossed.
+
+    Usage:
+
+    ```python
+    plan = Plan(recipe.steps, role='train').optimize()
+    print(plan)
+    ```
+    """
+    def __init__(self, steps, role='all'):
+        self.role = role
+        self.steps = [s for s in steps if role == 'all' or s.role == 'all' or role == s.role]
+        self.rewrites = []
+
+    def optimize(self):
+        """
+        Apply all the rewrites and return the optimized plan
+        """
+        self.remove_noops()
+        self.merge_steps()
+        self.push_down()
+        self.merge_steps()
+        return self
+
+    def remove_noops(self):
+        """
+        Remove all the steps that don't change the data
+        """
+        for step in [s for s in self.steps if s.is_noop()]:
+            self.rewrites.append(f'Removed {step}: it does nothing')
+        self.steps = [s for s in self.steps if not s.is_noop()]
+        return self
+
+    def merge_steps(self):
+        """
+        Merge consecutive steps that could be executed as only one step
+        """
+        steps = self.steps[:1]
+        for step in self.steps[1:]:
+            merged = steps[-1].merge(step)
+            if merged is None:
+                steps.append(step)
+            else:
+                self.rewrites.append(f'Merged {steps[-1]} and {step}')
+                steps[-1] = merged
+        self.steps = steps
+        return self
+
+    def push_down(self):
+        """
+        Move the steps that reduce the data as early as possible
+        """
+        steps = []
+        for step in self.steps:
+            position = len(steps)
+            while step.pushdown and position > 0 and step.commutes_with(steps[position - 1]):
+                position -= 1
+            if position < len(steps):
+                self.rewrites.append(f'Moved {step} before {steps[position]}')
+            steps.insert(position, step)
+        self.steps = steps
+        return self
+
+    def __str__(self):
+        lines = [f'Plan for role "{self.role}":']
+        lines += [f'  {i}. {step}' for i, step in enumerate(self.steps, 1)]
+        if self.rewrites:
+            lines.append('Rewrites:')
+            lines += [f'  - {rewrite}' for rewrite in self.rewrites]
+        return '\n'.join(lines)
@@ -1,5 +1,15 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
 from pandas.core.frame import DataFrame
 from yeast.step import Step
+from yeast import serialization
+from yeast.plan import Plan
+from yeast.cache import StepCache
+from yeast.backends import get_backend
+from yeast.schema import to_schema
+from yeast.inference import InferenceFunction, inference_dtype, pandas_function
 from yeast.errors import YeastRecipeError, YeastBakeError, YeastValidationError
 from yeast.errors import YeastPreparationError
 from yeast.errors import YeastTransformerError
@@ -19,30 +29,77 @@ class Recipe():
     - `YeastBakeError`: if there was an error while baking
     - `YeastTransformerError`: if there was an error while transforming
     - `YeastValidationError`: if there was an error during step validation
+
+    Parameters:
+
+    - `steps`: list of steps to execute
+    - `optimize`: if `True` the steps are rewritten by the planner before the execution, for
+                  example filters are executed as early as possible (see `explain()`), and the
+                  columns that are not required by the recipe are removed before the first step
+                  (see `required_columns()`).
+    - `backend`: name of the engine used to bake the data: `pandas` (default) or `polars`, or a
+                 `yeast.backends.Backend` instance. The steps without a native implementation on
+                 the backend are baked with pandas, the preparation is always executed with pandas.
+                 The baked data is returned in the same format as the input data.
+    - `cache`: `yeast.cache.StepCache` or directory path to store the output of each step on
+               disk. Baking the recipe again on the same data resumes from the last step whose
+               output is cached, for example after editing a step. Default: `None` (no cache)
+    - `validate`: when the steps validate the data while baking: `once` (default) validates each
+                  step again only if the schema (column names and types) of its input changed
+                  since the last validation, for example the prepared steps are not validated
+                  again when baking data with the same schema as the preparation data. `always`
+                  validates on every bake and `never` only validates the steps that were never
+                  validated.
+
+    Usage:
+
+    ```python
+    recipe = Recipe([...], backend='polars')
+    recipe.prepare(train_df)
+    baked_df = recipe.bake(polars_df)
+    ```
     """
-    def __init__(self, steps):
+    def __init__(self, steps, optimize=False, backend='pandas', cache=None, validate='once'):
         steps = steps if isinstance(steps, list) else [steps]
         if not all([isinstance(step, Step) for step in steps]):
             raise YeastRecipeError("All steps must inherit from the class yeast.Step")
+        if validate not in Step.validation_policies:
+            raise YeastRecipeError(
+                f'Validation policy "{validate}" not between: {Step.validation_policies}'
+            )
         self.steps = steps
+        self.optimize = optimize
+        self.backend = get_backend(backend)
+        self.cache = StepCache(cache) if isinstance(cache, (str, os.PathLike)) else cache
+        self.validate = validate
 
-    def prepare(self, df):
+    def prepare(self, df, copy=True):
         """
         Prepare all the steps including validations (if required).
         For each step in the recipe:
             If the recipe needs preparation:
                 - prepare the step
                 - bake the step
+
+        Parameters:
+
+        - `df`: DataFrame to prepare the recipe with
+        - `copy`: if `True` (default) the data is copied before any step is executed. If `False`
+                  the data is only copied when a step is going to modify it in place.
         """
-        if not isinstance(df, (DataFrame, Recipe)):
+        if not isinstance(df, (DataFrame, Recipe)) and not self.backend.is_frame(df):
             raise YeastRecipeError('Data must be a Pandas DataFrame or a Recipe')
 
         if self.needs_preparation():
-            prep_df = df.copy()
-            for step in self.steps:
+            df = self.backend.to_pandas(df)
+            prep_df = self.prune(df) if self.optimize else df
+            prep_df = df.copy() if copy and prep_df is df else prep_df
+            for step in self.plan().steps if self.optimize else self.steps:
                 try:
+                    # The step bakes the same DataFrame it was prepared with
+                    prep_df = self.copy_on_write(step, prep_df, df)
                     step.prepare(prep_df)
-                    prep_df = step.bake(prep_df)
+                    prep_df = step.bake(prep_df, self.validate)
                 except YeastRecipeError as ex:
                     raise ex
                 except YeastValidationError as ex:
@@ -55,11 +112,97 @@ class Recipe():
                     raise YeastPreparationError(f'There was an error while preparing: {ex}') from ex
         return self
 
-    def bake(self, df, role='all'):
+    def prepare_partial(self, df, copy=True):
         """
-        Bake the recipe returning the transformed data frame.
+        Prepare the recipe one chunk at a time, for datasets that don't fit in memory or to refresh
+        a prepared recipe with new data. The statistics of each chunk (means, sketches, categories,
+        etc.) are folded into the steps and the state of the steps is calculated by `finalize()`.
+
+        Each chunk is baked until the first step that was never prepared, because the following
+        steps need its final state. Recipes with several of them need one pass over the chunks for
+        each one: repeat the passes until `is_prepared()`.
+
+        Parameters:
 
+        - `df`: DataFrame chunk to prepare the recipe with
+        - `copy`: if `True` (default) the chunk is copied before any step is executed. If `False`
+                  the chunk is only copied when a step is going to modify it in place.
 
+        Usage:
+
+        ```python
+        while not recipe.is_prepared():
+            for chunk in pd.read_csv('train.csv', chunksize=100000):
+                recipe.prepare_partial(chunk)
+            recipe.finalize()
+
+        # Refresh the prepared recipe with the daily delta:
+        recipe.prepare_partial(delta_df).finalize()
+        ```
+
+        Raises:
+
+        - `YeastRecipeError`: if any step that needs preparation could not be prepared by chunks
+        """
+        if not isinstance(df, DataFrame) and not self.backend.is_frame(df):
+            raise YeastRecipeError('Data must be a Pandas DataFrame')
+        df = self.backend.to_pandas(df)
+
+        steps = self.plan().steps if self.optimize else self.steps
+        for step in steps:
+            if step.needs_preparation and not step.incremental:
+                raise YeastRecipeError(
+                    f'{step.__class__.__name__} can not be prepared by chunks. '
+                    'Use prepare(...) instead.'
+                )
+
+        prep_df = self.prune(df) if self.optimize else df
+        prep_df = df.copy() if copy and prep_df is df else prep_df
+        for step in steps:
+            try:
+                step.prepare_partial(prep_df)
+                if step.needs_preparation and not step.prepared:
+                    break
+                prep_df = self.copy_on_write(step, prep_df, df)
+                prep_df = step.bake(prep_df, self.validate)
+            except YeastRecipeError as ex:
+                raise ex
+            except YeastValidationError as ex:
+                raise ex
+            except YeastBakeError as ex:
+                raise ex
+            except YeastTransformerError as ex:
+                raise ex
+            except YeastPreparationError as ex:
+                raise ex
+            except Exception as ex:
+                raise YeastPreparationError(f'There was an error while preparing: {ex}') from ex
+        return self
+
+    def finalize(self):
+        """
+        Calculate the state of the steps from all the chunks received by `prepare_partial()`:
+        the steps already prepared and the first one that was never prepared.
+        """
+        for step in self.plan().steps if self.optimize else self.steps:
+            was_prepared = step.prepared
+            try:
+                step.finalize()
+            except Exception as ex:
+                raise YeastPreparationError(f'There was an error while finalizing: {ex}') from ex
+            if step.needs_preparation and not was_prepared:
+                break
+        return self
+
+    def is_prepared(self):
+        """
+        True if all the steps that need preparation are prepared
+        """
+        return all([s.prepared for s in self.steps if s.needs_preparation])
+
+    def bake(self, df, role='all', copy=True, n_jobs=1):
+        """
+        Bake the recipe returning the transformed data frame.
 
         Parameters:
 
@@ -68,15 +211,149 @@ class Recipe():
                   execute all steps in the recipe. The role support any name that you want to use.
                   For example, if `role='train'` will execute all steps with role 'all' or 'train'
                   but all other roles will be skipped.
+        - `copy`: if `True` (default) the data is copied before any step is executed. If `False`
+                  the data is only copied when a step is going to modify it in place, so steps
+                  that select or filter never pay for a full copy of `df`.
+        - `n_jobs`: number of processes used to bake the data. Default: `1`. If greater than one,
+                    the rows are split into `n_jobs` partitions and the row-local steps at the start
+                    of the recipe (filters, casts, imputations, etc.) are baked on each partition in
+                    parallel. The partitions are concatenated and the rest of the steps are baked
+                    on one process. `-1` means using all the CPUs.
+
+        Usage:
+
+        ```python
+        # Select and filter without copying the whole raw_df upfront:
+        baked_df = recipe.bake(raw_df, copy=False)
+
+        # Bake the partitions on 8 processes:
+        baked_df = recipe.bake(raw_df, n_jobs=8)
+        ```
         """
-        if not isinstance(df, (DataFrame, Recipe)):
+        if not isinstance(df, (DataFrame, Recipe)) and not self.backend.is_frame(df):
             raise YeastRecipeError('Data must be a Pandas DataFrame or a Recipe')
 
-        baked_df = df.copy()
-        for step in self.steps:
+        baked_df = self.prune(df, role) if self.optimize else df
+        steps = self.plan(role).steps if self.optimize else Plan(self.steps, role=role).steps
+        if n_jobs != 1:
+            # The partitions are copied to the processes and the rest is copied on write
+            baked_df = self.bake_parallel(steps, baked_df, df, n_jobs)
+        else:
+            baked_df = self.copy_input(baked_df, df, copy)
+            if self.cache is not None:
+                baked_df = self.bake_cached(steps, baked_df, df, role)
+            else:
+                baked_df = self.bake_steps(steps, baked_df, df, role)
+        return self.backend.convert(baked_df, like=df)
+
+    def bake_parallel(self, steps, baked_df, df, n_jobs):
+        """
+        Bake the row-local steps at the start of the recipe on row partitions using a pool of
+        `n_jobs` processes, then the rest of the steps on the concatenated partitions.
+        The steps (including their prepared state) are sent once to each process. The partitions
+        end before the first step that resets the index (like joins), so the index is the same
+        as baking all the rows at once.
+        """
+        n_jobs = os.cpu_count() if n_jobs is None or n_jobs < 1 else n_jobs
+        n_jobs = min(n_jobs, baked_df.shape[0])
+        prefix = 0
+        while prefix < len(steps) and steps[prefix].is_row_local():
+            if steps[prefix].resets_index:
+                break
+            prefix += 1
+        if n_jobs < 2 or prefix == 0 or not isinstance(baked_df, DataFrame):
+            return self.bake_steps(steps, baked_df, df)
+
+        bounds = np.linspace(0, baked_df.shape[0], n_jobs + 1).astype(int)
+        partitions = [baked_df.iloc[start:end] for start, end in zip(bounds[:-1], bounds[1:])]
+        try:
+            with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+                # Each process owns its partition, so the steps can modify it in place
+                baked_partitions = list(executor.map(
+                    bake_partition, [steps[:prefix]] * n_jobs, partitions, [self.validate] * n_jobs
+                ))
+        except (YeastRecipeError, YeastValidationError, YeastBakeError, YeastTransformerError):
+            raise
+        except Exception as ex:
+            raise YeastBakeError(f'There was an error while baking in parallel: {ex}') from ex
+        baked_df = pd.concat(baked_partitions)
+        return self.bake_steps(steps[prefix:], baked_df, df)
+
+    def bake_stream(self, frames, role='all', copy=True):
+        """
+        Bake the recipe chunk by chunk returning a generator of transformed data frames. Only one
+        chunk is in memory at a time, so it could be used to bake datasets larger than the memory.
+        All the steps must be row-local (each output row only depends on one input row) and
+        prepared, like filters, row-wise mutations, casts, imputations or encodings. Steps that
+        need all the rows (sort, drop duplicates, group by, summarize, etc.) raise an error before
+        any chunk is baked.
+
+        Parameters:
+
+        - `frames`: iterable of DataFrames (chunks) to bake
+        - `role`: String name of the role to bake. Default: `all`
+        - `copy`: if `True` (default) each chunk is copied before any step is executed. If `False`
+                  the chunks are only copied when a step is going to modify it in place.
+
+        Usage:
+
+        ```python
+        recipe.prepare(train_df)
+        chunks = pd.read_csv('scoring.csv', chunksize=100000)
+        for baked_chunk in recipe.bake_stream(chunks):
+            baked_chunk.to_csv('scored.csv', mode='a', header=False)
+        ```
+
+        Raises:
+
+        - `YeastRecipeError`: if any of the steps is not row-local
+        - `YeastBakeError`: if any of the steps needs preparation and it is not prepared
+        """
+        steps = self.plan(role).steps if self.optimize else Plan(self.steps, role=role).steps
+        for step in steps:
+            if not step.is_row_local():
+                raise YeastRecipeError(
+                    f'{step.__class__.__name__} can not be baked by chunks because it needs all '
+                    'the rows. Use bake(...) instead.'
+                )
+            if step.needs_preparation and not step.prepared:
+                raise YeastBakeError(
+                    f'{step.__class__.__name__} needs preparation. Did you run prepare(...)?'
+                )
+        return self.stream_steps(steps, frames, role, copy)
+
+    def stream_steps(self, steps, frames, role='all', copy=True):
+        """
+        Generator that bakes the steps on each chunk. The rows of the steps that reset the index
+        (like joins) are numbered after the rows of the previous chunks, as if all the chunks were
+        baked at once.
+        """
+        columns = None
+        offsets = [0] * len(steps)
+        for df in frames:
+            if not isinstance(df, DataFrame) and not self.backend.is_frame(df):
+                raise YeastRecipeError('Data must be an iterable of Pandas DataFrames')
+            if self.optimize and columns is None:
+                columns = self.required_columns(self.backend.schema(df), role)
+            baked_df = df
+            if columns is not None and len(columns) < df.shape[1]:
+                baked_df = self.backend.select_columns(df, columns)
+            baked_df = self.copy_input(baked_df, df, copy)
+            for i, step in enumerate(steps):
+                baked_df = self.bake_steps([step], baked_df, df, role)
+                if step.resets_index and isinstance(baked_df, DataFrame):
+                    baked_df.index = baked_df.index + offsets[i]
+                    offsets[i] += baked_df.shape[0]
+            yield self.backend.convert(baked_df, like=df)
+
+    def bake_steps(self, steps, baked_df, df, role='all'):
+        """
+        Bake the steps of the role in order, `df` is the original data provided by the user
+        """
+        for step in steps:
             try:
                 if role == 'all' or step.role == 'all' or role == step.role:
-                    baked_df = step.bake(baked_df)
+                    baked_df = self.bake_step(step, baked_df, df)
             except YeastRecipeError as ex:
                 raise ex
             except YeastValidationError as ex:
@@ -89,8 +366,379 @@ class Recipe():
                 raise YeastBakeError(f'There was an error while baking: {ex}') from ex
         return baked_df
 
+    def bake_cached(self, steps, baked_df, df, role='all'):
+        """
+        Bake the steps from the last one whose output is cached and store the output of the rest
+        """
+        if not isinstance(baked_df, DataFrame):
+            return self.bake_steps(steps, baked_df, df, role)
+        keys = self.cache.keys(baked_df, steps)
+        start = 0
+        for i in reversed(range(len(steps))):
+            cached = self.cache.get(keys[i]) if keys[i] in self.cache else None
+            if cached is not None:
+                baked_df, start = cached, i + 1
+                break
+        for step, key in zip(steps[start:], keys[start:]):
+            baked_df = self.bake_steps([step], baked_df, df, role)
+            self.cache.put(key, baked_df)
+        return baked_df
+
+    def bake_step(self, step, data, df):
+        """
+        Bake the step natively if the backend supports it or with pandas otherwise. The data is
+        converted between formats only when the previous step was baked on the other one.
+        """
+        if self.backend.supports(step):
+            data = self.backend.from_pandas(step.ungroup(data))
+            return step.bake_native(data, self.backend, validate=self.validate)
+        data = self.backend.to_pandas(data)
+        data = self.copy_on_write(step, data, df)
+        return step.bake(data, self.validate)
+
+    def compile_for_inference(self, schema, role='all'):
+        """
+        Compile the prepared recipe into a function that bakes one or a few rows with low latency,
+        for example on an online model server. The steps are validated only once with the
+        `schema`, their selectors are resolved and the data is baked as NumPy arrays instead of
+        DataFrames. The steps without a compiled version are baked with pandas (see
+        `yeast.inference.InferenceFunction`).
+
+        Compiled steps: `SelectColumnsStep`, `DropColumnsStep`, `RenameColumnsStep`,
+        `CleanColumnNamesStep`, `DropZVColumnsStep`, `CastColumnsStep` (numbers, strings and
+        categories), `FilterRowsStep` (if the expression could be compiled), `ReplaceNAStep`,
+        `ConstantImputeStep`, `MeanImputeStep`, `MedianImputeStep` and `OrdinalEncoderStep`.
+
+        Parameters:
+
+        - `schema`: schema of the data to bake: DataFrame, dictionary as `{'column_name': 'type'}`
+                    or list of columns
+        - `role`: String name of the role to bake. Default: `all`
+
+        Usage:
+
+        ```python
+        recipe.prepare(train_df)
+        bake = recipe.compile_for_inference(train_df)
+
+        bake({'title': 'TNG', 'year': 1987, 'rating': None})
+        # {'title': 'tng', 'year': 1987, 'rating': 8.4}
+        bake({'title': ['TNG', 'Picard'], 'year': [1987, 2020], 'rating': [None, 9.3]})
+        # {'title': array(['tng', 'picard']), 'year': array([1987, 2020]), ...}
+        ```
+
+        Raises:
+
+        - `YeastBakeError`: if any of the steps needs preparation and it is not prepared
+        - `YeastValidationError`: if any step is not valid for the schema
+        - `YeastRecipeError`: if the output of a step could not be inferred
+        """
+        schema = to_schema(schema)
+        steps = self.plan(role).steps if self.optimize else Plan(self.steps, role=role).steps
+        for step in steps:
+            if step.needs_preparation and not step.prepared:
+                raise YeastBakeError(
+                    f'{step.__class__.__name__} needs preparation. Did you run prepare(...)?'
+                )
+
+        dtypes = {column: inference_dtype(dtype) for column, dtype in schema.dtypes.items()}
+        functions, pandas_steps, pandas_schema = [], [], schema
+        for step in steps:
+            output = step.output_schema(schema)
+            if output is None:
+                raise YeastRecipeError(f'The output of {step} could not be inferred')
+            function = step.compile_inference(step.ungroup(schema))
+            if function is None:
+                pandas_schema = pandas_schema if pandas_steps else schema
+                pandas_steps.append(step)
+            else:
+                if pandas_steps:
+                    functions.append((pandas_function(self, pandas_steps, pandas_schema), None))
+                    pandas_steps = []
+                functions.append((function, pandas_function(self, [step], schema)))
+            schema = output
+        if pandas_steps:
+            functions.append((pandas_function(self, pandas_steps, pandas_schema), None))
+        return InferenceFunction(dtypes, functions)
+
+    def lazy(self, df, role='all'):
+        """
+        Build one lazy query (a Polars LazyFrame) with all the steps of the recipe instead of
+        baking the data. Nothing is executed until the query is collected, so Polars optimizes the
+        whole recipe at once: the filters and the column selections are pushed down to the source
+        (e.g. only the required columns and row groups of the parquet files are read), common
+        subexpressions are calculated once, etc. Requires `polars` to be installed.
+
+        The steps that are not supported by Polars (see `yeast.backends.PolarsBackend`) are
+        executed with pandas inside the query, the consecutive ones together. The optimizations
+        are not pushed across them, so place the steps supported by Polars first. If the output
+        of a group of pandas steps could not be inferred, the query is collected before them.
+
+        Parameters:
+
+        - `df`: pandas DataFrame, Polars DataFrame or Polars LazyFrame (e.g. `pl.scan_parquet()`)
+        - `role`: String name of the role to bake. Default: `all`
+
+        Usage:
+
+        ```python
+        recipe.prepare(train_df)
+        query = recipe.lazy(pl.scan_parquet('sales/*.parquet'))
+        baked_df = query.collect()
+        ```
+
+        Raises:
+
+        - `YeastRecipeError`: if polars is not installed or the data is not valid
+        - `YeastBakeError`: if any of the steps needs preparation and it is not prepared
+        """
+        backend = self.backend if self.backend.name == 'polars' else get_backend('polars')
+        if not isinstance(df, (DataFrame, backend.pl.DataFrame, backend.pl.LazyFrame)):
+            raise YeastRecipeError('Data must be a Pandas DataFrame or a Polars DataFrame')
+
+        steps = self.plan(role).steps if self.optimize else Plan(self.steps, role=role).steps
+        for step in steps:
+            if step.needs_preparation and not step.prepared:
+                raise YeastBakeError(
+                    f'{step.__class__.__name__} needs preparation. Did you run prepare(...)?'
+                )
+
+        query = backend.to_lazy(df)
+        schema = backend.schema(query)
+        pandas_steps = []
+        for step in steps + [None]:
+            if step is not None and not backend.supports(step):
+                pandas_steps.append(step)
+                continue
+            if pandas_steps:
+                query, schema = self.lazy_pandas_steps(backend, query, schema, pandas_steps)
+                pandas_steps = []
+            if step is not None:
+                query = step.bake_native(query, backend, schema, self.validate)
+                schema = step.output_schema(schema)
+        return query
+
+    def lazy_pandas_steps(self, backend, query, schema, steps):
+        """
+        Add the steps executed with pandas to the lazy query
+
+        :returns the query and its output schema
+        """
+        output = schema
+        for step in steps:
+            output = None if output is None else step.output_schema(output)
+        if output is None:
+            data = self.bake_steps(steps, backend.to_pandas(query.collect()), None)
+            data = getattr(data, 'obj', data)  # DataFrameGroupBy wraps the DataFrame on obj
+            return backend.to_lazy(data), backend.schema(data)
+        return backend.map_pandas(
+            query,
+            lambda df: self.bake_steps(steps, df, None),
+            getattr(output, 'obj', output)
+        ), getattr(output, 'obj', output)
+
+    def plan(self, role='all'):
+        """
+        Return the optimized execution plan of the recipe for the role
+        """
+        return Plan(self.steps, role=role).optimize()
+
+    def explain(self, role='all'):
+        """
+        Print the optimized execution plan including all the rewrites applied to the steps.
+
+        Usage:
+
+        ```python
+        Recipe([
+            MutateStep({'name': StrToLower()}),
+            FilterStep('age > 20')
+        ], optimize=True).explain()
+
+        # Plan for role "all":
+        #   1. FilterRowsStep(expression='age > 20', kwargs={})
+        #   2. MutateStep(transformers={'name': StrToLower()})
+        # Rewrites:
+        #   - Moved FilterRowsStep(expression='age > 20', kwargs={}) before MutateStep(...)
+        ```
+        """
+        print(self.plan(role))
+
+    def output_schema(self, schema, role='all'):
+        """
+        Return the schema (a DataFrame without rows) of the data baked by the recipe. The schema of
+        each step is inferred from the previous one without touching the data, so the whole recipe
+        is validated in milliseconds before baking a large dataset. The steps validated here are not
+        validated again when baking data with the same schema (see `validate`).
+
+        Parameters:
+
+        - `schema`: DataFrame, dictionary as `{'column_name': 'type', ...}` or list of columns
+        - `role`: String name of the role to bake. Default: `all`
+
+        Usage:
+
+        ```python
+        recipe = Recipe([
+            CastColumnsStep({'age': 'float32'}),
+            SelectColumnsStep(['name', 'age'])
+        ])
+        recipe.output_schema({'name': 'string', 'age': 'int64', 'city': 'string'}).dtypes
+        # name     string
+        # age     float32
+        ```
+
+        Raises:
+
+        - `YeastValidationError`: if any step is not valid for its input schema
+        - `YeastRecipeError`: if the output schema of a step could not be inferred, for example
+                              the steps that need preparation and are not prepared yet
+        """
+        schema = to_schema(schema)
+        steps = self.plan(role).steps if self.optimize else Plan(self.steps, role=role).steps
+        for step in steps:
+            output = step.output_schema(schema)
+            if output is None:
+                raise YeastRecipeError(f'The output of {step} could not be inferred')
+            schema = output
+        return schema
+
+    def required_columns(self, schema, role='all'):
+        """
+        Return the list of input columns that are actually used by the recipe to bake the data.
+        The schema of each step is inferred from the previous one (without touching the data) and
+        then the required columns are calculated backwards from the output of the recipe.
+        All other columns could be dropped before baking or not read at all.
+
+        Parameters:
+
+        - `schema`: DataFrame, dictionary as `{'column_name': 'type', ...}` or list of columns
+        - `role`: String name of the role to bake. Default: `all`
+
+        Usage:
+
+        ```python
+        recipe = Recipe([
+            MutateStep({'name': StrToLower()}),
+            SelectColumnsStep(['name', 'age'])
+        ])
+        columns = recipe.required_columns({'name': 'string', 'age': 'int64', 'city': 'string'})
+        # ['name', 'age']
+        df = pd.read_csv('people.csv', usecols=columns)
+        ```
+        """
+        schema = to_schema(schema)
+        steps = self.plan(role).steps if self.optimize else Plan(self.steps, role=role).steps
+        schemas = [schema]
+        for step in steps:
+            output = step.output_schema(schemas[-1])
+            if output is None:
+                break
+            schemas.append(output)
+        # All the columns of the last known schema are required
+        columns = getattr(schemas[-1], 'obj', schemas[-1]).columns.tolist()
+        for step, step_schema in reversed(list(zip(steps, schemas[:-1]))):
+            columns = step.input_columns(columns, step_schema)
+        return [c for c in schema.columns if c in columns]
+
+    def prune(self, df, role='all'):
+        """
+        Drop all the columns that are not required by the recipe
+        """
+        columns = self.required_columns(self.backend.schema(df), role)
+        return self.backend.select_columns(df, columns) if len(columns) < df.shape[1] else df
+
+    @staticmethod
+    def copy_input(data, source, copy=True):
+        """
+        Copy the pandas DataFrame provided by the user if it was not copied yet. The data of other
+        backends is immutable, so it's never copied.
+        """
+        if copy and data is source and isinstance(data, DataFrame):
+            return data.copy()
+        return data
+
+    @staticmethod
+    def copy_on_write(step, data, source):
+        """
+        Copy the data only if the step is going to modify it in place and the data still shares
+        its memory with the source DataFrame provided by the user. Steps that return a new
+        DataFrame (select, filter, joins, etc.) take the ownership of the data, so it is never
+        copied after them.
+        """
+        frame = getattr(data, 'obj', data)  # DataFrameGroupBy wraps the DataFrame on obj
+        if not step.inplace or frame is not source:
+            return data
+        if frame is data:
+            return data.copy()
+        return frame.copy().groupby(data.keys, sort=data.sort)
+
+    def save(self, path):
+        """
+        Save the recipe including the prepared state of the steps (means, medians, categories,
+        etc.), so it could be loaded by the scoring workers without preparing it again.
+        The large arrays are stored as raw buffers that `load()` maps into memory without copying
+        them (see `yeast.serialization`).
+
+        Parameters:
+
+        - `path`: path of the file
+
+        Usage:
+
+        ```python
+        recipe.prepare(train_df).save('recipe.yeast')
+
+        # On the scoring workers:
+        recipe = Recipe.load('recipe.yeast')
+        baked_df = recipe.bake(new_df)
+        ```
+
+        Raises:
+
+        - `YeastRecipeError`: if the recipe could not be saved, for example if any step contains a
+                              lambda function
+        """
+        serialization.save(self, path)
+        return self
+
+    @staticmethod
+    def load(path, mmap_mode=True):
+        """
+        Load a recipe saved by `save()`
+
+        Parameters:
+
+        - `path`: path of the file
+        - `mmap_mode`: if `True` (default) the arrays are read only views of the memory mapped file,
+                       so the recipe is loaded almost instantly and the operating system reads the
+                       pages when they are used. If `False` the whole file is read into memory.
+
+        Notes:
+
+        Only the numeric arrays are used as views of the file (like numeric categories, sketches
+        or the values of the tables). String categories are stored as fixed width unicode
+        buffers, but they are copied into pandas object indexes while loading.
+
+        Raises:
+
+        - `YeastRecipeError`: if the file does not contain a recipe or it was saved with a newer
+                              format version
+        """
+        recipe = serialization.load(path, mmap_mode=mmap_mode)
+        if not isinstance(recipe, Recipe):
+            raise YeastRecipeError(f'"{path}" does not contain a Recipe')
+        return recipe
+
     def needs_preparation(self):
         """
         Scan all steps in this recipe to detect if any of the steps require preparation
         """
         return any([s.needs_preparation for s in self.steps])
+
+
+def bake_partition(steps, partition, validate='once'):
+    """
+    Bake the steps on a partition of the data inside a worker process of `Recipe.bake_parallel`
+    """
+    return Recipe(steps, validate=validate).bake_steps(steps, partition, None)
@@ -0,0 +1,51 @@
+from pandas import Series
+from pandas.core.frame import DataFrame
+from yeast.errors import YeastRecipeError
+
+
+def to_schema(data):
+    """
+    Convert the data into a schema: a DataFrame without rows that keeps the column names and types.
+    Selectors and validations only use the columns and types, so steps could be analysed using a
+    schema instead of the data.
+
+    Parameters:
+
+    - `data`: DataFrame, dictionary as `{'column_name': 'type', ...}` or list of column names
+              (the type of the columns will be `object`)
+
+    Usage:
+
+    ```python
+    to_schema(df)
+    to_schema({'title': 'string', 'year': 'int64'})
+    to_schema(['title', 'year'])
+    ```
+
+    Raises:
+
+    - `YeastRecipeError`: if the data can not be converted into a schema
+    """
+    if isinstance(data, DataFrame):
+        return data.iloc[0:0]
+    if isinstance(data, dict):
+        return DataFrame({c: Series([], dtype=t) for c, t in data.items()})
+    if isinstance(data, (list, tuple)):
+        return DataFrame(columns=list(data))
+    raise YeastRecipeError('The schema must be a DataFrame, a dictionary or a list of columns')
+
+
+def schema_signature(data):
+    """
+    Return a hashable signature of the column names and types of the data (DataFrame or
+    DataFrameGroupBy, including its grouping keys). Data with the same signature has the same
+    schema, so the validations of the steps don't need to be executed again.
+    """
+    frame = getattr(data, 'obj', data)
+    if not isinstance(frame, DataFrame):
+        return None
+    keys = getattr(data, 'keys', None) if frame is not data else None
+    keys = tuple(keys) if isinstance(keys, list) else keys
+    if keys is not None and not isinstance(keys, (str, tuple)):
+        return None  # Grouped by arrays or functions
+    return (type(data), keys, tuple(frame.columns), tuple(str(t) for t in frame.dtypes))
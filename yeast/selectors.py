@@ -5,6 +5,10 @@ class Selector():
     def resolve(self, df):
         pass
 
+    def __repr__(self):
+        params = ', '.join(f'{k}={v!r}' for k, v in vars(self).items())
+        return f'{self.__class__.__name__}({params})'
+
 
 class AllColumns(Selector):
     """
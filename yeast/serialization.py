@@ -0,0 +1,120 @@
+import os
+import mmap
+import struct
+from yeast.errors import YeastRecipeError
+
+try:
+    # Backport of the pickle protocol 5 (out-of-band buffers) for Python 3.7
+    import pickle5 as pickle
+except ImportError:
+    import pickle
+
+
+MAGIC = b'YEAST'
+FORMAT_VERSION = 1
+# Magic, format version, pickle size and number of buffers
+HEADER = struct.Struct('<5sHQI')
+# Offset and size of each buffer
+BUFFER = struct.Struct('<QQ')
+# The buffers start on multiples of 64 bytes, so the arrays are aligned when mapped
+ALIGNMENT = 64
+# Pickle protocol: 5 if available (Python 3.8+ or pickle5) or 4 without out-of-band buffers
+PROTOCOL = min(5, pickle.HIGHEST_PROTOCOL)
+
+
+def save(obj, path):
+    """
+    Save the object into a binary file. The object is pickled (protocol 5) and the large NumPy
+    arrays (the data of the DataFrames, sketches, categories, etc.) are stored out of the pickle
+    as raw buffers, so they could be memory mapped by `load()` without copying them.
+
+    On Python 3.7 the protocol 5 needs the `pickle5` backport, without it the object is pickled
+    with the protocol 4 and the arrays are stored (and loaded) inside the pickle.
+
+    File format (little endian):
+
+    - Header: `YEAST`, format version (uint16), pickle size (uint64), number of buffers (uint32)
+    - Offset and size (uint64) of each buffer
+    - The pickle
+    - The buffers, each one aligned to 64 bytes
+
+    Raises:
+
+    - `YeastRecipeError`: if the object could not be pickled, for example it contains lambdas
+    """
+    buffers = []
+    try:
+        if PROTOCOL >= 5:
+            data = pickle.dumps(obj, protocol=PROTOCOL, buffer_callback=buffers.append)
+        else:
+            data = pickle.dumps(obj, protocol=PROTOCOL)
+    except (pickle.PicklingError, AttributeError, TypeError, ValueError) as ex:
+        raise YeastRecipeError(f'The recipe could not be saved: {ex}') from ex
+    buffers = [buffer.raw() for buffer in buffers]
+
+    offset = align(HEADER.size + BUFFER.size * len(buffers) + len(data))
+    positions = []
+    for buffer in buffers:
+        positions.append((offset, buffer.nbytes))
+        offset = align(offset + buffer.nbytes)
+
+    with open(path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, FORMAT_VERSION, len(data), len(buffers)))
+        for position in positions:
+            f.write(BUFFER.pack(*position))
+        f.write(data)
+        for (offset, _), buffer in zip(positions, buffers):
+            f.write(b'\0' * (offset - f.tell()))
+            f.write(buffer)
+
+
+def load(path, mmap_mode=True):
+    """
+    Load an object saved by `save()`. If `mmap_mode` is True the file is memory mapped and the
+    arrays are read only views of the file, so only the pickle is read upfront and the pages of the
+    arrays are read by the operating system when they are used (and shared between processes).
+    Otherwise the file is read into memory and the arrays are writable.
+
+    Raises:
+
+    - `YeastRecipeError`: if the file is not valid, it was saved with a newer format version or
+                          it has buffers that could not be loaded without the protocol 5
+    """
+    with open(path, 'rb') as f:
+        if mmap_mode and os.fstat(f.fileno()).st_size > 0:
+            content = memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+        else:
+            content = bytearray(os.fstat(f.fileno()).st_size)
+            f.readinto(content)
+            content = memoryview(content)
+
+    if len(content) < HEADER.size:
+        raise YeastRecipeError(f'"{path}" is not a Yeast file')
+    magic, version, size, count = HEADER.unpack_from(content)
+    if magic != MAGIC:
+        raise YeastRecipeError(f'"{path}" is not a Yeast file')
+    if version > FORMAT_VERSION:
+        raise YeastRecipeError(
+            f'"{path}" was saved with the format version {version} but only the versions up to '
+            f'{FORMAT_VERSION} are supported. Please update Yeast.'
+        )
+    if count > 0 and PROTOCOL < 5:
+        raise YeastRecipeError(
+            f'"{path}" was saved with the pickle protocol 5. Please install pickle5 or use '
+            'Python 3.8+ to load it.'
+        )
+    start = HEADER.size + BUFFER.size * count
+    buffers = []
+    for i in range(count):
+        offset, nbytes = BUFFER.unpack_from(content, HEADER.size + BUFFER.size * i)
+        buffers.append(content[offset:offset + nbytes])
+    if PROTOCOL < 5:
+        return pickle.loads(content[start:start + size])
+    return pickle.loads(content[start:start + size], buffers=buffers)
+
+
+def align(offset):
+    """
+    Return the next offset multiple of the alignment
+    """
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
@@ -0,0 +1,127 @@
+import numpy as np
+
+
+class TDigest():
+    """
+    Mergeable sketch to estimate quantiles (like the median) on data that doesn't fit in memory.
+
+    The digest summarizes the values as a sorted list of centroids (mean and weight). Centroids
+    near the tails are kept small while the ones in the middle absorb more values, so the error
+    is small for all the quantiles and the size of the digest is bounded by the `compression`
+    regardless of the number of values. Small datasets are not compressed at all, so their
+    quantiles are exact.
+
+    Parameters:
+
+    - `compression`: accuracy of the digest, it keeps about `compression / 2` centroids. Default:
+                   `100`
+
+    Usage:
+
+    ```python
+    digest = TDigest()
+    for chunk in pd.read_csv('sales.csv', chunksize=100000):
+        digest.update(chunk['amount'])
+
+    digest.quantile(0.5)  # approximated median
+
+    # Digests could be merged, for example to combine the daily deltas:
+    digest = TDigest().merge(monday_digest).merge(tuesday_digest)
+    ```
+    """
+    def __init__(self, compression=100):
+        self.compression = compression
+        self.means = np.array([], dtype='float64')
+        self.weights = np.array([], dtype='float64')
+        self.min = np.nan
+        self.max = np.nan
+
+    @property
+    def count(self):
+        """
+        Number of values summarized by the digest
+        """
+        return self.weights.sum()
+
+    def update(self, values):
+        """
+        Add the values to the digest ignoring the NA values
+        """
+        values = np.asarray(values, dtype='float64')
+        values = values[~np.isnan(values)]
+        if values.size == 0:
+            return self
+        means, weights = self.summarize(values)
+        return self.add_centroids(means, weights, values.min(), values.max())
+
+    def summarize(self, values):
+        """
+        Group the values into centroids without sorting them. The values only have one unit of
+        weight, so the first rank of each group of the scale function is known in advance and the
+        groups are selected with one `np.partition`. The groups are 10 times finer than the digest
+        ones, so the accuracy is the same as compressing the values with the current centroids.
+        """
+        compression = self.compression * 10
+        if values.size <= compression:
+            return np.sort(values), np.ones(values.size)
+        # First rank of each group: the inverse of the scale function used by compress()
+        k = np.arange(np.floor(-compression / 4), np.ceil(compression / 4) + 1)
+        q = (np.sin(np.clip(2 * np.pi * k / compression, -np.pi / 2, np.pi / 2)) + 1) / 2
+        starts = np.unique(np.clip(np.ceil(q * values.size - 0.5), 0, values.size).astype('int64'))
+        starts = starts[starts < values.size]
+        starts = np.r_[0, starts[starts > 0]]
+        values = np.partition(values, starts[1:])
+        weights = np.diff(np.r_[starts, values.size]).astype('float64')
+        return np.add.reduceat(values, starts) / weights, weights
+
+    def merge(self, digest):
+        """
+        Add all the values summarized by other `digest`
+        """
+        if digest.weights.size == 0:
+            return self
+        return self.add_centroids(digest.means, digest.weights, digest.min, digest.max)
+
+    def add_centroids(self, means, weights, vmin, vmax):
+        """
+        Merge the centroids with the current ones and compress the digest
+        """
+        means = np.concatenate([self.means, means])
+        weights = np.concatenate([self.weights, weights])
+        order = np.argsort(means, kind='mergesort')
+        self.means, self.weights = self.compress(means[order], weights[order])
+        self.min = np.nanmin([self.min, vmin])
+        self.max = np.nanmax([self.max, vmax])
+        return self
+
+    def compress(self, means, weights):
+        """
+        Group the sorted centroids using the arcsine scale function: each group spans at most one
+        unit of `compression / (2 * pi) * arcsin(2q - 1)` where `q` is the quantile of the centroid
+        """
+        total = weights.sum()
+        if weights.size <= self.compression or total <= self.compression:
+            return means, weights
+        q = (np.cumsum(weights) - weights / 2) / total
+        k = np.floor(self.compression / (2 * np.pi) * np.arcsin(2 * q - 1))
+        starts = np.flatnonzero(np.r_[True, k[1:] != k[:-1]])
+        grouped = np.add.reduceat(weights, starts)
+        return np.add.reduceat(means * weights, starts) / grouped, grouped
+
+    def quantile(self, q):
+        """
+        Estimate the quantile `q` (from 0 to 1) or NA if the digest is empty
+        """
+        if self.weights.size == 0:
+            return np.nan
+        # Each centroid is placed in the middle of its weight, the extremes are known
+        positions = np.cumsum(self.weights) - self.weights / 2
+        positions = np.r_[0, positions, self.count]
+        means = np.r_[self.min, self.means, self.max]
+        return float(np.interp(q * self.count, positions, means))
+
+    def median(self):
+        """
+        Estimate the median
+        """
+        return self.quantile(0.5)
@@ -1,6 +1,9 @@
 import itertools
+from pandas.core.frame import DataFrame
+from pandas.core.groupby.generic import DataFrameGroupBy
 from yeast.selectors import Selector
-from yeast.errors import YeastBakeError
+from yeast.schema import schema_signature
+from yeast.errors import YeastBakeError, YeastValidationError
 
 
 class Step():
@@ -22,7 +25,58 @@ class Step():
 
     The `needs_preparation` is used to understand if the recipe needs the preparation stage.
     If any of the steps require preparation, skip this stage (time-consuming)
+
+    The `inplace` flag must be True on steps whose `do_bake()` writes columns into the DataFrame it
+    receives instead of returning a new one. The Recipe uses it to copy the data only when needed.
+
+    The `incremental` flag must be True on steps that need preparation and could be prepared one
+    chunk at a time: prepare_partial() --> do_prepare_partial() folds the statistics of each chunk
+    and finalize() --> do_finalize() calculates the final state from them. Prepared steps could
+    receive more chunks later to refresh their state.
+
+    The `supports_groups` flag must be True on steps that work on the groups created by a
+    GroupByStep (a DataFrameGroupBy). All other steps receive the grouped DataFrame ungrouped.
+
+    Validation:
+    validate() records the schema (column names and types) of the data it validated, so with the
+    `once` policy the data is only validated again when the schema changes (see `Recipe`). The
+    `validates_data` flag must be True on steps whose do_validate() looks at the values of the
+    data and not only at its schema: they are validated on every bake unless the policy is `never`.
+
+    Backends:
+    Steps could be baked natively by other backends (`yeast.backends`) defining a method
+    do_bake_<backend name>(df, schema) that receives the data in the native format of the backend
+    and its pandas `schema` to resolve the selectors. It's called by bake_native() after validating
+    the schema. Steps without it are baked with pandas.
+
+    Inference:
+    Steps could define compile_inference(schema) returning a function that bakes a dictionary of
+    NumPy arrays (one per column) with the same result as do_bake(). It's used by
+    `Recipe.compile_for_inference()` to bake a few rows without the pandas overhead.
+
+    Planning:
+    The query planner (`yeast.plan.Plan`) never looks at the data. It relies on a few methods that
+    describe the step and that should be redefined by childs if possible:
+    - reads() / writes(): column names read / created or modified. `None` means unknown.
+    - is_row_local(): True if each output row only depends on one input row.
+    - is_noop(): True if the step does not change the data at all.
+    - merge(step): return a single step equivalent to this one followed by `step`.
+    - commutes_with(step): True if this step can be executed before `step` with the same result.
+      Only used on steps with `pushdown = True` that the planner tries to execute as early as
+      possible.
+    The `resets_index` flag must be True on steps that return the rows with a new index (like
+    sorts or joins), so the rows removed or reordered before them change the output index.
     """
+    inplace = False
+    pushdown = False
+    resets_index = False
+    incremental = False
+    supports_groups = False
+    validates_data = False
+    validation_policies = ['always', 'once', 'never']
+    # Signature of the schema of the last validated data, None if not validated yet
+    _validated_schema = None
+
     def __init__(self, needs_preparation=False, prepared=False, role='all'):
         """
         Initialize the Step
@@ -41,14 +95,34 @@ class Step():
         """
         During this phase the original df must not be transformed.
         """
+        df = self.ungroup(df)
         self.validate(df)
         self.do_prepare(df)
         self.prepared = True
         return self
 
-    def bake(self, df):
+    def prepare_partial(self, df):
+        """
+        Fold one chunk of the preparation data into the step. As in prepare() the df must not be
+        transformed.
+        """
+        df = self.ungroup(df)
+        self.validate(df)
+        self.do_prepare_partial(df)
+        return self
+
+    def finalize(self):
+        """
+        Calculate the state of the step from all the chunks received by prepare_partial()
+        """
+        self.do_finalize()
+        self.prepared = True
+        return self
+
+    def bake(self, df, validate='always'):
         """
-        Execute the recipe transforming the dataframe and return it but before, validate it.
+        Execute the recipe transforming the dataframe and return it but before, validate it
+        following the `validate` policy (see validate()).
 
         :returns the transformed dataframe
         """
@@ -56,15 +130,74 @@ class Step():
             raise YeastBakeError(
                 f'{self.__class__.__name__} needs preparation. Did you run prepare(...)?'
             )
-        self.validate(df)
+        df = self.ungroup(df)
+        self.validate(df, validate)
         return self.do_bake(df)
 
-    def validate(self, df):
+    def bake_native(self, df, backend, schema=None, validate='always'):
+        """
+        Bake the data in the native format of the `backend` using do_bake_<backend name>(). The
+        `schema` of the data is calculated by the backend if it's not provided.
+
+        :returns the transformed data in the native format
+        """
+        if self.needs_preparation and not self.prepared:
+            raise YeastBakeError(
+                f'{self.__class__.__name__} needs preparation. Did you run prepare(...)?'
+            )
+        schema = backend.schema(df) if schema is None else schema
+        self.validate(schema, validate)
+        return getattr(self, f'do_bake_{backend.name}')(df, schema)
+
+    def supports_backend(self, name):
+        """
+        True if the step could be baked natively by the backend `name`
+        """
+        return callable(getattr(self, f'do_bake_{name}', None))
+
+    def compile_inference(self, schema):
+        """
+        Return a function that bakes the data as a dictionary of NumPy arrays
+        `{'column_name': values, ...}` with the same result as do_bake() or None if the step must be
+        baked with pandas. The `schema` of the data is already validated, so the selectors could be
+        resolved only once. The function must not modify the arrays it receives.
+        """
+        return None
+
+    def validate(self, df, policy='always'):
         """
         Validate the step including parameters and further errors
         The return will be ignored
+
+        The `policy` controls when do_validate() is executed:
+
+        - `always`: on every call
+        - `once`: only if the schema of the data is not the same as the last validated one
+        - `never`: only if the step was never validated. Some steps resolve their selectors
+                   while validating, so they need to be validated at least once.
+        """
+        if policy not in self.validation_policies:
+            raise YeastValidationError(
+                f'Validation policy "{policy}" not between: {self.validation_policies}'
+            )
+        if policy == 'never' and self._validated_schema is not None:
+            return self
+        signature = schema_signature(df)
+        if policy == 'once' and not self.validates_data and signature is not None \
+                and signature == self._validated_schema:
+            return self
+        self._validated_schema = None
+        result = self.do_validate(df)
+        self._validated_schema = signature if signature is not None else ()
+        return result
+
+    def ungroup(self, df):
         """
-        return self.do_validate(df)
+        Return the DataFrame wrapped by a DataFrameGroupBy if the step does not support groups
+        """
+        if isinstance(df, DataFrameGroupBy) and not self.supports_groups:
+            return df.obj
+        return df
 
     def do_prepare(self, df):
         """
@@ -72,6 +205,18 @@ class Step():
         """
         return self
 
+    def do_prepare_partial(self, df):
+        """
+        Let subclasses override this operation
+        """
+        return self
+
+    def do_finalize(self):
+        """
+        Let subclasses override this operation
+        """
+        return self
+
     def do_bake(self, df):
         """
         Let subclasses override this operation
@@ -84,6 +229,119 @@ class Step():
         """
         return self
 
+    def reads(self, schema=None):
+        """
+        List of column names read by the step or None if unknown.
+        If the `schema` is available the selectors are resolved with it.
+        """
+        return None
+
+    def writes(self, schema=None):
+        """
+        List of column names created, modified, renamed or removed by the step or None if unknown.
+        If the `schema` is available the selectors are resolved with it.
+        """
+        return None
+
+    def output_schema(self, schema):
+        """
+        Return the schema (a DataFrame without rows) obtained after baking the step on data with
+        the input `schema` or None if it could not be inferred. By default the step is validated and
+        baked on a copy of the schema, so it never touches the data. Childs should redefine it if
+        the schema could be inferred without baking, for example when it does not change.
+        """
+        schema = self.ungroup(schema)
+        schema = schema.copy() if isinstance(schema, DataFrame) else schema
+        try:
+            self.validate(schema)
+            return self.do_bake(schema)
+        except YeastValidationError as ex:
+            raise ex
+        except Exception:
+            return None
+
+    def input_columns(self, columns, schema):
+        """
+        Return the list of columns from the input `schema` that are required to bake the step and
+        generate the output `columns`. The step reads some columns and the rest of the required
+        columns are passed through without changes.
+        """
+        frame = getattr(schema, 'obj', schema)  # DataFrameGroupBy wraps the DataFrame on obj
+        reads, writes = self.reads(schema), self.writes(schema)
+        if reads is None or writes is None:
+            return frame.columns.tolist()
+        return [c for c in frame.columns if c in reads or (c in columns and c not in writes)]
+
+    def is_row_local(self):
+        """
+        True if each output row only depends on one input row, like a filter or a string transform
+        """
+        return False
+
+    def is_noop(self):
+        """
+        True if baking the step returns the same data
+        """
+        return type(self) is Step
+
+    def merge(self, step):
+        """
+        Return one step equivalent to execute this step and then `step` or None if not possible
+        """
+        return None
+
+    def commutes_with(self, step):
+        """
+        True if this step could be executed before the previous `step` with the same result
+        """
+        return False
+
+    @staticmethod
+    def static_columns(selector):
+        """
+        Return the list of column names if the selector can be resolved without the data
+        (a column name or a list of column names) or None otherwise.
+        """
+        selector = [selector] if isinstance(selector, str) else selector
+        if isinstance(selector, (list, tuple)) and all(isinstance(c, str) for c in selector):
+            return list(selector)
+        return None
+
+    def selected_columns(self, selector, schema=None):
+        """
+        Return the list of column names of the selector resolved with the schema if available or
+        without the data if possible (see `static_columns`). Otherwise None.
+        """
+        if schema is None:
+            return self.static_columns(selector)
+        return self.resolve_selector(selector, getattr(schema, 'obj', schema))
+
+    def __getstate__(self):
+        """
+        The validated schema is not pickled, so it does not change the fingerprint of the step
+        """
+        state = self.__dict__.copy()
+        state.pop('_validated_schema', None)
+        return state
+
+    def __repr__(self):
+        """
+        Step name and parameters, used to explain the recipe plans
+        """
+        params = []
+        for name, value in vars(self).items():
+            if name.startswith('_') or name in ['needs_preparation', 'prepared']:
+                continue
+            if name == 'role' and value == 'all':
+                continue
+            if hasattr(value, 'shape') and hasattr(value, 'columns'):
+                value = f'<DataFrame {value.shape[0]} rows x {value.shape[1]} columns>'
+            else:
+                value = repr(value)
+                value = value if len(value) <= 60 else value[:57] + '...'
+            params.append(f'{name}={value}')
+        return f'{self.__class__.__name__}({", ".join(params)})'
+
     def resolve_selector(self, selector, df):
         """
         Resolve the selector.
@@ -18,7 +18,12 @@ from yeast.steps.right_join_step import RightJoinStep  # NoQA
 from yeast.steps.full_join_step import FullJoinStep  # NoQA
 from yeast.steps.mutate_step import MutateStep  # NoQA
 from yeast.steps.replace_na_step import ReplaceNAStep  # NoQA
+from yeast.steps.impute_step import ImputeStep  # NoQA
 from yeast.steps.mean_impute_step import MeanImputeStep  # NoQA
 from yeast.steps.median_impute_step import MedianImputeStep  # NoQA
 from yeast.steps.constant_impute_step import ConstantImputeStep  # NoQA
 from yeast.steps.ordinal_encoder_step import OrdinalEncoderStep  # NoQA
+from yeast.steps.one_hot_encoder_step import OneHotEncoderStep  # NoQA
+from yeast.steps.feature_hashing_step import FeatureHashingStep  # NoQA
+from yeast.steps.frequency_encoder_step import FrequencyEncoderStep  # NoQA
+from yeast.steps.target_encoder_step import TargetEncoderStep  # NoQA
@@ -1,3 +1,4 @@
+import pandas as pd
 from yeast.step import Step
 from yeast.errors import YeastValidationError
 
@@ -51,6 +52,8 @@ class CastColumnsStep(Step):
         'float32': 'float32'
     }
 
+    numpy_types = ['int64', 'int32', 'float64', 'float32']
+
     def __init__(self, mapping, role='all'):
         self.mapping = mapping
         super().__init__(needs_preparation=False, role=role)
@@ -58,12 +61,49 @@ class CastColumnsStep(Step):
     def do_bake(self, df):
         return df.astype(self.convert_mapping(self.mapping))
 
+    def compile_inference(self, schema):
+        """
+        Only the casts to numbers, strings and categories are compiled
+        """
+        types = self.convert_mapping(self.mapping)
+        if not all(t in self.numpy_types + ['string', 'category'] for t in types.values()):
+            return None
+
+        def bake(arrays):
+            arrays = dict(arrays)
+            for column, type_name in types.items():
+                arrays[column] = cast_array(arrays[column], type_name)
+            return arrays
+        return bake
+
     def convert_mapping(self, mapping):
         pandas_mapping = {}
         for c, t in mapping.items():
             pandas_mapping[c] = self.type_mapper.get(t, 'object')
         return pandas_mapping
 
+    def reads(self, schema=None):
+        return list(self.mapping.keys())
+
+    def writes(self, schema=None):
+        return list(self.mapping.keys())
+
+    def is_row_local(self):
+        return True
+
+    def is_noop(self):
+        return not self.mapping
+
+    def merge(self, step):
+        """
+        Two consecutive casts are executed as one if they don't cast a column to different types
+        """
+        if not isinstance(step, CastColumnsStep) or step.role != self.role:
+            return None
+        if any(self.mapping[c] != t for c, t in step.mapping.items() if c in self.mapping):
+            return None
+        return CastColumnsStep({**self.mapping, **step.mapping}, role=self.role)
+
     def do_validate(self, df):
         """
         Validations:
@@ -84,3 +124,21 @@ class CastStep(CastColumnsStep):
     CastStep is an Alias for CastColumnsStep
     """
     pass
+
+
+def cast_array(values, type_name):
+    """
+    Cast a NumPy array like pandas: integers could not contain missing values and strings must be
+    strings or missing values. Strings and categories are arrays of objects.
+    """
+    missing = pd.isna(values)
+    if type_name in ['string', 'category']:
+        if type_name == 'string' and not all(isinstance(v, str) for v in values[~missing]):
+            raise ValueError('Only strings could be casted to string')
+        values = values.astype('object')
+        if missing.any():
+            values[missing] = None
+        return values
+    if type_name.startswith('int') and missing.any():
+        raise ValueError('Missing values could not be casted to integer')
+    return values.astype(type_name)
@@ -37,19 +37,34 @@ class CleanColumnNamesStep(Step):
         super().__init__(needs_preparation=False, role=role)
 
     def do_bake(self, df):
+        return df.rename(columns=self.mapper(df.columns))
+
+    def compile_inference(self, schema):
+        mapper = self.mapper(schema.columns)
+        return lambda arrays: {mapper.get(c, c): values for c, values in arrays.items()}
+
+    def mapper(self, columns):
+        """
+        Return the mapping between the column names and the clean names
+        """
         if self.case == 'snake':
-            mapper = {
-                c: underscore(c.strip().replace('  ', ' ').replace(' ', '_')) for c in df.columns
+            return {
+                c: underscore(c.strip().replace('  ', ' ').replace(' ', '_')) for c in columns
             }
-        elif self.case in ['upper_camel', 'lower_camel']:
-            upper = bool(self.case == 'upper_camel')
-            mapper = {
-                c: camelize(
-                    c.strip().replace('  ', ' ').replace(' ', ''),
-                    uppercase_first_letter=upper
-                ) for c in df.columns
-            }
-        return df.rename(columns=mapper)
+        upper = bool(self.case == 'upper_camel')
+        return {
+            c: camelize(
+                c.strip().replace('  ', ' ').replace(' ', ''),
+                uppercase_first_letter=upper
+            ) for c in columns
+        }
+
+    def is_row_local(self):
+        return True
+
+    def input_columns(self, columns, schema):
+        mapper = self.mapper(schema.columns)
+        return [c for c in schema.columns if mapper[c] in columns]
 
     def do_validate(self, df):
         """
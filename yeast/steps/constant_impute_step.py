@@ -1,8 +1,7 @@
-from yeast.step import Step
-from yeast.errors import YeastValidationError
+from yeast.steps.impute_step import ImputeStep
 
 
-class ConstantImputeStep(Step):
+class ConstantImputeStep(ImputeStep):
     """
     Impute data using a constant value
 
@@ -43,26 +42,8 @@ class ConstantImputeStep(Step):
     - `YeastValidationError`: if a column does not exist
     """
     def __init__(self, selector, value, role='all'):
-        self.selector = selector
+        super().__init__(selector, needs_preparation=False, role=role)
         self.value = value
-        super().__init__(needs_preparation=False, role=role)
 
-    def do_bake(self, df):
-        """
-        Replace all NA values with the constant value
-        """
-        columns = self.resolve_selector(self.selector, df)
-        for column in columns:
-            df[column] = df[column].fillna(self.value)
-        return df
-
-    def do_validate(self, df):
-        """
-        - All columns on the mapping must exist on the df
-        """
-        columns = self.resolve_selector(self.selector, df)
-
-        matches = [c in df.columns for c in columns]
-        if not all(matches):
-            missing_columns = [c for c, v in zip(columns, matches) if not v]
-            raise YeastValidationError(f'The following columns are missing: {missing_columns}')
+    def fill_values(self, columns):
+        return {column: self.value for column in columns}
@@ -104,6 +104,11 @@ class CustomStep(Step):
 
     - `YeastValidationError`: if any of the parameters is defined but not callable.
     """
+    inplace = True
+    supports_groups = True
+    # to_validate could look at the values of the data
+    validates_data = True
+
     def __init__(self, to_prepare=None, to_bake=None, to_validate=None, role='all'):
         self.to_prepare = to_prepare
         self.to_bake = to_bake
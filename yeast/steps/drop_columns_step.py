@@ -23,12 +23,45 @@ class DropColumnsStep(Step):
 
     - `YeastValidationError`: if any column does not exist or any column name is invalid.
     """
+    pushdown = True
+
     def __init__(self, columns, role='all'):
         self.selector = columns
         super().__init__(needs_preparation=False, role=role)
 
     def do_bake(self, df):
-        return df.drop(columns=self.selector)
+        return df.drop(columns=self.resolve_selector(self.selector, df))
+
+    def compile_inference(self, schema):
+        columns = set(self.resolve_selector(self.selector, schema))
+        return lambda arrays: {c: values for c, values in arrays.items() if c not in columns}
+
+    def do_bake_polars(self, df, schema):
+        return df.drop(self.resolve_selector(self.selector, schema))
+
+    def reads(self, schema=None):
+        return self.selected_columns(self.selector, schema)
+
+    def writes(self, schema=None):
+        return self.selected_columns(self.selector, schema)
+
+    def is_row_local(self):
+        return True
+
+    def is_noop(self):
+        return self.selector == []
+
+    def commutes_with(self, step):
+        """
+        The columns could be dropped before a step that does not use them at all
+        """
+        columns = self.writes()
+        if columns is None or step.pushdown:
+            return False
+        reads, writes = step.reads(), step.writes()
+        if reads is None or writes is None:
+            return False
+        return not set(columns) & (set(reads) | set(writes))
 
     def do_validate(self, df):
         """
@@ -36,12 +69,12 @@ class DropColumnsStep(Step):
         - Check that all columns are not empty strings
         - Check if the df contains all elements in columns
         """
-        self.selector = self.resolve_selector(self.selector, df)
+        columns = self.resolve_selector(self.selector, df)
 
-        if not all(isinstance(c, str) for c in self.selector):
+        if not all(isinstance(c, str) for c in columns):
             raise YeastValidationError('Invalid column names')
 
-        matches = [c in df.columns for c in self.selector]
+        matches = [c in df.columns for c in columns]
         if not all(matches):
-            missing_columns = [c for c, v in zip(self.selector, matches) if not v]
+            missing_columns = [c for c, v in zip(columns, matches) if not v]
             raise YeastValidationError(f'The following columns are missing: {missing_columns}')
@@ -42,7 +42,32 @@ class DropDuplicateRowsStep(Step):
         super().__init__(needs_preparation=False, role=role)
 
     def do_bake(self, df):
-        return df.drop_duplicates(subset=self.selector, keep=self.keep)
+        return df.drop_duplicates(subset=self.subset(df), keep=self.keep)
+
+    def do_bake_polars(self, df, schema):
+        keep = self.keep if self.keep else 'none'
+        return df.unique(subset=self.subset(schema), keep=keep, maintain_order=True)
+
+    def subset(self, df):
+        """
+        Resolved columns to look for duplicates or None to use all the columns
+        """
+        return None if self.selector is None else self.resolve_selector(self.selector, df)
+
+    def output_schema(self, schema):
+        """
+        Dropping rows does not change the columns
+        """
+        self.validate(schema)
+        return schema.copy()
+
+    def reads(self, schema=None):
+        if self.selector is None:
+            return None if schema is None else schema.columns.tolist()
+        return self.selected_columns(self.selector, schema)
+
+    def writes(self, schema=None):
+        return []
 
     def do_validate(self, df):
         """
@@ -50,16 +75,15 @@ class DropDuplicateRowsStep(Step):
         - Check if the df contains all elements in columns
         """
         # If None, pick all columns
-        self.selector = df.columns if self.selector is None else self.selector
-
-        self.selector = self.resolve_selector(self.selector, df)
+        columns = self.subset(df)
+        columns = df.columns.tolist() if columns is None else columns
 
-        if not all(isinstance(c, str) for c in self.selector):
+        if not all(isinstance(c, str) for c in columns):
             raise YeastValidationError('Invalid column names')
 
-        matches = [c in df.columns for c in self.selector]
+        matches = [c in df.columns for c in columns]
         if not all(matches):
-            missing_columns = [c for c, v in zip(self.selector, matches) if not v]
+            missing_columns = [c for c, v in zip(columns, matches) if not v]
             raise YeastValidationError(f'The following columns are missing: {missing_columns}')
 
 
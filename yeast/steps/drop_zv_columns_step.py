@@ -1,3 +1,4 @@
+import pandas as pd
 from yeast.step import Step
 from yeast.selectors import AllColumns
 
@@ -31,17 +32,73 @@ class DropZVColumnsStep(Step):
     recipe = Recipe([
         DropZVColumnsStep(AllNumeric())
     ])
+
+    # The columns could be checked one chunk at a time:
+    for chunk in pd.read_csv('train.csv', chunksize=100000):
+        recipe.prepare_partial(chunk)
+    recipe.finalize()
     ```
     """
+    incremental = True
+
     def __init__(self, selector=None, naomit=False, role='all'):
         self.selector = selector if selector else AllColumns()
         self.naomit = naomit
+        self.values = {}
         super().__init__(needs_preparation=True, role=role)
 
     def do_prepare(self, df):
+        self.values = {}
+        self.do_prepare_partial(df)
+        self.do_finalize()
+
+    def do_prepare_partial(self, df):
+        """
+        Keep up to two distinct values of each column: enough to know if it has zero variance
+        """
         columns = self.resolve_selector(self.selector, df)
-        summary = df[columns].nunique(dropna=self.naomit)
-        self.removals = summary[summary == 1].index.tolist()
+        for column in columns:
+            values = self.values.get(column, [])
+            if len(values) > 1:
+                continue
+            # Three values are enough to find two even if one of them is NA
+            chunk = df[column].drop_duplicates().head(3).astype('object')
+            values = pd.concat([pd.Series(values, dtype='object'), chunk]).drop_duplicates()
+            values = values.dropna() if self.naomit else values
+            self.values[column] = values.head(2).tolist()
+
+    def do_finalize(self):
+        self.removals = [column for column, values in self.values.items() if len(values) == 1]
 
     def do_bake(self, df):
         return df.drop(columns=self.removals)
+
+    def compile_inference(self, schema):
+        removals = set(self.removals)
+        return lambda arrays: {c: values for c, values in arrays.items() if c not in removals}
+
+    def output_schema(self, schema):
+        """
+        The columns with zero variance are known only after the preparation
+        """
+        if not self.prepared:
+            return None
+        self.validate(schema)
+        return schema.drop(columns=self.removals)
+
+    def reads(self, schema=None):
+        return self.selected_columns(self.selector, schema)
+
+    def writes(self, schema=None):
+        return self.removals if self.prepared else None
+
+    def is_row_local(self):
+        return True
+
+    def input_columns(self, columns, schema):
+        """
+        Once prepared only the removed columns are read
+        """
+        if not self.prepared:
+            return schema.columns.tolist()
+        return [c for c in schema.columns if c in columns or c in self.removals]
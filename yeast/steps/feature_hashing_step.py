@@ -0,0 +1,169 @@
+import numpy as np
+import pandas as pd
+from pandas import Series
+from pandas.api.types import is_categorical_dtype, is_bool_dtype, is_integer_dtype, is_float_dtype
+from yeast.step import Step
+from yeast.steps.one_hot_encoder_step import sparse_columns
+from yeast.errors import YeastValidationError
+
+
+class FeatureHashingStep(Step):
+    """
+    Encode discrete features with unbounded cardinality (URLs, user agents, IDs, etc.) hashing
+    their values into a fixed number of buckets (the hashing trick). The step does not need
+    preparation and does not keep any state, so its memory does not depend on the number of
+    distinct values and new values are always encoded.
+
+    The values are hashed by `pd.util.hash_array` (SipHash, vectorized), so the same
+    value has the same bucket on every process and every run, and the categorical columns only
+    hash their categories. Different values could be hashed to the same bucket.
+
+    The bucket depends on the value and not on the type of the column: integral numbers and
+    booleans are hashed as 64-bit integers (`1`, `1.0`, `True` and `Int64` 1 share the bucket, so
+    a chunk whose integers are floats because of a missing value is encoded the same way), the
+    rest of the floats as 64-bit floats and any other value by its string form. Object columns of
+    numbers are hashed like numeric columns.
+
+    Parameters:
+
+    - `selector`: List of columns, column name or selector.
+    - `n_buckets`: number of buckets. Default: `1024`
+    - `output`: `codes` (default) to replace the values by the number of their bucket as nullable
+                integers (the smallest type for the number of buckets) or `sparse` to replace each
+                column by `n_buckets` sparse binary columns `<column>_<bucket>`, added at the end of
+                the DataFrame.
+    - `role`: String name of the role to control baking flows on new data. Default: `all`.
+
+    Usage:
+
+    ```python
+    recipe = Recipe([
+        # Bucket of each URL:
+        FeatureHashingStep('url', n_buckets=2 ** 20),
+        # 256 sparse columns for the user agents:
+        FeatureHashingStep('user_agent', n_buckets=256, output='sparse')
+    ])
+    ```
+
+    Notes:
+
+    Missing values are encoded as NA codes or zeros on all the sparse columns.
+
+    Raises:
+
+    - `YeastValidationError`: If the column was not found or the parameters are not valid
+    """
+    inplace = True
+    outputs = ['codes', 'sparse']
+
+    def __init__(self, selector, n_buckets=1024, output='codes', role='all'):
+        self.selector = selector
+        self.n_buckets = n_buckets
+        self.output = output
+        super().__init__(needs_preparation=False, role=role)
+
+    def do_bake(self, df):
+        columns = self.resolve_selector(self.selector, df)
+        if self.output == 'sparse':
+            encoded = [
+                sparse_columns(self.buckets(df[column]), self.names(column), df.index)
+                for column in columns
+            ]
+            return pd.concat([df.drop(columns=columns)] + encoded, axis=1)
+
+        dtype = self.code_dtype()
+        for column in columns:
+            codes = self.buckets(df[column])
+            df[column] = pd.arrays.IntegerArray(codes.astype(dtype.numpy_dtype), codes < 0)
+        return df
+
+    def buckets(self, values):
+        """
+        Bucket of each value of the Series, -1 for missing values
+        """
+        if is_categorical_dtype(values.dtype):
+            # Only the categories are hashed
+            categories = self.buckets(Series(values.cat.categories))
+            codes = values.cat.codes.to_numpy()
+            return np.where(codes >= 0, categories.take(codes), -1)
+        known = values.notna().to_numpy()
+        codes = np.full(known.shape[0], -1, dtype='int64')
+        hashes = hash_values(values[known])
+        codes[known] = (hashes % np.uint64(self.n_buckets)).astype('int64')
+        return codes
+
+    def code_dtype(self):
+        """
+        Smallest nullable integer type for the buckets
+        """
+        for dtype in [pd.Int8Dtype(), pd.Int16Dtype(), pd.Int32Dtype()]:
+            if self.n_buckets - 1 <= np.iinfo(dtype.numpy_dtype).max:
+                return dtype
+        return pd.Int64Dtype()
+
+    def names(self, column):
+        """
+        Names of the sparse columns of the column
+        """
+        return [f'{column}_{bucket}' for bucket in range(self.n_buckets)]
+
+    def reads(self, schema=None):
+        return self.selected_columns(self.selector, schema)
+
+    def writes(self, schema=None):
+        """
+        The encoded columns and the sparse ones
+        """
+        columns = self.selected_columns(self.selector, schema)
+        if columns is None or self.output == 'codes':
+            return columns
+        return columns + [name for column in columns for name in self.names(column)]
+
+    def is_row_local(self):
+        return True
+
+    def is_noop(self):
+        return self.selector == []
+
+    def do_validate(self, df):
+        """
+        - Columns must exist
+        - n_buckets must be a positive integer
+        - output must be `codes` or `sparse`
+        """
+        columns = self.resolve_selector(self.selector, df)
+
+        matches = [c in df.columns for c in columns]
+        if not all(matches):
+            missing_columns = [c for c, v in zip(columns, matches) if not v]
+            raise YeastValidationError(f'The following columns are missing: {missing_columns}')
+
+        if isinstance(self.n_buckets, bool) or not isinstance(self.n_buckets, int) \
+                or self.n_buckets < 1:
+            raise YeastValidationError('n_buckets must be a positive integer')
+        if self.output not in self.outputs:
+            raise YeastValidationError(f'Output "{self.output}" not between: {self.outputs}')
+
+
+def hash_values(values):
+    """
+    Hash of each value of the Series without missing values, normalized by type: integral numbers
+    and booleans as 64-bit integers, the rest of the floats as floats and any other value by its
+    string form
+    """
+    if values.dtype == np.dtype('object'):
+        values = values.infer_objects()
+    dtype = values.dtype
+    # Factorizing the values before hashing them is slower on high cardinality columns
+    if is_bool_dtype(dtype) or is_integer_dtype(dtype):
+        return pd.util.hash_array(values.astype('int64').to_numpy(), categorize=False)
+    if is_float_dtype(dtype):
+        data = values.to_numpy(dtype='float64')
+        hashes = pd.util.hash_array(data, categorize=False)
+        integral = (data == np.floor(data)) & (np.abs(data) < 2 ** 63)
+        if integral.any():
+            hashes[integral] = pd.util.hash_array(data[integral].astype('int64'), categorize=False)
+        return hashes
+    if not isinstance(dtype, np.dtype):
+        values = values.astype('object')
+    return pd.util.hash_array(values.to_numpy(), categorize=False)
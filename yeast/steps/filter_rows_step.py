@@ -1,7 +1,19 @@
+import io
+import re
+import ast
+import operator
+import tokenize
+from functools import reduce
+import numpy as np
+from pandas import Series
+from pandas.api.types import is_bool_dtype
 from yeast.step import Step
 from yeast.errors import YeastValidationError
 
 
+BOOLEAN_OPERATORS = {'&': 'and', '|': 'or'}
+
+
 class FilterRowsStep(Step):
     """
     Step in charge of filtering out rows based on boolean conditions.
@@ -16,6 +28,8 @@ class FilterRowsStep(Step):
 
     - You can refer to column names with spaces or operators by surrounding them in backticks.
     - You can refer to variables in the environment by prefixing them with an ‘@’ like `@a + b`.
+    - The expression is compiled the first time that the step is baked and evaluated directly on the
+      columns. Expressions that call functions or methods are evaluated by `DataFrame.query`.
 
     Parameters:
 
@@ -49,14 +63,178 @@ class FilterRowsStep(Step):
 
     - `YeastValidationError`: if the expression is an empty string.
     """
+    pushdown = True
+
     def __init__(self, expression, role='all', **kwargs):
         self.expression = expression
         self.kwargs = kwargs
         super().__init__(needs_preparation=False, role=role)
 
     def do_bake(self, df):
+        """
+        Evaluate the compiled expression or use `DataFrame.query` if it could not be compiled
+        """
+        evaluate = self.compile()
+        if evaluate is not None:
+            mask = evaluate_mask(evaluate, df)
+            if mask is not None:
+                return df[mask]
         return df.query(expr=self.expression, **self.kwargs)
 
+    def compile_inference(self, schema):
+        evaluate = self.compile()
+        if evaluate is None:
+            return None
+
+        def bake(arrays):
+            mask = evaluate(arrays)
+            if not isinstance(mask, np.ndarray) or mask.dtype != bool:
+                raise TypeError('The expression is not a boolean mask')
+            return {column: values[mask] for column, values in arrays.items()}
+        return bake
+
+    def compile(self):
+        """
+        Compile the expression into a function that receives the DataFrame and returns the boolean
+        mask of the rows to keep. The expression is parsed and the @variables are resolved only
+        once, the function is cached on the step. Returns None if the expression uses functions,
+        methods, other parameters than `local_dict` and `global_dict`, etc. (see `MaskCompiler`)
+        """
+        if getattr(self, '_compiled', (None,))[0] != self.expression:
+            tree, quoted = self.parse()
+            evaluate = None
+            if tree is not None and set(self.kwargs) <= {'local_dict', 'global_dict'}:
+                try:
+                    evaluate = MaskCompiler(quoted, self.kwargs).visit(tree.body)
+                except NotImplementedError:
+                    evaluate = None
+            self._compiled = (self.expression, evaluate)
+        return self._compiled[1]
+
+    def __getstate__(self):
+        """
+        The compiled expression is not pickled, it's compiled again when needed
+        """
+        state = super().__getstate__()
+        state.pop('_compiled', None)
+        state.pop('_parsed', None)
+        return state
+
+    def do_bake_polars(self, df, schema):
+        return df.filter(self.polars_expression())
+
+    def supports_backend(self, name):
+        """
+        The expressions are translated to Polars only if they use the supported operators
+        """
+        if name == 'polars':
+            return self.polars_expression() is not None
+        return super().supports_backend(name)
+
+    def parse(self):
+        """
+        Parse the expression into a python syntax tree or None if it's not valid. The `quoted names`
+        and @variables are replaced by the identifiers `__yeast_quoted_<i>` and
+        `__yeast_variable_<name>` and the `&` and `|` operators by `and` and `or` like pandas does.
+
+        :returns the tree and the list of quoted names
+        """
+        if not isinstance(self.expression, str):
+            return None, []
+        if getattr(self, '_parsed', (None,))[0] == self.expression:
+            return self._parsed[1:]
+        self._parsed = (self.expression, *self.parse_expression(self.expression))
+        return self._parsed[1:]
+
+    @staticmethod
+    def parse_expression(expression):
+        """
+        Parse the expression, see `parse()`
+        """
+        quoted = re.findall(r'`([^`]*)`', expression)
+        for i, column in enumerate(quoted):
+            expression = expression.replace(f'`{column}`', f'__yeast_quoted_{i}')
+        expression = re.sub(r'@(\w+)', r'__yeast_variable_\1', expression)
+        try:
+            tokens = [
+                (tokenize.NAME, BOOLEAN_OPERATORS[value]) if value in BOOLEAN_OPERATORS
+                else (token, value)
+                for token, value, *_ in tokenize.generate_tokens(io.StringIO(expression).readline)
+            ]
+            tree = ast.parse(tokenize.untokenize(tokens).strip(), mode='eval')
+        except (SyntaxError, tokenize.TokenError):
+            return None, quoted
+        return tree, quoted
+
+    def output_schema(self, schema):
+        """
+        Filtering the rows does not change the columns
+        """
+        self.validate(schema)
+        return schema.copy()
+
+    def reads(self, schema=None):
+        """
+        Column names referenced on the expression. Local variables (`@var`) are not columns.
+        """
+        tree, quoted = self.parse()
+        if tree is None:
+            return None
+        functions = [
+            n.func.id for n in ast.walk(tree)
+            if isinstance(n, ast.Call) and isinstance(n.func, ast.Name)
+        ]
+        columns = []
+        for node in ast.walk(tree):
+            if not isinstance(node, ast.Name) or node.id in functions:
+                continue
+            if node.id.startswith('__yeast_variable_'):
+                continue
+            column = node.id
+            if column.startswith('__yeast_quoted_'):
+                column = quoted[int(column[len('__yeast_quoted_'):])]
+            if column not in columns:
+                columns.append(column)
+        return columns
+
+    def polars_expression(self):
+        """
+        Translate the expression into a Polars expression or None if it uses functions, methods or
+        operators that are not supported. Rows where a comparison is null (missing values) are
+        filtered out as pandas does.
+        """
+        tree, quoted = self.parse()
+        if tree is None:
+            return None
+        try:
+            import polars
+        except ImportError:
+            return None
+        try:
+            return PolarsTranslator(polars, quoted, self.kwargs).visit(tree.body)
+        except NotImplementedError:
+            return None
+
+    def writes(self, schema=None):
+        return []
+
+    def is_row_local(self):
+        return True
+
+    def commutes_with(self, step):
+        """
+        A filter could be executed before any row local step that does not modify the filtered
+        columns. Steps that need preparation are never crossed to keep their estimations and
+        steps that reset the index (sorts and joins) are not crossed to keep the output index.
+        """
+        columns = self.reads()
+        if columns is None or step.pushdown or step.needs_preparation or step.resets_index:
+            return False
+        if not step.is_row_local():
+            return False
+        written = step.writes()
+        return written is not None and not set(columns) & set(written)
+
     def do_validate(self, df):
         """
         Validations:
@@ -71,3 +249,237 @@ class FilterStep(FilterRowsStep):
     FilterStep is an Alias for FilterRowsStep
     """
     pass
+
+
+class PolarsTranslator(ast.NodeVisitor):
+    """
+    Translate the syntax tree of a filter expression into a Polars expression. Unsupported nodes
+    raise NotImplementedError.
+    """
+    BINARY = {
+        ast.Add: operator.add, ast.Sub: operator.sub, ast.Mult: operator.mul,
+        ast.Div: operator.truediv, ast.FloorDiv: operator.floordiv, ast.Mod: operator.mod,
+        ast.Pow: operator.pow, ast.BitAnd: operator.and_, ast.BitOr: operator.or_
+    }
+    COMPARE = {
+        ast.Eq: operator.eq, ast.NotEq: operator.ne, ast.Lt: operator.lt, ast.LtE: operator.le,
+        ast.Gt: operator.gt, ast.GtE: operator.ge
+    }
+
+    def __init__(self, pl, quoted, kwargs):
+        self.pl = pl
+        self.quoted = quoted
+        self.variables = {**kwargs.get('global_dict', {}), **kwargs.get('local_dict', {})}
+
+    def generic_visit(self, node):
+        raise NotImplementedError(f'{node.__class__.__name__} is not supported')
+
+    def visit_BoolOp(self, node):
+        combine = operator.and_ if isinstance(node.op, ast.And) else operator.or_
+        return reduce(combine, [self.visit(value) for value in node.values])
+
+    def visit_BinOp(self, node):
+        if type(node.op) not in self.BINARY:
+            return self.generic_visit(node)
+        return self.BINARY[type(node.op)](self.visit(node.left), self.visit(node.right))
+
+    def visit_UnaryOp(self, node):
+        if isinstance(node.op, (ast.Not, ast.Invert)):
+            return ~self.expression(self.visit(node.operand))
+        if isinstance(node.op, ast.USub):
+            return -self.visit(node.operand)
+        return self.generic_visit(node)
+
+    def visit_Compare(self, node):
+        comparisons = []
+        left = node.left
+        for op, right in zip(node.ops, node.comparators):
+            comparisons.append(self.compare(op, left, right))
+            left = right
+        return reduce(operator.and_, comparisons)
+
+    def compare(self, op, left, right):
+        """
+        Missing values are different to everything and not comparable, like in pandas
+        """
+        if isinstance(op, (ast.In, ast.NotIn)):
+            values = self.visit(right)
+            if not isinstance(values, (list, tuple)):
+                raise NotImplementedError('Only constant lists are supported by "in"')
+            contained = self.expression(self.visit(left)).is_in(list(values)).fill_null(False)
+            return ~contained if isinstance(op, ast.NotIn) else contained
+        if type(op) not in self.COMPARE:
+            return self.generic_visit(op)
+        result = self.expression(self.COMPARE[type(op)](self.visit(left), self.visit(right)))
+        return result.fill_null(isinstance(op, ast.NotEq))
+
+    def expression(self, value):
+        return value if isinstance(value, self.pl.Expr) else self.pl.lit(value)
+
+    def visit_Name(self, node):
+        if node.id.startswith('__yeast_quoted_'):
+            return self.pl.col(self.quoted[int(node.id[len('__yeast_quoted_'):])])
+        if node.id.startswith('__yeast_variable_'):
+            name = node.id[len('__yeast_variable_'):]
+            if name not in self.variables:
+                raise NotImplementedError(f'Unknown variable: {name}')
+            return self.variables[name]
+        if node.id in ['True', 'False']:
+            return node.id == 'True'
+        return self.pl.col(node.id)
+
+    def visit_Constant(self, node):
+        return node.value
+
+    def visit_NameConstant(self, node):
+        return node.value
+
+    def visit_Num(self, node):
+        return node.n
+
+    def visit_Str(self, node):
+        return node.s
+
+    def visit_List(self, node):
+        return [self.visit(element) for element in node.elts]
+
+    def visit_Tuple(self, node):
+        return tuple(self.visit(element) for element in node.elts)
+
+
+class MaskCompiler(ast.NodeVisitor):
+    """
+    Compile the syntax tree of a filter expression into a function that receives the DataFrame and
+    returns the boolean mask. Numeric and boolean columns are evaluated as NumPy arrays (no index
+    alignment or copies) and the rest as Series to keep the pandas semantics (strings, categories,
+    dates, nullable types, etc.). Unsupported nodes raise NotImplementedError.
+    """
+    def __init__(self, quoted, kwargs):
+        self.quoted = quoted
+        self.variables = {**kwargs.get('global_dict', {}), **kwargs.get('local_dict', {})}
+
+    def generic_visit(self, node):
+        raise NotImplementedError(f'{node.__class__.__name__} is not supported')
+
+    def visit_BoolOp(self, node):
+        combine = operator.and_ if isinstance(node.op, ast.And) else operator.or_
+        values = [self.visit(value) for value in node.values]
+        return lambda df: reduce(combine, [value(df) for value in values])
+
+    def visit_BinOp(self, node):
+        if type(node.op) not in PolarsTranslator.BINARY:
+            return self.generic_visit(node)
+        function = PolarsTranslator.BINARY[type(node.op)]
+        left, right = self.visit(node.left), self.visit(node.right)
+        return lambda df: function(left(df), right(df))
+
+    def visit_UnaryOp(self, node):
+        operand = self.visit(node.operand)
+        if isinstance(node.op, (ast.Not, ast.Invert)):
+            return lambda df: invert(operand(df))
+        if isinstance(node.op, ast.USub):
+            return lambda df: -operand(df)
+        return self.generic_visit(node)
+
+    def visit_Compare(self, node):
+        comparisons = []
+        left = self.visit(node.left)
+        for op, right in zip(node.ops, node.comparators):
+            right = self.visit(right)
+            comparisons.append(self.compare(op, left, right))
+            left = right
+        if len(comparisons) == 1:
+            return comparisons[0]
+        return lambda df: reduce(operator.and_, [comparison(df) for comparison in comparisons])
+
+    def compare(self, op, left, right):
+        if isinstance(op, (ast.In, ast.NotIn)):
+            negate = isinstance(op, ast.NotIn)
+            return lambda df: contains(left(df), right(df), negate)
+        if type(op) not in PolarsTranslator.COMPARE:
+            return self.generic_visit(op)
+        function = PolarsTranslator.COMPARE[type(op)]
+        return lambda df: function(left(df), right(df))
+
+    def visit_Name(self, node):
+        if node.id.startswith('__yeast_variable_'):
+            name = node.id[len('__yeast_variable_'):]
+            if name not in self.variables:
+                raise NotImplementedError(f'Unknown variable: {name}')
+            return constant(self.variables[name])
+        if node.id.startswith('__yeast_quoted_'):
+            name = self.quoted[int(node.id[len('__yeast_quoted_'):])]
+        else:
+            name = node.id
+        return lambda df: column_values(df, name)
+
+    def visit_Constant(self, node):
+        return constant(node.value)
+
+    def visit_NameConstant(self, node):
+        return constant(node.value)
+
+    def visit_Num(self, node):
+        return constant(node.n)
+
+    def visit_Str(self, node):
+        return constant(node.s)
+
+    def visit_List(self, node):
+        elements = [self.visit(element) for element in node.elts]
+        return lambda df: [element(df) for element in elements]
+
+    def visit_Tuple(self, node):
+        return self.visit_List(node)
+
+
+def constant(value):
+    return lambda df: value
+
+
+def column_values(df, name):
+    """
+    NumPy array of the numeric and boolean columns, Series otherwise. The data could be a dictionary
+    of NumPy arrays (see `Recipe.compile_for_inference`).
+    """
+    series = df[name]
+    if isinstance(series, np.ndarray):
+        return series
+    if isinstance(series.dtype, np.dtype) and series.dtype.kind in 'biuf':
+        return series.to_numpy()
+    return series
+
+
+def invert(values):
+    return not values if isinstance(values, bool) else ~values
+
+
+def contains(values, elements, negate=False):
+    """
+    `values in elements` where elements is a list of constants
+    """
+    if not isinstance(elements, (list, tuple, set)):
+        raise TypeError('Only lists are supported by "in"')
+    if isinstance(values, Series):
+        result = values.isin(list(elements))
+    else:
+        result = np.isin(values, list(elements))
+    return ~result if negate else result
+
+
+def evaluate_mask(evaluate, df):
+    """
+    Evaluate the compiled expression returning a NumPy boolean mask (missing values are False) or
+    None if it fails or the result is not a boolean mask, so pandas could evaluate it instead
+    """
+    try:
+        mask = evaluate(df)
+    except (KeyError, TypeError, ValueError):
+        return None
+    if isinstance(mask, Series):
+        if not is_bool_dtype(mask.dtype):
+            return None
+        mask = mask.to_numpy(dtype='bool', na_value=False)
+    if not isinstance(mask, np.ndarray) or mask.dtype != bool or mask.shape != (df.shape[0],):
+        return None
+    return mask
@@ -0,0 +1,198 @@
+import numpy as np
+import pandas as pd
+from yeast.step import Step
+from yeast.steps.ordinal_encoder_step import get_codes, to_array
+from yeast.errors import YeastValidationError
+
+
+class FrequencyEncoderStep(Step):
+    """
+    Encode categorical/string discrete features as the number of times each category appears on
+    the preparation data (count encoding).
+
+    Parameters:
+
+    - `selector`: List of columns, column name or selector.
+    - `normalize`: if `True` the categories are encoded as the fraction of the non missing values
+                   instead of counts. Default: `False`
+    - `role`: String name of the role to control baking flows on new data. Default: `all`.
+
+    Usage:
+
+    ```python
+    recipe = Recipe([
+        # Encode each city by its number of customers:
+        FrequencyEncoderStep('city')
+    ])
+
+    # Example:
+    # Rank: 'Captain', 'Commander', 'Captain', None, 'Ensign'
+    # Encoded: 2, 1, 2, 0, 1
+
+    # The categories could be counted one chunk at a time:
+    for chunk in pd.read_csv('train.csv', chunksize=100000):
+        recipe.prepare_partial(chunk)
+    recipe.finalize()
+    ```
+
+    Notes:
+
+    The counts are calculated with one `value_counts()` for each column and the values are encoded
+    with a vectorized lookup on the table of counts (`Index.get_indexer` and `take`). Missing
+    values and values not seen while preparing are encoded as `0`. The encoded columns are `int64`
+    or `float64` if `normalize` is `True`.
+
+    Raises:
+
+    - `YeastValidationError`: If the column was not found
+    """
+    inplace = True
+    incremental = True
+
+    def __init__(self, selector, normalize=False, role='all'):
+        self.selector = selector
+        self.normalize = normalize
+        self.counts = {}
+        self.tables = {}
+        super().__init__(needs_preparation=True, role=role)
+
+    def do_prepare(self, df):
+        self.counts = {}
+        self.do_prepare_partial(df)
+        self.do_finalize()
+
+    def do_prepare_partial(self, df):
+        """
+        Count the values of each column on the chunk
+        """
+        columns = self.resolve_selector(self.selector, df)
+        for column in columns:
+            counts = df[column].value_counts(dropna=True)
+            counts = counts[counts > 0]  # Categorical columns count all the categories
+            if column in self.counts:
+                counts = self.counts[column].add(counts, fill_value=0).astype('int64')
+            self.counts[column] = counts
+
+    def do_finalize(self):
+        """
+        Build the table of each column from the counts
+        """
+        for column, counts in self.counts.items():
+            table = counts.astype('int64')
+            if self.normalize:
+                table = table / max(table.sum(), 1)
+            self.tables[column] = table
+
+    def do_bake(self, df):
+        """
+        Replace the values by their counts
+        """
+        columns = self.resolve_selector(self.selector, df)
+        for column in columns:
+            df[column] = lookup(df[column], self.tables[column], self.default())
+        return df
+
+    def default(self):
+        """
+        Encoding of the missing and unknown values
+        """
+        return 0.0 if self.normalize else 0
+
+    def compile_inference(self, schema):
+        """
+        A few values are encoded faster with dictionaries than with the tables
+        """
+        columns = self.resolve_selector(self.selector, schema)
+        return lookup_function({column: self.tables[column] for column in columns}, self.default())
+
+    def reads(self, schema=None):
+        return self.selected_columns(self.selector, schema)
+
+    def writes(self, schema=None):
+        return self.selected_columns(self.selector, schema)
+
+    def is_row_local(self):
+        return True
+
+    def output_schema(self, schema):
+        """
+        The encoded columns are counts or frequencies, so the table is not needed
+        """
+        self.validate(schema)
+        columns = self.resolve_selector(self.selector, schema)
+        dtype = 'float64' if self.normalize else 'int64'
+        # Through objects: strings could not be casted to numbers directly
+        return schema.astype({c: 'object' for c in columns}).astype({c: dtype for c in columns})
+
+    def is_noop(self):
+        return self.selector == []
+
+    def do_validate(self, df):
+        """
+        - Columns must exist
+        """
+        columns = self.resolve_selector(self.selector, df)
+
+        matches = [c in df.columns for c in columns]
+        if not all(matches):
+            missing_columns = [c for c, v in zip(columns, matches) if not v]
+            raise YeastValidationError(f'The following columns are missing: {missing_columns}')
+
+    def __getstate__(self):
+        """
+        The tables are saved as arrays, so large tables are stored as raw buffers by
+        `Recipe.save()`.
+        """
+        state = super().__getstate__()
+        state['counts'] = {column: to_table(counts) for column, counts in self.counts.items()}
+        state['tables'] = {column: to_table(table) for column, table in self.tables.items()}
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.counts = {column: from_table(table) for column, table in self.counts.items()}
+        self.tables = {column: from_table(table) for column, table in self.tables.items()}
+
+
+def lookup(values, table, default):
+    """
+    Vectorized left join of the Series with the `table` (Series indexed by category): return the
+    array with the value of the category of each row or `default` for missing and unknown values
+    """
+    codes = get_codes(values, table.index)
+    # The code -1 takes the default value appended at the end
+    return np.append(table.to_numpy(), default).take(codes)
+
+
+def lookup_function(tables, default):
+    """
+    Inference function that looks up the values of the arrays on the `tables` as dictionaries
+    """
+    mappings = {column: dict(zip(table.index.tolist(), table.tolist()))
+                for column, table in tables.items()}
+
+    def bake(arrays):
+        arrays = dict(arrays)
+        for column, mapping in mappings.items():
+            arrays[column] = np.array(
+                [default if pd.isna(value) else mapping.get(value, default)
+                 for value in arrays[column]],
+                dtype=tables[column].dtype
+            )
+        return arrays
+    return bake
+
+
+def to_table(table):
+    """
+    Convert a table into a tuple of NumPy arrays: (categories, values)
+    """
+    return to_array(table.index.tolist()), table.to_numpy()
+
+
+def from_table(table):
+    """
+    Convert a tuple of NumPy arrays into a table
+    """
+    categories, values = table
+    return pd.Series(values, index=pd.Index(categories))
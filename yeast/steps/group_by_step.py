@@ -40,15 +40,19 @@ class GroupByStep(Step):
         super().__init__(needs_preparation=False, role=role)
 
     def do_bake(self, df):
-        return df.groupby(self.selector, sort=True)
+        return df.groupby(self.resolve_selector(self.selector, df), sort=True)
+
+    def input_columns(self, columns, schema):
+        keys = self.resolve_selector(self.selector, schema)
+        return [c for c in schema.columns if c in keys or c in columns]
 
     def do_validate(self, df):
         """
         - Check if the df contains all listed columns
         """
-        self.selector = self.resolve_selector(self.selector, df)
+        columns = self.resolve_selector(self.selector, df)
 
-        matches = [c in df.columns for c in self.selector]
+        matches = [c in df.columns for c in columns]
         if not all(matches):
-            missing_columns = [c for c, v in zip(self.selector, matches) if not v]
+            missing_columns = [c for c, v in zip(columns, matches) if not v]
             raise YeastValidationError(f'The following columns are missing: {missing_columns}')
@@ -0,0 +1,114 @@
+from yeast.step import Step
+from yeast.backends import fill_na_polars
+from yeast.inference import fill_na_arrays
+from yeast.errors import YeastValidationError, YeastPreparationError
+
+
+class ImputeStep(Step):
+    """
+    Impute the missing values of the selected columns with one value for each column
+
+    Base step of the imputations: the childs only calculate the values to impute with
+    `fill_values()` and the columns are imputed in one pass. The columns without missing values
+    are found with one `isna()` over the selected columns and they are not modified, the rest are
+    imputed in place by a single `fillna()`.
+
+    Parameters:
+
+    - `selector`: string list of column names or a selector to impute
+    - `needs_preparation`: True if the values are calculated while preparing
+    - `role`: String name of the role to control baking flows on new data. Default: `all`.
+
+    Raises:
+
+    - `YeastValidationError`: if a column does not exist
+    """
+    inplace = True
+
+    def __init__(self, selector, needs_preparation=True, role='all'):
+        self.selector = selector
+        super().__init__(needs_preparation=needs_preparation, role=role)
+
+    def fill_values(self, columns):
+        """
+        Return the values to impute the `columns` as `{'column_name': value, ...}`. Let subclasses
+        override this operation
+        """
+        return {}
+
+    def do_bake(self, df):
+        """
+        Replace all NA values with the values of each column
+        """
+        columns = self.resolve_selector(self.selector, df)
+        return fill_na(df, self.fill_values(columns))
+
+    def compile_inference(self, schema):
+        columns = self.resolve_selector(self.selector, schema)
+        values = self.fill_values(columns)
+        return lambda arrays: fill_na_arrays(arrays, values)
+
+    def do_bake_polars(self, df, schema):
+        columns = self.resolve_selector(self.selector, schema)
+        return fill_na_polars(df, self.fill_values(columns))
+
+    def reads(self, schema=None):
+        return self.selected_columns(self.selector, schema)
+
+    def writes(self, schema=None):
+        return self.selected_columns(self.selector, schema)
+
+    def is_row_local(self):
+        return True
+
+    def output_schema(self, schema):
+        """
+        The imputation does not change the columns, so the values are not needed
+        """
+        self.validate(schema)
+        return schema.copy()
+
+    def is_noop(self):
+        return self.selector == []
+
+    def do_validate(self, df):
+        """
+        - All columns on the mapping must exist on the df
+        """
+        columns = self.resolve_selector(self.selector, df)
+
+        matches = [c in df.columns for c in columns]
+        if not all(matches):
+            missing_columns = [c for c, v in zip(columns, matches) if not v]
+            raise YeastValidationError(f'The following columns are missing: {missing_columns}')
+
+
+def fill_na(df, values):
+    """
+    Replace the missing values of the DataFrame in place using the `values` dictionary as
+    `{'column_name': value, ...}`. Only the columns with missing values are imputed.
+    """
+    if len(values) == 0:
+        return df
+    missing = df[list(values)].isna().any()
+    values = {column: values[column] for column in missing.index[missing.to_numpy()]}
+    if values:
+        df.fillna(values, inplace=True)
+    return df
+
+
+def column_statistics(df, columns, statistic, **kwargs):
+    """
+    Calculate the `statistic` (`mean`, `median`, `count`, etc.) of all the columns with one call
+    over the DataFrame and return it as `{'column_name': value, ...}`. The `kwargs` are passed to
+    the statistic (like `numeric_only=True`). The columns whose statistic could not be calculated
+    are dropped by pandas, so they raise an error.
+    """
+    try:
+        result = getattr(df[columns], statistic)(**kwargs)
+    except (TypeError, ValueError) as ex:
+        raise YeastPreparationError(f'Error calculating the {statistic} on: {columns}') from ex
+    for column in columns:
+        if column not in result.index:
+            raise YeastPreparationError(f'Error calculating the {statistic} on: {column}')
+    return result.to_dict()
@@ -1,7 +1,7 @@
 from pandas.core.frame import DataFrame
 from yeast import Recipe
 from yeast.step import Step
-from yeast.errors import YeastValidationError
+from yeast.errors import YeastValidationError, YeastRecipeError
 
 
 class JoinStep(Step):
@@ -53,23 +53,85 @@ class JoinStep(Step):
     - `YeastValidationError`: if any of the validations is not correct.
     """
     how_types = ['left', 'right', 'inner', 'full', 'outer']
+    # pandas merges return a new index
+    resets_index = True
 
     def __init__(self, y, how="left", by=None, df=None, role='all'):
         self.y = y
         self.how = 'outer' if how == 'full' else how
         self.by = by if not by else by if type(by) in [list, tuple] else [by]
         self.df = df
+        # DataFrame baked by the Recipe `y`, it's baked only once
+        self._baked_y = None
         super().__init__(needs_preparation=False, role=role)
 
     def do_prepare(self, left):
         # Prepare the Recipe before Merges
         if isinstance(self.y, Recipe):
             self.y = self.y.prepare(self.df)
+            self._baked_y = None
+
+    def do_prepare_partial(self, left):
+        # The Recipe is prepared only once with its own df before the first chunk is merged
+        if isinstance(self.y, Recipe) and not self.y.is_prepared():
+            self.y = self.y.prepare(self.df)
+            self._baked_y = None
 
     def do_bake(self, left):
+        return left.merge(self.right(), how=self.how, on=self.by, suffixes=['_x', '_y'])
+
+    def right(self):
+        """
+        The DataFrame to join with: `y` or the DataFrame baked by the Recipe `y`. The Recipe is
+        kept, so the parameters of the step do not change while baking.
+        """
+        if not isinstance(self.y, Recipe):
+            return self.y
+        if self._baked_y is None:
+            self._baked_y = self.y.bake(self.df)
+        return self._baked_y
+
+    def reads(self, schema=None):
+        return list(self.by) if self.by else None
+
+    def writes(self, schema=None):
+        """
+        Columns added from `y`, including the ones renamed with suffixes on both sides
+        """
+        if not self.by or not isinstance(self.y, DataFrame):
+            return None
+        return [c for c in self.y.columns if c not in self.by]
+
+    def output_schema(self, schema):
+        """
+        Merge with the schema of `y`. If `y` is a Recipe its schema is inferred from `df`
+        """
         if isinstance(self.y, Recipe):
-            self.y = self.y.bake(self.df)
-        return left.merge(self.y, how=self.how, on=self.by, suffixes=['_x', '_y'])
+            try:
+                y = None if self.df is None else self.y.output_schema(self.df)
+            except YeastRecipeError:
+                y = None
+        else:
+            y = self.y.iloc[0:0] if isinstance(self.y, DataFrame) else None
+        if not isinstance(y, DataFrame):
+            return None
+        self.validate(schema)
+        return schema.merge(y, how=self.how, on=self.by, suffixes=['_x', '_y'])
+
+    def input_columns(self, columns, schema):
+        """
+        The keys and all the columns from `x` that are required, maybe with a suffix
+        """
+        if not isinstance(self.y, DataFrame):
+            return schema.columns.tolist()
+        by = self.by if self.by else [c for c in schema.columns if c in self.y.columns]
+        return [c for c in schema.columns if c in by or c in columns or f'{c}_x' in columns]
+
+    def is_row_local(self):
+        """
+        Left and inner joins with a DataFrame process each row of `x` independently
+        """
+        return self.how in ['left', 'inner'] and isinstance(self.y, DataFrame)
 
     def do_validate(self, x):
         """
@@ -106,3 +168,15 @@ class JoinStep(Step):
         # self.df is only supported if right is a Recipe
         if self.df is not None and not isinstance(self.y, Recipe):
             raise YeastValidationError(f"'df' parameter is only supported if right is a Recipe")
+
+    def __getstate__(self):
+        """
+        The DataFrame baked by the Recipe `y` is not pickled, it's baked again when needed
+        """
+        state = super().__getstate__()
+        state.pop('_baked_y', None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._baked_y = None
@@ -1,13 +1,13 @@
-from yeast.step import Step
-from yeast.errors import YeastValidationError, YeastPreparationError
+from yeast.steps.impute_step import ImputeStep, column_statistics
 
 
-class MeanImputeStep(Step):
+class MeanImputeStep(ImputeStep):
     """
     Impute numeric data using the mean
 
     MeanImputeStep estimates the variable mean from the prepare data then replace the NA values
-    on new data sets using the calculated mean values.
+    on new data sets using the calculated mean values. The means of all the columns are calculated
+    with one call over the DataFrame.
 
     Parameters:
 
@@ -27,44 +27,46 @@ class MeanImputeStep(Step):
 
     # You can also use selectors:
     MeanImputeStep(AllNumeric())
+
+    # The means could be calculated one chunk at a time:
+    for chunk in pd.read_csv('train.csv', chunksize=100000):
+        recipe.prepare_partial(chunk)
+    recipe.finalize()
     ```
 
     Raises:
 
     - `YeastValidationError`: if a column does not exist
     """
+    incremental = True
+
     def __init__(self, selector, role='all'):
-        self.selector = selector
+        super().__init__(selector, needs_preparation=True, role=role)
         self.means = {}
-        super().__init__(needs_preparation=True, role=role)
+        self.counts = {}
 
     def do_prepare(self, df):
         """
         Calculate the column means on the prepare dataset
         """
-        columns = self.resolve_selector(self.selector, df)
-        for column in columns:
-            try:
-                self.means[column] = df[column].mean(skipna=True)
-            except TypeError as ex:
-                raise YeastPreparationError(f'Error calculating the mean on: {column}') from ex
+        self.means, self.counts = {}, {}
+        self.do_prepare_partial(df)
 
-    def do_bake(self, df):
+    def do_prepare_partial(self, df):
         """
-        Replace all NA values with the calculated means
+        Update the running means with the mean and the number of values of the chunk
         """
         columns = self.resolve_selector(self.selector, df)
+        means = column_statistics(df, columns, 'mean', numeric_only=True)
+        counts = column_statistics(df, columns, 'count')
         for column in columns:
-            df[column] = df[column].fillna(self.means[column])
-        return df
-
-    def do_validate(self, df):
-        """
-        - All columns on the mapping must exist on the df
-        """
-        columns = self.resolve_selector(self.selector, df)
+            mean, count = means[column], counts[column]
+            total = self.counts.get(column, 0) + count
+            if column not in self.means or self.counts[column] == 0:
+                self.means[column] = mean
+            elif count > 0:
+                self.means[column] += (mean - self.means[column]) * count / total
+            self.counts[column] = total
 
-        matches = [c in df.columns for c in columns]
-        if not all(matches):
-            missing_columns = [c for c, v in zip(columns, matches) if not v]
-            raise YeastValidationError(f'The following columns are missing: {missing_columns}')
+    def fill_values(self, columns):
+        return {column: self.means[column] for column in columns}
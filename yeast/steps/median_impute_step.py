@@ -1,8 +1,10 @@
-from yeast.step import Step
+import numbers
+from yeast.sketches import TDigest
+from yeast.steps.impute_step import ImputeStep, column_statistics
 from yeast.errors import YeastValidationError, YeastPreparationError
 
 
-class MedianImputeStep(Step):
+class MedianImputeStep(ImputeStep):
     """
     Impute numeric data using the median
 
@@ -12,6 +14,11 @@ class MedianImputeStep(Step):
     Parameters:
 
     - `selector`: string list of column names or a selector to impute
+    - `approx`: if `True` the medians are always estimated with a `TDigest` sketch, also by
+                `prepare()`, so the columns are never sorted. Default: `False`
+    - `compression`: accuracy of the sketches: they keep about `compression / 2` centroids for
+                     each column and the error on the ranks is inversely proportional to it, about
+                     0.1% of the rows for the median with the default. Default: `100`
     - `role`: String name of the role to control baking flows on new data. Default: `all`.
 
     Usage:
@@ -27,43 +34,95 @@ class MedianImputeStep(Step):
 
     # You can also use selectors:
     MedianImputeStep(AllNumeric())
+
+    # The medians could be estimated one chunk at a time using a mergeable sketch (TDigest):
+    for chunk in pd.read_csv('train.csv', chunksize=100000):
+        recipe.prepare_partial(chunk)
+    recipe.finalize()
+
+    # Approximated medians on a huge training set:
+    MedianImputeStep(AllNumeric(), approx=True, compression=200)
+
+    # The chunks could be prepared by several workers and their sketches merged:
+    steps = pool.map(prepare_chunks, partitions)  # MedianImputeStep.prepare_partial(chunk), ...
+    step = steps[0]
+    for other in steps[1:]:
+        step.merge_sketches(other)
+    step.finalize()
     ```
 
+    Notes:
+
+    `prepare()` calculates the exact medians with one call over the DataFrame, unless `approx` is
+    `True`. `prepare_partial()` and `finalize()` estimate the medians with a `TDigest` sketch: they
+    are exact on small datasets and approximated otherwise. The sketches are kept by the step, so
+    they are saved with the recipe and a step prepared by chunks (or by `prepare()` with `approx`)
+    could be refreshed with new chunks. The exact `prepare()` does not keep any sketch, so a
+    refresh after it only uses the new chunks.
+
     Raises:
 
     - `YeastValidationError`: if a column does not exist
     """
-    def __init__(self, selector, role='all'):
-        self.selector = selector
+    incremental = True
+
+    def __init__(self, selector, approx=False, compression=100, role='all'):
+        super().__init__(selector, needs_preparation=True, role=role)
+        self.approx = approx
+        self.compression = compression
         self.medians = {}
-        super().__init__(needs_preparation=True, role=role)
+        self.digests = {}
 
     def do_prepare(self, df):
         """
-        Calculate the column medians on the prepare dataset
+        Calculate the column medians on the prepare dataset. The sketches are only calculated if
+        `approx` is True, the exact medians do not scan the columns twice.
+        """
+        self.digests = {}
+        if self.approx:
+            self.do_prepare_partial(df)
+            self.do_finalize()
+            return
+        columns = self.resolve_selector(self.selector, df)
+        self.medians = column_statistics(df, columns, 'median', numeric_only=True)
+
+    def do_prepare_partial(self, df):
+        """
+        Add the values of the chunk to the sketch of each column
         """
         columns = self.resolve_selector(self.selector, df)
         for column in columns:
             try:
-                self.medians[column] = df[column].median(skipna=True)
-            except TypeError as ex:
+                values = df[column].dropna().to_numpy(dtype='float64')
+            except (TypeError, ValueError) as ex:
                 raise YeastPreparationError(f'Error calculating the median on: {column}') from ex
+            self.digests.setdefault(column, TDigest(self.compression)).update(values)
 
-    def do_bake(self, df):
+    def do_finalize(self):
         """
-        Replace all NA values with the calculated medians
+        Estimate the medians from the sketches
         """
-        columns = self.resolve_selector(self.selector, df)
-        for column in columns:
-            df[column] = df[column].fillna(self.medians[column])
-        return df
+        self.medians = {column: digest.median() for column, digest in self.digests.items()}
+
+    def merge_sketches(self, step):
+        """
+        Fold the sketches of other `MedianImputeStep` prepared on other chunks, for example by
+        another worker. The medians are estimated by `finalize()`.
+        """
+        for column, digest in step.digests.items():
+            self.digests.setdefault(column, TDigest(self.compression)).merge(digest)
+        return self
+
+    def fill_values(self, columns):
+        return {column: self.medians[column] for column in columns}
 
     def do_validate(self, df):
         """
         - All columns on the mapping must exist on the df
+        - compression must be a positive number
         """
-        columns = self.resolve_selector(self.selector, df)
-        matches = [c in df.columns for c in columns]
-        if not all(matches):
-            missing_columns = [c for c, v in zip(columns, matches) if not v]
-            raise YeastValidationError(f'The following columns are missing: {missing_columns}')
+        super().do_validate(df)
+        compression = self.compression
+        if isinstance(compression, bool) or not isinstance(compression, numbers.Real) \
+                or compression <= 0:
+            raise YeastValidationError('compression must be a positive number')
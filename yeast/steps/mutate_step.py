@@ -1,4 +1,7 @@
 from types import LambdaType
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
+from pandas.core.frame import DataFrame
 from pandas.core.groupby.generic import DataFrameGroupBy
 from yeast.step import Step
 from yeast.errors import YeastBakeError, YeastValidationError
@@ -17,6 +20,9 @@ class MutateStep(Step):
                       transformers. E.g: `{ column_name: Transformer }`.
                       It also support lambda functions. E.g: `{var : lambda df: df}` and a
                       list of transforers (lambda or Transformer: `{var: [tx1, tx2, ...]}`
+    - `n_jobs`: number of threads used to execute the transformers. Default: `1`.
+                Transformers that don't read the output of each other are executed at the same
+                time, most of the string and numeric operations release the GIL.
     - `role`: String name of the role to control baking flows on new data. Default: `all`.
 
     Usage:
@@ -63,8 +69,8 @@ class MutateStep(Step):
         GroupByStep('client_id'),
         MutateStep({
             "row_number": RowNumber(),
-            "lag_sales": NumericLag('sales'),
-            "lead_sales": NumericLead('sales')
+            "lag_sales": Lag('sales', order_by='date'),
+            "lead_sales": Lead('sales', order_by='date')
         })
     ])
 
@@ -77,51 +83,179 @@ class MutateStep(Step):
             'mean_sales': new_variable,
         })
     ])
+
+    # Execute independent transformers on 4 threads. `name_title` reads the output of `name`
+    # so it is executed after it:
+    Recipe([
+        MutateStep({
+            'name': StrTrim(),
+            'uid': StrToUpper(),
+            'year': DateYear('created_at'),
+            'name_title': StrToTitle('name')
+        }, n_jobs=4)
+    ])
     ```
 
+    Notes:
+
+    After a `GroupByStep` the result is still grouped by the same columns, so other steps (like
+    `SummarizeStep`) could be executed by group. Steps that don't work on groups (like
+    `SortRowsStep`) ungroup the data automatically.
+
+    The transformers are executed in waves: a wave ends when a transformer reads the output of
+    a transformer from the same wave. All the columns of a wave are added to the DataFrame at
+    once. Lambda functions and lists of transformers could read any column, so they are executed
+    alone.
+
     Raises:
 
     - `YeastBakeError`: If there was an error executing any transformer
     - `YeastValidationError`: xxx
     """
-    def __init__(self, transformers, role='all'):
+    inplace = True
+    supports_groups = True
+
+    def __init__(self, transformers, n_jobs=1, role='all'):
         self.transformers = transformers
+        self.n_jobs = n_jobs
         super().__init__(needs_preparation=False, role=role)
 
     def do_bake(self, df):
-        for column, transformers in self.transformers.items():
-            transformers = transformers if type(transformers) in [list, tuple] else [transformers]
-            for transformer in transformers:
-                df = self.assign_transformer(df, column, transformer)
+        frame = df.obj if isinstance(df, DataFrameGroupBy) else df
+        for wave in self.waves(self.group_keys(df)):
+            transformers = self.transformers[wave[0]]
+            if type(transformers) in [list, tuple]:
+                for transformer in transformers:
+                    values = {wave[0]: self.execute(df, wave[0], transformer)}
+                    frame = self.assign_columns(frame, values)
+                    df = self.regroup(frame, df)
+            else:
+                frame = self.assign_columns(frame, self.execute_wave(df, wave))
+                df = self.regroup(frame, df)
         return df
 
-    def assign_transformer(self, df, column, transformer):
+    def waves(self, keys=None):
+        """
+        Split the output columns into waves of transformers that could be executed at the same
+        time because none of them reads the output of other transformer of the wave. The
+        transformers that depend on other rows also read the group `keys`.
+        """
+        waves, written, alone = [], set(), False
+        for column, transformers in self.transformers.items():
+            if isinstance(transformers, Transformer):
+                reads = set(transformers.reads(column))
+                if not transformers.row_wise:
+                    reads.update(keys or [])
+            else:
+                reads = None  # Lambda functions and lists of transformers could read anything
+            if not waves or alone or reads is None or reads & written:
+                waves.append([])
+                written = set()
+            waves[-1].append(column)
+            written.add(column)
+            alone = reads is None
+        return waves
+
+    def execute_wave(self, df, columns):
+        """
+        Execute the transformers of the columns on the DataFrame, on a pool of threads if required
+        """
+        def execute(column):
+            return self.execute(df, column, self.transformers[column])
+
+        if self.n_jobs == 1 or len(columns) == 1:
+            return {column: execute(column) for column in columns}
+        with ThreadPoolExecutor(max_workers=self.n_jobs) as executor:
+            return dict(zip(columns, executor.map(execute, columns)))
+
+    def execute(self, df, column, transformer):
         """
-        Create or update a column using a lambda function
+        Execute a transformer or a lambda function. Groups are only used by the transformers that
+        depend on other rows (like ranks), they are executed on all the groups at once by the
+        vectorized group operations of Pandas instead of applying them on each group.
         """
         try:
-            # Set the column name if empty, using the destination column
+            # The destination column is used if the transformer does not define a column
             if isinstance(transformer, Transformer):
-                transformer.set_column_if_required(column)
-            # Split between groups and dataframes
-            if isinstance(df, DataFrameGroupBy):
-                df = df.apply(self.add_column, column=column, values=transformer(df))
-            else:
-                df[column] = transformer(df)
-            return df
+                if transformer.row_wise and isinstance(df, DataFrameGroupBy):
+                    df = df.obj
+                return transformer(df, column)
+            return transformer(df)
         except KeyError as ex:
             raise YeastBakeError(
                 f'There was an error executing the transformer: {transformer} on {column}'
             ) from ex
 
     @staticmethod
-    def add_column(df, column, values):
+    def assign_columns(df, values):
+        """
+        Update the existing columns and add all the new ones at once
+        """
+        new_columns = {}
+        for column, value in values.items():
+            if column in df.columns:
+                df[column] = value
+            elif isinstance(value, pd.Series) and value.index.equals(df.index):
+                new_columns[column] = value.array
+            else:
+                new_columns[column] = value
+        if len(new_columns) == 1:
+            column, value = next(iter(new_columns.items()))
+            df[column] = value
+        elif new_columns:
+            new_df = DataFrame(new_columns, index=df.index)
+            df = pd.concat([df, new_df], axis=1, copy=False)
+        return df
+
+    @staticmethod
+    def group_keys(df):
+        """
+        Column names of the group keys or an empty list if the data is not grouped
+        """
+        if not isinstance(df, DataFrameGroupBy):
+            return []
+        return [df.keys] if isinstance(df.keys, str) else list(df.keys)
+
+    @staticmethod
+    def regroup(df, groups):
         """
-        Static methof to add a column using apply. Usually for Groups:
+        Group the DataFrame using the same keys of `groups` (if it is grouped), so the following
+        transformers and steps see the new columns by group
         """
-        df[column] = values
+        if isinstance(groups, DataFrameGroupBy):
+            return df.groupby(groups.keys, sort=groups.sort)
         return df
 
+    def reads(self, schema=None):
+        """
+        Columns read by the transformers, including the columns to order the windows and the
+        group keys of the transformers that depend on other rows. Lambda functions could read
+        anything.
+        """
+        columns = []
+        for column, transformers in self.transformers.items():
+            transformers = transformers if type(transformers) in [list, tuple] else [transformers]
+            for transformer in transformers:
+                if not isinstance(transformer, Transformer):
+                    return None
+                columns.extend(transformer.reads(column))
+                if not transformer.row_wise:
+                    columns.extend(self.group_keys(schema))
+        return list(dict.fromkeys(columns))
+
+    def writes(self, schema=None):
+        return list(self.transformers.keys())
+
+    def is_row_local(self):
+        for transformers in self.transformers.values():
+            transformers = transformers if type(transformers) in [list, tuple] else [transformers]
+            if not all(isinstance(t, Transformer) and t.row_wise for t in transformers):
+                return False
+        return True
+
+    def is_noop(self):
+        return not self.transformers
+
     def do_validate(self, df):
         """
         - All keys should be valid column names
@@ -0,0 +1,203 @@
+import numbers
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+try:
+    from pandas._libs.sparse import IntIndex
+except ImportError:
+    IntIndex = None
+from yeast.step import Step
+from yeast.steps.ordinal_encoder_step import get_codes, sorted_index
+from yeast.errors import YeastValidationError
+
+
+class OneHotEncoderStep(Step):
+    """
+    Encode categorical/string discrete features as one binary column for each category
+    (dummy variables). The original columns are replaced by the columns `<column>_<category>`
+    added at the end of the DataFrame.
+
+    Parameters:
+
+    - `selector`: List of columns, column name or selector.
+    - `top_k`: keep only the `top_k` most frequent categories of each column. Default: `None` (all)
+    - `min_frequency`: keep only the categories that appear at least `min_frequency` times or, if
+                       it's a float between 0 and 1, on that fraction of the non missing values.
+                       Default: `None` (all)
+    - `sparse`: if `True` (default) the new columns are sparse (`pd.SparseDtype('uint8', 0)`), so
+                the memory depends on the number of ones and not on rows x categories. If `False`
+                the new columns are `uint8`.
+    - `role`: String name of the role to control baking flows on new data. Default: `all`.
+
+    Usage:
+
+    ```python
+    recipe = Recipe([
+        # One column for each of the 100 most frequent cities:
+        OneHotEncoderStep('city', top_k=100)
+    ])
+
+    # Example:
+    # Gender: 'Male', 'Female', 'Male', None
+    # gender_Female: 0, 1, 0, 0
+    # gender_Male: 1, 0, 1, 0
+
+    # If all the columns are sparse, they could be converted into a SciPy matrix (requires scipy):
+    matrix = recipe.bake(df).sparse.to_coo().tocsr()
+
+    # The categories could be counted one chunk at a time:
+    for chunk in pd.read_csv('train.csv', chunksize=100000):
+        recipe.prepare_partial(chunk)
+    recipe.finalize()
+    ```
+
+    Notes:
+
+    Missing values, values not seen while preparing and the categories removed by `top_k` or
+    `min_frequency` are encoded as zeros on all the columns.
+
+    Raises:
+
+    - `YeastValidationError`: If the column was not found or the parameters are not valid
+    """
+    incremental = True
+
+    def __init__(self, selector, top_k=None, min_frequency=None, sparse=True, role='all'):
+        self.selector = selector
+        self.top_k = top_k
+        self.min_frequency = min_frequency
+        self.sparse = sparse
+        self.indexes = {}
+        self.counts = {}
+        super().__init__(needs_preparation=True, role=role)
+
+    def do_prepare(self, df):
+        self.counts = {}
+        self.do_prepare_partial(df)
+        self.do_finalize()
+
+    def do_prepare_partial(self, df):
+        """
+        Count the values of each column on the chunk
+        """
+        columns = self.resolve_selector(self.selector, df)
+        for column in columns:
+            counts = df[column].value_counts(dropna=True)
+            counts = counts[counts > 0]  # Categorical columns count all the categories
+            if column in self.counts:
+                counts = self.counts[column].add(counts, fill_value=0).astype('int64')
+            self.counts[column] = counts
+
+    def do_finalize(self):
+        """
+        Select the categories by frequency and sort them
+        """
+        for column, counts in self.counts.items():
+            if self.min_frequency is not None:
+                minimum = self.min_frequency
+                if isinstance(minimum, float) and minimum < 1:
+                    minimum = minimum * counts.sum()
+                counts = counts[counts >= minimum]
+            if self.top_k is not None and counts.shape[0] > self.top_k:
+                # Ties are resolved by the sorted order of the categories
+                counts = counts.reindex(sorted_index(counts.index))
+                counts = counts.sort_values(ascending=False, kind='mergesort')
+                counts = counts.head(self.top_k)
+            self.indexes[column] = sorted_index(counts.index)
+
+    def do_bake(self, df):
+        columns = self.resolve_selector(self.selector, df)
+        encoded = [self.encode(df[column], column) for column in columns]
+        return pd.concat([df.drop(columns=columns)] + encoded, axis=1)
+
+    def encode(self, values, column):
+        """
+        Return the DataFrame with the binary columns of the categories of the column
+        """
+        index = self.indexes[column]
+        names = self.names(column)
+        codes = get_codes(values, index)
+        if not self.sparse:
+            dense = np.zeros((codes.shape[0], len(index)), dtype='uint8')
+            rows = np.flatnonzero(codes >= 0)
+            dense[rows, codes[rows]] = 1
+            return DataFrame(dense, columns=names, index=values.index)
+        return sparse_columns(codes, names, values.index)
+
+    def names(self, column):
+        """
+        Names of the binary columns of the column
+        """
+        return [f'{column}_{category}' for category in self.indexes[column].tolist()]
+
+    def reads(self, schema=None):
+        return self.selected_columns(self.selector, schema)
+
+    def writes(self, schema=None):
+        """
+        The encoded columns and the new ones
+        """
+        columns = self.selected_columns(self.selector, schema)
+        if columns is None or not self.prepared:
+            return None
+        return columns + [name for column in columns for name in self.names(column)]
+
+    def is_row_local(self):
+        return True
+
+    def is_noop(self):
+        return self.selector == []
+
+    def do_validate(self, df):
+        """
+        - Columns must exist
+        - top_k must be a positive integer or None
+        - min_frequency must be a positive number or None
+        """
+        columns = self.resolve_selector(self.selector, df)
+
+        matches = [c in df.columns for c in columns]
+        if not all(matches):
+            missing_columns = [c for c, v in zip(columns, matches) if not v]
+            raise YeastValidationError(f'The following columns are missing: {missing_columns}')
+
+        if self.top_k is not None and (not isinstance(self.top_k, int) or self.top_k < 1):
+            raise YeastValidationError('top_k must be a positive integer')
+        minimum = self.min_frequency
+        if minimum is not None and (not isinstance(minimum, numbers.Real) or minimum <= 0):
+            raise YeastValidationError('min_frequency must be a positive number')
+
+
+def sparse_columns(codes, names, index):
+    """
+    Return a DataFrame with one sparse binary column for each name: the column `i` is 1 on the rows
+    with code `i`. The rows of each code are contiguous once sorted by code, so each sparse column
+    is built directly from its row positions and the memory and time depend on the number of ones,
+    not on rows x categories.
+    """
+    order = np.argsort(codes, kind='stable').astype('int32')
+    bounds = np.searchsorted(codes[order], np.arange(len(names) + 1))
+    dtype = pd.SparseDtype('uint8', 0)
+    data = {}
+    for name, start, end in zip(names, bounds[:-1], bounds[1:]):
+        data[name] = sparse_array(codes.shape[0], order[start:end], dtype)
+    # Without `columns`: selecting them from the dict densifies the columns on newer pandas
+    return DataFrame(data, index=index)
+
+
+def sparse_array(length, rows, dtype):
+    """
+    Sparse binary array of the `length` with ones on the sorted `rows`. Pandas has no public
+    constructor from the positions, so the sparse index is built directly if it's available or
+    from a dense array otherwise.
+    """
+    if IntIndex is None:
+        dense = np.zeros(length, dtype='uint8')
+        dense[rows] = 1
+        return pd.arrays.SparseArray(dense, fill_value=0, dtype=dtype)
+    return pd.arrays.SparseArray(
+        np.ones(rows.shape[0], dtype='uint8'),
+        sparse_index=IntIndex(length, rows),
+        fill_value=0,
+        dtype=dtype
+    )
@@ -1,4 +1,6 @@
+import numpy as np
 import pandas as pd
+from pandas.api.types import is_categorical_dtype
 from yeast.step import Step
 from yeast.errors import YeastValidationError
 
@@ -10,6 +12,8 @@ class OrdinalEncoderStep(Step):
     Parameters:
 
     - `selector`: List of columns, column name or selector.
+    - `unknown_value`: integer code of the values not found while preparing or `None` to encode
+                       them as NA. Default: `None`.
     - `role`: String name of the role to control baking flows on new data. Default: `all`.
 
     Usage:
@@ -28,30 +32,67 @@ class OrdinalEncoderStep(Step):
 
     # Example:
     # Gender: 'Male', 'Female', 'Male', None, 'Male', 'Female'
-    # Encoded: 0, 1, 0, NA, 0, 1
+    # Encoded: 1, 0, 1, NA, 1, 0
+
+    # Encode the values not seen while preparing as -1:
+    OrdinalEncoderStep('gender', unknown_value=-1)
+
+    # The categories could be collected one chunk at a time:
+    for chunk in pd.read_csv('train.csv', chunksize=100000):
+        recipe.prepare_partial(chunk)
+    recipe.finalize()
     ```
 
+    Notes:
+
+    The categories are sorted before the encoding, so new categories found while refreshing a
+    prepared step with more chunks could change the ordinal of the existing ones.
+
+    The prepared categories of each column are stored as a sorted `pd.Index` and the values are
+    encoded with `Index.get_indexer` in one vectorized pass (categorical columns only look up
+    their categories). The encoded columns are nullable integers of the smallest type for the
+    number of categories: `Int8`, `Int16`, `Int32` or `Int64`.
+
     Raises:
 
-    - `YeastValidationError`: If the column was not found
+    - `YeastValidationError`: If the column was not found or the unknown value is not an integer
     """
-    def __init__(self, selector, role='all'):
+    inplace = True
+    incremental = True
+
+    def __init__(self, selector, unknown_value=None, role='all'):
         self.selector = selector
-        self.mappings = {}
+        self.unknown_value = unknown_value
+        self.indexes = {}
+        self.categories = {}
         super().__init__(needs_preparation=True, role=role)
 
     def do_prepare(self, df):
         """
-        Map each unique value in the column into a integer.
-        NA and None values are ignored and remain the same.
+        Sort the unique values of each column. NA and None values are ignored and remain the same.
+        """
+        columns = self.resolve_selector(self.selector, df)
+        self.categories = {}
+        self.indexes = {column: sorted_index(df[column].dropna().unique()) for column in columns}
+
+    def do_prepare_partial(self, df):
+        """
+        Collect the unique values of the chunk, starting from the prepared categories
         """
         columns = self.resolve_selector(self.selector, df)
         for column in columns:
-            categories = df[column].sort_values().unique().tolist()
-            self.mappings[column] = {
-                category: ordinal for ordinal, category in enumerate(categories)
-                if not pd.isna(category)
-            }
+            if column not in self.categories:
+                self.categories[column] = set(self.indexes.get(column, pd.Index([])).tolist())
+            self.categories[column].update(df[column].dropna().unique())
+
+    def do_finalize(self):
+        """
+        Sort the collected values of each column. They are not needed anymore: a refresh starts
+        from the prepared categories.
+        """
+        for column, categories in self.categories.items():
+            self.indexes[column] = sorted_index(to_array(categories))
+        self.categories = {}
 
     def do_bake(self, df):
         """
@@ -59,13 +100,84 @@ class OrdinalEncoderStep(Step):
         """
         columns = self.resolve_selector(self.selector, df)
         for column in columns:
-            df[column] = df[column].replace(self.mappings[column]).astype('Int32')
-            df[column] = df[column].where(df[column].notnull(), None)
+            df[column] = self.encode(df[column], self.indexes[column])
         return df
 
+    def encode(self, values, index):
+        """
+        Return the codes of the values as a nullable integer array
+        """
+        codes = get_codes(values, index)
+        missing = values.isna().to_numpy()
+        unknown = (codes < 0) & ~missing
+        if self.unknown_value is None:
+            missing |= unknown
+        else:
+            codes[unknown] = self.unknown_value
+        dtype = self.code_dtype(len(index))
+        return pd.arrays.IntegerArray(codes.astype(dtype.numpy_dtype), missing)
+
+    def code_dtype(self, size):
+        """
+        Smallest nullable integer type for the codes of `size` categories and the unknown value
+        """
+        unknown = self.unknown_value if self.unknown_value is not None else 0
+        low, high = min(0, unknown), max(size - 1, unknown)
+        for dtype in [pd.Int8Dtype(), pd.Int16Dtype(), pd.Int32Dtype()]:
+            limits = np.iinfo(dtype.numpy_dtype)
+            if limits.min <= low and high <= limits.max:
+                return dtype
+        return pd.Int64Dtype()
+
+    def compile_inference(self, schema):
+        """
+        A few values are encoded faster with dictionaries than with the indexes
+        """
+        columns = self.resolve_selector(self.selector, schema)
+        mappings = {column: self.get_mapping(column) for column in columns}
+        unknown = self.unknown_value
+
+        def bake(arrays):
+            arrays = dict(arrays)
+            for column, mapping in mappings.items():
+                arrays[column] = np.array(
+                    [None if pd.isna(value) else mapping.get(value, unknown)
+                     for value in arrays[column]],
+                    dtype='object'
+                )
+            return arrays
+        return bake
+
+    def reads(self, schema=None):
+        return self.selected_columns(self.selector, schema)
+
+    def writes(self, schema=None):
+        return self.selected_columns(self.selector, schema)
+
+    def is_row_local(self):
+        return True
+
+    def output_schema(self, schema):
+        """
+        The type of the encoded columns depends on the number of categories, so the step must be
+        prepared
+        """
+        if not self.prepared:
+            return None
+        self.validate(schema)
+        columns = self.resolve_selector(self.selector, schema)
+        # Through objects: strings could not be casted to nullable integers directly
+        return schema.astype({c: 'object' for c in columns}).astype(
+            {c: self.code_dtype(len(self.indexes[c])) for c in columns}
+        )
+
+    def is_noop(self):
+        return self.selector == []
+
     def do_validate(self, df):
         """
         - Column must exist
+        - The unknown value must be an integer or None
         """
         columns = self.resolve_selector(self.selector, df)
 
@@ -74,8 +186,77 @@ class OrdinalEncoderStep(Step):
             missing_columns = [c for c, v in zip(columns, matches) if not v]
             raise YeastValidationError(f'The following columns are missing: {missing_columns}')
 
-    def get_mapping(self):
+        unknown = self.unknown_value
+        if unknown is not None and (isinstance(unknown, bool) or not isinstance(unknown, int)):
+            raise YeastValidationError('The unknown value must be an integer or None')
+
+    def __getstate__(self):
+        """
+        The categories are saved as arrays, so large indexes are stored as raw buffers by
+        `Recipe.save()`. Numeric categories are loaded without copying them, strings are copied
+        into an object index.
+        """
+        state = super().__getstate__()
+        state['indexes'] = {column: to_array(index) for column, index in self.indexes.items()}
+        state['categories'] = {
+            column: to_array(values) for column, values in self.categories.items()
+        }
+        return state
+
+    def __setstate__(self, state):
+        indexes, categories = state['indexes'], state['categories']
+        self.__dict__.update(state)
+        self.indexes = {column: pd.Index(values) for column, values in indexes.items()}
+        self.categories = {column: set(values.tolist()) for column, values in categories.items()}
+
+    def get_mapping(self, column=None):
+        """
+        Return the generated mappings as `{'column_name': {category: ordinal, ...}, ...}` or the
+        mapping of one column
+        """
+        if column is not None:
+            index = self.indexes[column]
+            return dict(zip(index.tolist(), range(len(index))))
+        return {column: self.get_mapping(column) for column in self.indexes}
+
+    @property
+    def mappings(self):
         """
-        Return the generated mappings
+        Generated mappings as `{'column_name': {category: ordinal, ...}, ...}` (read only)
         """
-        return self.mappings
+        return self.get_mapping()
+
+
+def get_codes(values, index):
+    """
+    Position of each value of the Series on the index, -1 for missing and unknown values
+    """
+    if is_categorical_dtype(values.dtype):
+        # Look up the categories once and take the code of each value
+        categories = index.get_indexer(values.cat.categories)
+        codes = values.cat.codes.to_numpy()
+        return np.where(codes >= 0, categories.take(codes), -1)
+    return index.get_indexer(values)
+
+
+def sorted_index(values):
+    """
+    Sorted index of the unique values. Values of different types that could not be compared (like
+    strings and numbers) are sorted by their string representation.
+    """
+    index = pd.Index(np.asarray(values))
+    try:
+        return index.sort_values()
+    except TypeError:
+        return index[np.argsort(index.astype('str').to_numpy(), kind='stable')]
+
+
+def to_array(values):
+    """
+    Convert the categories into a NumPy array: fixed width unicode for strings and the inferred
+    type for numbers, other types are kept as objects
+    """
+    values = list(values)
+    if all(isinstance(v, str) for v in values):
+        return np.array(values, dtype='str')
+    return pd.Series(values, dtype='object').infer_objects().to_numpy()
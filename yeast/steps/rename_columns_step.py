@@ -31,6 +31,39 @@ class RenameColumnsStep(Step):
     def do_bake(self, df):
         return df.rename(columns=self.mapping)
 
+    def compile_inference(self, schema):
+        return lambda arrays: {self.mapping.get(c, c): values for c, values in arrays.items()}
+
+    def do_bake_polars(self, df, schema):
+        return df.rename({old: new for old, new in self.mapping.items() if old in df.columns})
+
+    def reads(self, schema=None):
+        return list(self.mapping.keys())
+
+    def writes(self, schema=None):
+        return list(self.mapping.keys()) + list(self.mapping.values())
+
+    def is_row_local(self):
+        return True
+
+    def input_columns(self, columns, schema):
+        return [c for c in schema.columns if self.mapping.get(c, c) in columns]
+
+    def is_noop(self):
+        return all(old == new for old, new in self.mapping.items())
+
+    def merge(self, step):
+        """
+        Two consecutive renames are executed as one
+        """
+        if not isinstance(step, RenameColumnsStep) or step.role != self.role:
+            return None
+        mapping = {old: step.mapping.get(new, new) for old, new in self.mapping.items()}
+        for old, new in step.mapping.items():
+            if old not in mapping:
+                mapping[old] = new
+        return RenameColumnsStep(mapping, role=self.role)
+
     def do_validate(self, df):
         """
         Validations:
@@ -1,4 +1,5 @@
 from yeast.step import Step
+from yeast.inference import fill_na_arrays
 from yeast.errors import YeastValidationError
 
 
@@ -30,18 +31,42 @@ class ReplaceNAStep(Step):
 
     - `YeastValidationError`: if a column does not exist on the dataframe
     """
+    inplace = True
+
     def __init__(self, mapping, value=0, role='all'):
         self.mapping = mapping
         self.value = value
         super().__init__(needs_preparation=False, role=role)
 
     def do_bake(self, df):
-        if isinstance(self.mapping, str):
-            self.mapping = {self.mapping: self.value}
-        for column, value in self.mapping.items():
+        mapping = {self.mapping: self.value} if isinstance(self.mapping, str) else self.mapping
+        for column, value in mapping.items():
             df[column] = df[column].fillna(value)
         return df
 
+    def compile_inference(self, schema):
+        mapping = {self.mapping: self.value} if isinstance(self.mapping, str) else self.mapping
+        return lambda arrays: fill_na_arrays(arrays, mapping)
+
+    def output_schema(self, schema):
+        """
+        Replacing the missing values does not change the columns
+        """
+        self.validate(schema)
+        return schema.copy()
+
+    def reads(self, schema=None):
+        return [self.mapping] if isinstance(self.mapping, str) else list(self.mapping.keys())
+
+    def writes(self, schema=None):
+        return self.reads(schema)
+
+    def is_row_local(self):
+        return True
+
+    def is_noop(self):
+        return self.mapping == {}
+
     def do_validate(self, df):
         """
         - Mapping must be a string or a dict
@@ -35,6 +35,8 @@ class SelectColumnsStep(Step):
 
     - `YeastValidationError`: if any column does not exist or any column name is invalid.
     """
+    pushdown = True
+
     def __init__(self, columns, role='all'):
         self.selector = columns
         super().__init__(needs_preparation=False, role=role)
@@ -43,6 +45,34 @@ class SelectColumnsStep(Step):
         columns = self.resolve_selector(self.selector, df)
         return df[columns]
 
+    def compile_inference(self, schema):
+        columns = self.resolve_selector(self.selector, schema)
+        return lambda arrays: {column: arrays[column] for column in columns}
+
+    def do_bake_polars(self, df, schema):
+        return df.select(self.resolve_selector(self.selector, schema))
+
+    def reads(self, schema=None):
+        return self.selected_columns(self.selector, schema)
+
+    def is_row_local(self):
+        return True
+
+    def input_columns(self, columns, schema):
+        return self.reads(schema)
+
+    def commutes_with(self, step):
+        """
+        The selection could be executed before a step that only reads and updates selected columns
+        """
+        columns = self.reads()
+        if columns is None or step.pushdown:
+            return False
+        reads, writes = step.reads(), step.writes()
+        if reads is None or writes is None:
+            return False
+        return set(reads) <= set(columns) and set(writes) <= set(reads)
+
     def do_validate(self, df):
         """
         - Check that all columns are not empty strings
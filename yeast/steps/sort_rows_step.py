@@ -22,13 +22,33 @@ class SortRowsStep(Step):
 
     - `YeastValidationError`: if any column does not exist or any column name is invalid.
     """
+    resets_index = True
+
     def __init__(self, columns, ascending=True, role='all'):
         self.selector = columns
         self.ascending = ascending if isinstance(ascending, bool) else True
         super().__init__(needs_preparation=False, role=role)
 
     def do_bake(self, df):
-        return df.sort_values(by=self.selector, axis=0, ascending=self.ascending, ignore_index=True)
+        columns = self.resolve_selector(self.selector, df)
+        return df.sort_values(by=columns, axis=0, ascending=self.ascending, ignore_index=True)
+
+    def do_bake_polars(self, df, schema):
+        columns = self.resolve_selector(self.selector, schema)
+        return df.sort(columns, descending=not self.ascending, nulls_last=True)
+
+    def output_schema(self, schema):
+        """
+        Sorting the rows does not change the columns
+        """
+        self.validate(schema)
+        return schema.copy()
+
+    def reads(self, schema=None):
+        return self.selected_columns(self.selector, schema)
+
+    def writes(self, schema=None):
+        return []
 
     def do_validate(self, df):
         """
@@ -36,14 +56,14 @@ class SortRowsStep(Step):
         - Check that all columns are not empty strings
         - Check if the df contains all elements in columns
         """
-        self.selector = self.resolve_selector(self.selector, df)
+        columns = self.resolve_selector(self.selector, df)
 
-        if not all(isinstance(c, str) for c in self.selector):
+        if not all(isinstance(c, str) for c in columns):
             raise YeastValidationError('Invalid column names')
 
-        matches = [c in df.columns for c in self.selector]
+        matches = [c in df.columns for c in columns]
         if not all(matches):
-            missing_columns = [c for c, v in zip(self.selector, matches) if not v]
+            missing_columns = [c for c, v in zip(columns, matches) if not v]
             raise YeastValidationError(f'The following columns are missing: {missing_columns}')
 
 
@@ -1,6 +1,8 @@
+from pandas import DataFrame, Series
 from pandas.core.groupby.generic import DataFrameGroupBy
 
 from yeast.step import Step
+from yeast.aggregations import GroupAggregator
 from yeast.errors import YeastValidationError
 
 
@@ -35,15 +37,67 @@ class SummarizeStep(Step):
 
     - `YeastValidationError`: If there was not a GroupByStep before
     """
+    supports_groups = True
+
     def __init__(self, aggregations, role='all'):
         self.aggregations = aggregations
         super().__init__(needs_preparation=False, role=role)
 
     def do_bake(self, gdf):
-        aggs = {}
+        """
+        The aggregations are calculated by the vectorized `GroupAggregator` if possible, otherwise
+        by Pandas.
+        """
+        aggregator = GroupAggregator(gdf)
+        results, aggs = {}, {}
+        for column, agg in self.aggregations.items():
+            results[column] = aggregator.aggregate(agg)
+            if results[column] is None:
+                aggs[column] = agg.resolve(gdf)
+        df = DataFrame({c: v for c, v in results.items() if v is not None}, index=aggregator.index)
+        if aggs:
+            df = df.join(gdf.agg(**aggs), how='outer')
+        # Categorical keys include the groups not observed
+        index = gdf.size().index
+        if not df.index.equals(index):
+            df = df.reindex(index)
+            for column, agg in self.aggregations.items():
+                if agg.kernel in ['size', 'count_distinct']:
+                    df[column] = df[column].fillna(0).astype('int64')
+        return df[list(self.aggregations.keys())].reset_index()
+
+    def output_schema(self, gdf):
+        """
+        The group keys and the aggregations with the types calculated by the `GroupAggregator`. The
+        types of the aggregations calculated by Pandas are inferred baking them on the schema.
+        """
+        self.validate(gdf)
+        keys = gdf.keys if isinstance(gdf.keys, list) else [gdf.keys]
+        if not all(isinstance(k, str) and k in gdf.obj.columns for k in keys):
+            return super().output_schema(gdf)
+        columns = {key: gdf.obj[key].iloc[0:0] for key in keys}
+        baked = None
         for column, agg in self.aggregations.items():
-            aggs[column] = agg.resolve(gdf)
-        return gdf.agg(**aggs).reset_index()
+            source = getattr(agg, 'column', None)
+            dtype = gdf.obj.dtypes.get(source) if isinstance(source, str) else None
+            dtype = GroupAggregator.output_dtype(agg, dtype)
+            if dtype is None:
+                baked = super().output_schema(gdf) if baked is None else baked
+                if baked is None:
+                    return None
+                dtype = baked[column].dtype
+            columns[column] = Series([], dtype=dtype)
+        return DataFrame(columns)
+
+    def input_columns(self, columns, schema):
+        """
+        The group keys and the columns used by the aggregations
+        """
+        keys = schema.keys if isinstance(schema.keys, list) else [schema.keys]
+        sources = [getattr(agg, 'column', None) for agg in self.aggregations.values()]
+        if None in sources:
+            return schema.obj.columns.tolist()
+        return [c for c in schema.obj.columns if c in keys or c in sources]
 
     def do_validate(self, gdf):
         """
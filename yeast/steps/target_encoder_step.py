@@ -0,0 +1,268 @@
+import numbers
+import weakref
+import numpy as np
+import pandas as pd
+from pandas.api.types import is_numeric_dtype, is_bool_dtype
+from yeast.step import Step
+from yeast.steps.frequency_encoder_step import lookup, lookup_function, to_table, from_table
+from yeast.errors import YeastValidationError
+
+
+class TargetEncoderStep(Step):
+    """
+    Encode categorical/string discrete features as the smoothed mean of the target on each
+    category (mean/target encoding):
+
+    `encoding = (sum of the target + smoothing * prior) / (count + smoothing)`
+
+    where `prior` is the mean of the target on all the rows, so the rare categories are encoded
+    closer to the prior.
+
+    Parameters:
+
+    - `selector`: List of columns, column name or selector.
+    - `target`: name of the numeric or boolean target column. It's only needed while preparing.
+    - `smoothing`: weight of the prior on each category. Default: `1.0`
+    - `folds`: number of folds to encode the preparation data out-of-fold or `None` to encode it
+               with the statistics of all the rows. Default: `None`
+    - `seed`: seed of the random assignment of the rows to the folds. Default: `0`
+    - `role`: String name of the role to control baking flows on new data. Default: `all`.
+
+    Usage:
+
+    ```python
+    recipe = Recipe([
+        # Encode the cities by the churn rate of their customers without leaking the target:
+        TargetEncoderStep('city', target='churn', smoothing=10, folds=5),
+        ...
+    ])
+    recipe.prepare(train_df)
+    ```
+
+    Notes:
+
+    The statistics of each column are calculated in one pass grouping the factorized values and
+    the values are encoded with a vectorized lookup on the learned table (`Index.get_indexer` and
+    `take`). Missing values and values not seen while preparing are encoded as the prior, and
+    the rows with a missing target are ignored. The encoded columns are `float64`.
+
+    With `folds` the rows of the preparation data are randomly split into `folds` folds and each
+    row is encoded with the statistics of the other folds, so a row never sees its own target.
+    The out-of-fold values are only used by the bake of the same DataFrame (the same object, not
+    a copy) that follows the preparation (`Recipe.prepare()` bakes each step to prepare the next
+    ones), any other bake uses the table learned from all the rows. Preparing the step by chunks
+    (`prepare_partial()`) does not encode out-of-fold.
+
+    Raises:
+
+    - `YeastValidationError`: If the column or the target were not found or the parameters are
+                              not valid
+    """
+    inplace = True
+    incremental = True
+
+    def __init__(self, selector, target, smoothing=1.0, folds=None, seed=0, role='all'):
+        self.selector = selector
+        self.target = target
+        self.smoothing = smoothing
+        self.folds = folds
+        self.seed = seed
+        self.stats = {}
+        self.total = (0.0, 0)
+        self.prior = np.nan
+        self.tables = {}
+        # Reference to the preparation data and its out-of-fold encodings, until the next bake
+        self._oof = None
+        super().__init__(needs_preparation=True, role=role)
+
+    def do_prepare(self, df):
+        self.stats, self.total = {}, (0.0, 0)
+        self.do_prepare_partial(df)
+        self.do_finalize()
+        if self.folds is not None:
+            self._oof = weakref.ref(df), df.index, self.out_of_fold(df)
+
+    def do_prepare_partial(self, df):
+        """
+        Sum and count the target of each category on the chunk
+        """
+        columns = self.resolve_selector(self.selector, df)
+        target = self.target_values(df)
+        known = ~np.isnan(target)
+        for column in columns:
+            codes, categories = pd.factorize(df[column])
+            categories = pd.Index(np.asarray(categories))
+            stats = pd.DataFrame({
+                'sum': np.bincount(codes[known & (codes >= 0)],
+                                   weights=target[known & (codes >= 0)],
+                                   minlength=len(categories)),
+                'count': np.bincount(codes[known & (codes >= 0)], minlength=len(categories))
+            }, index=categories)
+            if column in self.stats:
+                stats = self.stats[column].add(stats, fill_value=0)
+            self.stats[column] = stats
+        self.total = (self.total[0] + target[known].sum(), self.total[1] + int(known.sum()))
+
+    def do_finalize(self):
+        """
+        Calculate the prior and the smoothed mean of each category
+        """
+        total, count = self.total
+        self.prior = total / count if count > 0 else np.nan
+        self.tables = {
+            column: self.encode(stats['sum'], stats['count'], self.prior)
+            for column, stats in self.stats.items()
+        }
+
+    def out_of_fold(self, df):
+        """
+        Encode each row with the statistics of the other folds: the statistics of all the rows
+        minus the statistics of the fold of the row, grouped by category and fold in one pass
+        """
+        folds = np.random.RandomState(self.seed).permutation(df.shape[0]) % self.folds
+        target = self.target_values(df)
+        known = ~np.isnan(target)
+        weights = np.where(known, target, 0.0)
+        known = known.astype('float64')
+        # Prior of each fold: mean of the target on the other folds
+        fold_sums = np.bincount(folds, weights=weights, minlength=self.folds)
+        fold_counts = np.bincount(folds, weights=known, minlength=self.folds)
+        other_counts = fold_counts.sum() - fold_counts
+        with np.errstate(divide='ignore', invalid='ignore'):
+            priors = (fold_sums.sum() - fold_sums) / other_counts
+        priors = np.where(other_counts > 0, priors, self.prior)[folds]
+
+        encoded = {}
+        for column in self.resolve_selector(self.selector, df):
+            codes, categories = pd.factorize(df[column])
+            keys = np.where(codes >= 0, codes * self.folds + folds, -1)
+            size = len(categories) * self.folds
+            sums = np.bincount(keys[keys >= 0], weights=weights[keys >= 0], minlength=size)
+            counts = np.bincount(keys[keys >= 0], weights=known[keys >= 0], minlength=size)
+            sums, counts = sums.reshape(-1, self.folds), counts.reshape(-1, self.folds)
+            # Statistics of the category on the other folds
+            rows = np.maximum(codes, 0)
+            other_sums = sums.sum(axis=1)[rows] - sums[rows, folds]
+            other_counts = counts.sum(axis=1)[rows] - counts[rows, folds]
+            with np.errstate(divide='ignore', invalid='ignore'):
+                values = (other_sums + self.smoothing * priors) / (other_counts + self.smoothing)
+            values = np.where(other_counts > 0, values, priors)
+            encoded[column] = np.where(codes >= 0, values, priors)
+        return encoded
+
+    def encode(self, sums, counts, prior):
+        """
+        Smoothed means, or the prior if there are no values
+        """
+        with np.errstate(divide='ignore', invalid='ignore'):
+            means = (sums + self.smoothing * prior) / (counts + self.smoothing)
+        return pd.Series(np.where(counts > 0, means, prior), index=getattr(sums, 'index', None))
+
+    def target_values(self, df):
+        """
+        Values of the target as floats with NaN as missing value
+        """
+        if self.target not in df.columns:
+            raise YeastValidationError(f'The target column "{self.target}" is missing')
+        target = df[self.target]
+        if not is_numeric_dtype(target.dtype) and not is_bool_dtype(target.dtype):
+            raise YeastValidationError(f'The target column "{self.target}" must be numeric')
+        return target.astype('float64').to_numpy()
+
+    def do_bake(self, df):
+        """
+        Replace the values by the smoothed means of the target (out-of-fold on the preparation
+        data)
+        """
+        oof, self._oof = self._oof, None
+        if oof is not None and (oof[0]() is not df or not oof[1].equals(df.index)):
+            oof = None
+        columns = self.resolve_selector(self.selector, df)
+        for column in columns:
+            if oof is not None and column in oof[2]:
+                df[column] = oof[2][column]
+            else:
+                df[column] = lookup(df[column], self.tables[column], self.prior)
+        return df
+
+    def compile_inference(self, schema):
+        """
+        A few values are encoded faster with dictionaries than with the tables
+        """
+        columns = self.resolve_selector(self.selector, schema)
+        return lookup_function({column: self.tables[column] for column in columns}, self.prior)
+
+    def reads(self, schema=None):
+        """
+        The target is only read while preparing
+        """
+        columns = self.selected_columns(self.selector, schema)
+        if columns is None or self.prepared:
+            return columns
+        return columns + [self.target]
+
+    def writes(self, schema=None):
+        return self.selected_columns(self.selector, schema)
+
+    def is_row_local(self):
+        return True
+
+    def output_schema(self, schema):
+        """
+        The encoded columns are always floats, so the table is not needed
+        """
+        self.validate(schema)
+        columns = self.resolve_selector(self.selector, schema)
+        # Through objects: strings could not be casted to numbers directly
+        return schema.astype({c: 'object' for c in columns}).astype({c: 'float64' for c in columns})
+
+    def is_noop(self):
+        return self.selector == []
+
+    def do_validate(self, df):
+        """
+        - Columns must exist and can not be the target
+        - smoothing must be a non negative number
+        - folds must be an integer greater than 1 or None
+
+        The target is validated while preparing, it's not needed to bake
+        """
+        columns = self.resolve_selector(self.selector, df)
+
+        matches = [c in df.columns for c in columns]
+        if not all(matches):
+            missing_columns = [c for c, v in zip(columns, matches) if not v]
+            raise YeastValidationError(f'The following columns are missing: {missing_columns}')
+        if self.target in columns:
+            raise YeastValidationError(f'The target column "{self.target}" can not be encoded')
+
+        smoothing = self.smoothing
+        if isinstance(smoothing, bool) or not isinstance(smoothing, numbers.Real) or smoothing < 0:
+            raise YeastValidationError('smoothing must be a non negative number')
+        folds = self.folds
+        if folds is not None and (isinstance(folds, bool) or not isinstance(folds, int)
+                                  or folds < 2):
+            raise YeastValidationError('folds must be an integer greater than 1')
+
+    def __getstate__(self):
+        """
+        The tables are saved as arrays, so large tables are stored as raw buffers by
+        `Recipe.save()`. The out-of-fold encodings are not saved.
+        """
+        state = super().__getstate__()
+        state.pop('_oof', None)
+        state['stats'] = {
+            column: (to_table(stats['sum']), stats['count'].to_numpy())
+            for column, stats in self.stats.items()
+        }
+        state['tables'] = {column: to_table(table) for column, table in self.tables.items()}
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._oof = None
+        self.stats = {}
+        for column, (sums, counts) in state['stats'].items():
+            sums = from_table(sums)
+            self.stats[column] = pd.DataFrame({'sum': sums, 'count': counts}, index=sums.index)
+        self.tables = {column: from_table(table) for column, table in self.tables.items()}
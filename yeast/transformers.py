@@ -1,5 +1,6 @@
 import numpy as np
 import pandas as pd
+from pandas.core.groupby.generic import DataFrameGroupBy
 from yeast.errors import YeastTransformerError
 
 
@@ -8,19 +9,24 @@ class Transformer():
     Base abstract interface to define column transformers.
     The column name to transform can be assigned during two phases:
     - During object definition (constructor) with presedence.
-    - During resolving (resolve)
+    - During resolving (resolve), without changing the transformer
 
     Workflow:
     __init__ >> resolve >> do_resolve
+
+    The `row_wise` flag must be False on transformers where each value depends on other rows,
+    like ranks, so they are never executed on partial data.
     """
+    row_wise = True
+
     def __init__(self, column=None):
         self.column = column
 
     def resolve(self, df, column=None):
-        self.column = self.column if self.column else column
-        if not self.column:
+        column = self.column if self.column else column
+        if not column:
             raise YeastTransformerError('The selected column name to transform is empty')
-        return self.do_resolve(df, self.column)
+        return self.do_resolve(df, column)
 
     def do_resolve(self, df, column):
         """
@@ -28,6 +34,12 @@ class Transformer():
         """
         pass
 
+    def reads(self, column=None):
+        """
+        Columns read by the transformer to calculate the destination `column`
+        """
+        return [self.column if self.column else column]
+
     def set_column_if_required(self, column):
         """
         Set the column if it does not have a value.
@@ -41,6 +53,10 @@ class Transformer():
         """
         return self.resolve(df, column=column)
 
+    def __repr__(self):
+        params = ', '.join(f'{k}={v!r}' for k, v in vars(self).items() if v is not None)
+        return f'{self.__class__.__name__}({params})'
+
 
 class MapValues(Transformer):
     """
@@ -287,6 +303,8 @@ class RankTransformer(Transformer):
                      {'average', 'min', 'max', 'first', 'dense'}
     - `ascending`: boolean with the order of the row numbers
     """
+    row_wise = False
+
     def __init__(self, column=None, ties_method="first", ascending=True, percentage=False):
         super().__init__(column=column)
         self.ascending = ascending
@@ -573,3 +591,305 @@ class Floor(NumericalTransformer):
 
     def do_resolve(self, df, column):
         return df[column].apply(np.floor)
+
+
+class WindowTransformer(Transformer):
+    """
+    Base abstract interface to define window transformers: each value is calculated from the
+    previous or the next rows, like lags or cumulative sums. After a `GroupByStep` the window never
+    crosses the group limits.
+
+    The rows are sorted once by the group keys (and by `order_by` if defined) and all the groups are
+    calculated in a single vectorized pass. The result is returned in the original order.
+
+    Parameters:
+
+    - `column`: name of the column to use
+    - `order_by`: optional column name or list of column names to order the rows inside each group.
+                  Default: `None` to use the order of the rows.
+    """
+    row_wise = False
+
+    def __init__(self, column=None, order_by=None):
+        super().__init__(column=column)
+        self.order_by = [order_by] if isinstance(order_by, str) else order_by
+
+    def do_resolve(self, df, column):
+        if isinstance(df, DataFrameGroupBy):
+            frame, codes = df.obj, df.ngroup().to_numpy()
+        else:
+            frame, codes = df, np.zeros(df.shape[0], dtype='int64')
+        if column not in frame.columns:
+            raise YeastTransformerError(f'Column "{column}" not found')
+
+        if not isinstance(df, DataFrameGroupBy) and not self.order_by:
+            return self.do_window(frame[column], codes)
+        # Stable sort by the group codes and then by the order columns
+        keys = [pd.factorize(frame[c], sort=True)[0] for c in reversed(self.order_by or [])]
+        order = np.lexsort(keys + [codes])
+        values = self.do_window(frame[column].iloc[order], codes[order])
+        inverse = np.empty_like(order)
+        inverse[order] = np.arange(order.size)
+        return values.iloc[inverse]
+
+    def reads(self, column=None):
+        """
+        The column and the columns to order the rows
+        """
+        return super().reads(column) + list(self.order_by or [])
+
+    def do_window(self, values, codes):
+        """
+        Let subclasses override this operation. `values` are sorted by the group `codes`
+        """
+        pass
+
+    @staticmethod
+    def numeric(values):
+        """
+        Return the values as a float array or raise an error if they are not numeric
+        """
+        try:
+            return values.to_numpy(dtype='float64', na_value=np.nan)
+        except (TypeError, ValueError) as ex:
+            raise YeastTransformerError(
+                f'Error calculating the window on "{values.name}". Is it numeric?'
+            ) from ex
+
+
+class Lag(WindowTransformer):
+    """
+    Return the value of the column `n` rows before the current one or NA if there is no row.
+
+    Parameters:
+
+    - `column`: name of the column to lag
+    - `n`: number of rows. Default: `1`
+    - `order_by`: optional column name or list of column names to order the rows
+    """
+    def __init__(self, column=None, n=1, order_by=None):
+        super().__init__(column=column, order_by=order_by)
+        self.n = n
+
+    def do_window(self, values, codes):
+        return values.groupby(codes).shift(self.n)
+
+
+class Lead(WindowTransformer):
+    """
+    Return the value of the column `n` rows after the current one or NA if there is no row.
+
+    Parameters:
+
+    - `column`: name of the column to lead
+    - `n`: number of rows. Default: `1`
+    - `order_by`: optional column name or list of column names to order the rows
+    """
+    def __init__(self, column=None, n=1, order_by=None):
+        super().__init__(column=column, order_by=order_by)
+        self.n = n
+
+    def do_window(self, values, codes):
+        return values.groupby(codes).shift(-self.n)
+
+
+class CumSum(WindowTransformer):
+    """
+    Return the cumulative sum of the column. NA values are skipped and remain NA.
+
+    Parameters:
+
+    - `column`: name of the numeric column
+    - `order_by`: optional column name or list of column names to order the rows
+    """
+    def do_window(self, values, codes):
+        self.numeric(values)
+        return values.groupby(codes).cumsum()
+
+
+class CumCount(WindowTransformer):
+    """
+    Return the cumulative count of the non NA values of the column: the number of values up to
+    the current row included.
+
+    Parameters:
+
+    - `column`: name of the column to count
+    - `order_by`: optional column name or list of column names to order the rows
+    """
+    def do_window(self, values, codes):
+        return values.notna().astype('int64').groupby(codes).cumsum()
+
+
+class RollingTransformer(WindowTransformer):
+    """
+    Base abstract interface to define transformers calculated on a window with the current row and
+    the previous `window - 1` rows. All the groups are calculated at once using prefix sums that
+    restart on each group (sum and mean) or a sparse table of partial results (min and max).
+
+    Parameters:
+
+    - `column`: name of the numeric column
+    - `window`: number of rows of the window including the current one. `None` to use all the
+                previous rows of the group
+    - `min_periods`: minimum number of non NA values in the window to return a value, otherwise
+                     the result is NA. Default: `None` to use the size of the window
+    - `order_by`: optional column name or list of column names to order the rows
+    """
+    def __init__(self, column=None, window=3, min_periods=None, order_by=None):
+        super().__init__(column=column, order_by=order_by)
+        if window is not None and window < 1:
+            raise YeastTransformerError(f'The window must be greater than 0. Found: {window}')
+        self.window = window
+        self.min_periods = window if min_periods is None else min_periods
+
+    def do_window(self, values, codes):
+        data = self.numeric(values)
+        positions = np.arange(data.size)
+        # Position of the first row of the group of each row
+        starts = np.maximum.accumulate(np.where(np.r_[True, codes[1:] != codes[:-1]], positions, 0))
+        first = starts if self.window is None else np.maximum(positions - self.window + 1, starts)
+        valid = ~np.isnan(data)
+        counts = np.r_[0, np.cumsum(valid)]
+        counts = counts[positions + 1] - counts[first]
+        result = self.reduce(data, valid, first, positions, starts)
+        result[counts < max(self.min_periods, 1)] = np.nan
+        return pd.Series(result, index=values.index, name=values.name)
+
+    def reduce(self, data, valid, first, last, starts):
+        """
+        Let subclasses override this operation: reduce the values from `first` to `last` (both
+        included) for each row. `starts` is the first row of the group of each row.
+        """
+        pass
+
+    @staticmethod
+    def window_sum(data, valid, first, last, starts):
+        """
+        Windows that start on the first row of the group are the prefix sums of the group. The
+        rest are added from disjoint blocks of `2 ** k` values (one per bit of the length of the
+        window), so a large value does not absorb the small values of the windows after it.
+        """
+        data = np.where(valid, data, 0)
+        if np.array_equal(first, starts):
+            return pd.Series(data).groupby(starts).cumsum().to_numpy()
+        lengths = last - first + 1
+        result = np.zeros(data.size, dtype='float64')
+        position = last.copy()
+        level, k = data, 0
+        while 2 ** k <= lengths.max():
+            if k > 0:
+                # Sums of the 2 ** k values ending on each row
+                shift = 2 ** (k - 1)
+                level = level.copy()
+                level[shift:] = level[shift:] + level[:-shift]
+                level[:shift] = np.nan  # Never used: the blocks do not cross the first row
+            block = (lengths >> k) & 1 == 1
+            result[block] += level[position[block]]
+            position[block] -= 2 ** k
+            k += 1
+        return result
+
+    @classmethod
+    def window_mean(cls, data, valid, first, last, starts):
+        counts = cls.window_sum(valid.astype('float64'), valid, first, last, starts)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return cls.window_sum(data, valid, first, last, starts) / counts
+
+    @staticmethod
+    def window_extreme(data, first, last, ufunc):
+        """
+        Sparse table: level `k` contains the result of the `2 ** k` values ending on each row, so
+        each window is covered by two overlapped blocks of the same level
+        """
+        if data.size == 0:
+            return np.array([], dtype='float64')
+        lengths = last - first + 1
+        levels = [data]
+        while 2 ** len(levels) <= lengths.max():
+            shift = 2 ** (len(levels) - 1)
+            level = levels[-1].copy()
+            level[shift:] = ufunc(level[shift:], levels[-1][:-shift])
+            levels.append(level)
+        table = np.vstack(levels)
+        k = np.floor(np.log2(lengths)).astype('int64')
+        return ufunc(table[k, last], table[k, first + 2 ** k - 1])
+
+
+class RollingSum(RollingTransformer):
+    """
+    Return the sum of the values in the window, NA values are ignored.
+    """
+    def reduce(self, data, valid, first, last, starts):
+        return self.window_sum(data, valid, first, last, starts)
+
+
+class RollingMean(RollingTransformer):
+    """
+    Return the mean of the values in the window, NA values are ignored.
+    """
+    def reduce(self, data, valid, first, last, starts):
+        return self.window_mean(data, valid, first, last, starts)
+
+
+class RollingMin(RollingTransformer):
+    """
+    Return the minimum value in the window, NA values are ignored.
+    """
+    def reduce(self, data, valid, first, last, starts):
+        return self.window_extreme(data, first, last, np.fmin)
+
+
+class RollingMax(RollingTransformer):
+    """
+    Return the maximum value in the window, NA values are ignored.
+    """
+    def reduce(self, data, valid, first, last, starts):
+        return self.window_extreme(data, first, last, np.fmax)
+
+
+class ExpandingTransformer(RollingTransformer):
+    """
+    Base abstract interface to define transformers calculated on all the rows from the start of
+    the group up to the current one.
+
+    Parameters:
+
+    - `column`: name of the numeric column
+    - `min_periods`: minimum number of non NA values to return a value. Default: `1`
+    - `order_by`: optional column name or list of column names to order the rows
+    """
+    def __init__(self, column=None, min_periods=1, order_by=None):
+        super().__init__(column=column, window=None, min_periods=min_periods, order_by=order_by)
+
+
+class ExpandingSum(ExpandingTransformer):
+    """
+    Return the sum of all the values up to the current row, NA values are ignored.
+    """
+    def reduce(self, data, valid, first, last, starts):
+        return self.window_sum(data, valid, first, last, starts)
+
+
+class ExpandingMean(ExpandingTransformer):
+    """
+    Return the mean of all the values up to the current row, NA values are ignored.
+    """
+    def reduce(self, data, valid, first, last, starts):
+        return self.window_mean(data, valid, first, last, starts)
+
+
+class ExpandingMin(ExpandingTransformer):
+    """
+    Return the minimum of all the values up to the current row, NA values are ignored.
+    """
+    def reduce(self, data, valid, first, last, starts):
+        return pd.Series(np.where(valid, data, np.inf)).groupby(starts).cummin().to_numpy()
+
+
+class ExpandingMax(ExpandingTransformer):
+    """
+    Return the maximum of all the values up to the current row, NA values are ignored.
+    """
+    def reduce(self, data, valid, first, last, starts):
+        return pd.Series(np.where(valid, data, -np.inf)).groupby(starts).cummax().to_numpy()